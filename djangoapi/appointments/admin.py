@@ -1,7 +1,18 @@
 from django.contrib import admin
-from .models import Appointments
+from .models import Appointments, ArchivedAppointment
 
 
 @admin.register(Appointments)
 class AppointmentAdmin(admin.ModelAdmin):
     list_display = ('id', 'date', 'health_professional')
+
+
+@admin.register(ArchivedAppointment)
+class ArchivedAppointmentAdmin(admin.ModelAdmin):
+    list_display = ('id', 'date', 'health_professional', 'archived_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,44 @@
+from django.db import connection, transaction
+from appointments.models import Appointments, ArchivedAppointment
+
+
+COLUMNS = 'id, date, health_professional_id, created_at, updated_at'
+
+
+def archive_batch(horizon, batch_size):
+    # Move até batch_size agendamentos anteriores a 'horizon' para a tabela
+    # de arquivo, numa transação própria e curta. Cada lote já gravado fica
+    # gravado: se o comando parar no meio, a próxima execução continua de
+    # onde parou. SQL direto para não disparar os signals de exclusão (o
+    # agendamento não foi removido: não gera tombstone nem mexe na ocupação)
+    hot = connection.ops.quote_name(Appointments._meta.db_table)
+    archive = connection.ops.quote_name(ArchivedAppointment._meta.db_table)
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # SKIP LOCKED: linhas sendo alteradas agora ficam para o próximo lote
+            cursor.execute(
+                f"""
+                WITH moved AS (
+                    DELETE FROM {hot} WHERE (id, date) IN (
+                        SELECT id, date FROM {hot} WHERE date < %s
+                        ORDER BY date, id LIMIT %s FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING {COLUMNS}
+                )
+                INSERT INTO {archive} ({COLUMNS}, archived_at)
+                SELECT {COLUMNS}, now() FROM moved
+                """,
+                [horizon, batch_size]
+            )
+            return cursor.rowcount
+
+        # Sem DELETE dentro de CTE (SQLite): copia e remove o mesmo lote. A
+        # primeira escrita já bloqueia os outros escritores até o commit
+        batch = f'SELECT id FROM {hot} WHERE date < %s ORDER BY date, id LIMIT %s'
+        cursor.execute(
+            f'INSERT INTO {archive} ({COLUMNS}, archived_at) '
+            f'SELECT {COLUMNS}, CURRENT_TIMESTAMP FROM {hot} WHERE id IN ({batch})',
+            [horizon, batch_size]
+        )
+        cursor.execute(f'DELETE FROM {hot} WHERE id IN ({batch})', [horizon, batch_size])
+        return cursor.rowcount
@@ -0,0 +1,69 @@
+from datetime import date
+from django.db import connection
+from appointments.models import Appointments
+from health_professionals.models import HealthProfessional, Profession
+
+
+# Série de dias do intervalo, gerada no próprio banco
+DAYS_SQL = {
+    'postgresql': (
+        "SELECT d::date AS day "
+        "FROM generate_series(%s::date, %s::date, interval '1 day') AS d"
+    ),
+    # Fallback para SQLite (desenvolvimento/testes): CTE recursiva
+    'default': (
+        "WITH RECURSIVE days(day) AS ("
+        " SELECT date(%s)"
+        " UNION ALL SELECT date(day, '+1 day') FROM days WHERE day < date(%s)"
+        ") SELECT day FROM days"
+    ),
+}
+
+FREE_SLOTS_SQL = """
+    SELECT p.id, p.social_name, pr.name, days.day
+    FROM {professionals} p
+    JOIN {professions} pr ON pr.id = p.profession_id
+    CROSS JOIN ({days}) AS days
+    WHERE {profession_filter}
+      NOT EXISTS (
+        SELECT 1 FROM {appointments} a
+        WHERE a.health_professional_id = p.id AND a.date = days.day
+      )
+    ORDER BY days.day, p.social_name, p.id
+    LIMIT %s
+"""
+
+
+def find_free_slots(start, end, limit, profession=None):
+    # Cada (profissional, dia) é um único horário (unique_together), então os
+    # horários livres são o produto profissionais x dias menos os agendamentos:
+    # um anti-join (NOT EXISTS) que usa o índice (health_professional, date)
+    days_sql = DAYS_SQL.get(connection.vendor, DAYS_SQL['default'])
+    params = [start, end]
+    profession_filter = ''
+    if profession:
+        # Nome canônico: uma busca no índice único do catálogo
+        profession_filter = 'pr.name = %s AND'
+        params.append(Profession.normalize(profession))
+    params.append(limit)
+
+    sql = FREE_SLOTS_SQL.format(
+        professionals=HealthProfessional._meta.db_table,
+        professions=Profession._meta.db_table,
+        appointments=Appointments._meta.db_table,
+        days=days_sql,
+        profession_filter=profession_filter,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    return [
+        {
+            'health_professional': row[0],
+            'social_name': row[1],
+            'profession': row[2],
+            'date': row[3] if isinstance(row[3], date) else date.fromisoformat(row[3]),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,30 @@
+from core.events import BROKER
+
+
+APPOINTMENTS_CHANNEL = 'appointments'
+
+
+def appointment_event(action, data, previous_professional=None):
+    # 'professionals' lista quem deve ser avisado: numa troca de profissional
+    # os dois lados recebem a atualização
+    professionals = [data['health_professional']]
+    if previous_professional is not None and previous_professional != data['health_professional']:
+        professionals.append(previous_professional)
+    return {
+        'type': f'appointment.{action}',
+        'data': dict(data),
+        'professionals': professionals,
+    }
+
+
+def publish_appointment_events(action, rows, previous_professional=None):
+    # 'rows' são agendamentos já serializados (AppointmentsModelSerializers)
+    BROKER.publish(APPOINTMENTS_CHANNEL, [
+        appointment_event(action, data, previous_professional) for data in rows
+    ])
+
+
+def professional_filter(professionals):
+    if not professionals:
+        return None
+    return lambda event: any(professional in professionals for professional in event['professionals'])
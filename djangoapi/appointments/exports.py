@@ -0,0 +1,55 @@
+import csv
+import json
+from itertools import islice
+from asgiref.sync import sync_to_async
+
+
+EXPORT_FIELDS = ('id', 'date', 'health_professional_id')
+EXPORT_HEADER = ('id', 'date', 'health_professional')
+
+
+class Echo:
+    # Buffer "falso" para o csv.writer: devolve a linha em vez de guardá-la
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, chunk_size):
+    # values_list + iterator: tuplas direto do cursor do banco (server-side
+    # no Postgres), sem instanciar models nem serializers por linha
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def stream_ndjson(queryset, chunk_size):
+    for pk, date, professional_id in iter_rows(queryset, chunk_size):
+        yield json.dumps({
+            'id': pk,
+            'date': date.isoformat(),
+            'health_professional': professional_id,
+        }) + '\n'
+
+
+def stream_csv(queryset, chunk_size):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for pk, date, professional_id in iter_rows(queryset, chunk_size):
+        yield writer.writerow((pk, date.isoformat(), professional_id))
+
+
+async def stream_async(lines, chunk_size):
+    # No ASGI o StreamingHttpResponse consome um iterador síncrono inteiro
+    # (sync_to_async(list)) antes de enviar o primeiro byte. Aqui cada bloco
+    # de linhas é lido no thread do ORM e enviado antes de buscar o próximo
+    fetch = sync_to_async(lambda: ''.join(islice(lines, chunk_size)))
+    try:
+        while chunk := await fetch():
+            yield chunk
+    finally:
+        # Cliente desconectado: fecha o cursor do banco no mesmo thread
+        await sync_to_async(lines.close)()
+
+
+EXPORT_FORMATS = {
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+    'csv': (stream_csv, 'text/csv'),
+}
@@ -0,0 +1,58 @@
+from datetime import datetime
+from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
+from appointments.models import AppointmentHistory, Appointments, MonthlyOccupancy
+from health_professionals.models import Profession
+
+
+class NumberInFilter(filters.BaseInFilter, filters.NumberFilter):
+    pass
+
+
+class ProfessionFilter(filters.CharFilter):
+    # Nome em qualquer grafia ("psicóloga") -> igualdade com o nome canônico
+    # no índice único do catálogo; dali em diante o JOIN segue pelas FKs
+
+    def filter(self, qs, value):
+        if value:
+            value = Profession.normalize(value)
+        return super().filter(qs, value)
+
+
+class AppointmentsFilter(filters.FilterSet):
+    # IDs separados por vírgula; filtra direto pela FK, sem buscar cada
+    # profissional no banco como faria um ModelMultipleChoiceFilter
+    health_professional__in = NumberInFilter(field_name='health_professional')
+    profession = ProfessionFilter(field_name='health_professional__profession__name')
+    profession_id = filters.NumberFilter(field_name='health_professional__profession')
+
+    class Meta:
+        model = Appointments
+        fields = {
+            'health_professional': ['exact'],
+            'date': ['exact', 'gte', 'lte'],
+        }
+
+
+class AppointmentHistoryFilter(AppointmentsFilter):
+    # Mesmos filtros sobre a view com ativos e arquivados
+
+    class Meta(AppointmentsFilter.Meta):
+        model = AppointmentHistory
+
+
+class MonthlyOccupancyFilter(filters.FilterSet):
+    month = filters.CharFilter(method='filter_month', label='Mês (AAAA-MM)')
+    profession = ProfessionFilter(field_name='health_professional__profession__name')
+    profession_id = filters.NumberFilter(field_name='health_professional__profession')
+
+    class Meta:
+        model = MonthlyOccupancy
+        fields = ['health_professional']
+
+    def filter_month(self, queryset, name, value):
+        try:
+            month = datetime.strptime(value, '%Y-%m').date()
+        except ValueError:
+            raise ValidationError({'month': 'Informe o mês no formato AAAA-MM.'})
+        return queryset.filter(month=month)
@@ -0,0 +1,49 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from appointments.archive import archive_batch
+from appointments.models import Appointments
+
+
+class Command(BaseCommand):
+    help = ('Move os agendamentos mais antigos que o horizonte para a tabela de arquivo, '
+            'em lotes curtos. Pode ser interrompido e executado de novo.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                            help='Arquiva agendamentos com data anterior a hoje menos N dias.')
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Para depois de N lotes (o restante fica para a próxima execução).')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Segundos de espera entre lotes, para aliviar o banco.')
+        parser.add_argument('--dry-run', action='store_true', help='Só conta quantos seriam arquivados.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days não pode ser negativo.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size deve ser maior que zero.')
+
+        horizon = timezone.now().date() - timedelta(days=options['days'])
+        if options['dry_run']:
+            pending = Appointments.objects.filter(date__lt=horizon).count()
+            self.stdout.write(f'{pending} agendamentos anteriores a {horizon} seriam arquivados.')
+            return
+
+        total = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            moved = archive_batch(horizon, options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            self.stdout.write(f'Lote {batches}: {moved} agendamentos arquivados.')
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} agendamentos anteriores a {horizon} arquivados em {batches} lotes.'
+        ))
@@ -0,0 +1,63 @@
+from datetime import date
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from appointments.partitions import (
+    DEFAULT_PARTITION, add_months, create_partition, detach_partition, is_partitioned, list_partitions
+)
+
+
+class Command(BaseCommand):
+    help = ('Cria as partições mensais futuras da tabela de agendamentos e, opcionalmente, '
+            'destaca ou remove as partições antigas (somente PostgreSQL).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=settings.PARTITION_MONTHS_AHEAD,
+                            help='Meses à frente que devem ter partição.')
+        parser.add_argument('--detach-older-than', type=int, default=None, metavar='MESES',
+                            help='Destaca as partições de meses anteriores a N meses atrás.')
+        parser.add_argument('--drop', action='store_true',
+                            help='Remove (DROP) as partições destacadas em vez de mantê-las como tabelas avulsas.')
+        parser.add_argument('--dry-run', action='store_true', help='Só mostra o que seria feito.')
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            if not is_partitioned(cursor):
+                raise CommandError('A tabela de agendamentos não está particionada (requer PostgreSQL).')
+
+            current = date.today().replace(day=1)
+            existing = list_partitions(cursor)
+            missing = [
+                month for month in (add_months(current, offset) for offset in range(options['ahead'] + 1))
+                if month not in existing
+            ]
+            old = []
+            if options['detach_older_than'] is not None:
+                cutoff = add_months(current, -options['detach_older_than'])
+                old = [name for month, name in sorted(existing.items()) if month < cutoff]
+
+            if options['dry_run']:
+                for month in missing:
+                    self.stdout.write(f'Criaria a partição de {month:%Y-%m}')
+                for name in old:
+                    self.stdout.write(f"{'Removeria' if options['drop'] else 'Destacaria'} {name}")
+                return
+
+            # Uma transação curta por partição: os locks de cada ATTACH/DETACH
+            # não se acumulam até o fim do comando
+            for month in missing:
+                with transaction.atomic():
+                    name, moved = create_partition(cursor, month)
+                self.stdout.write(f'Partição {name} criada ({moved} linhas vindas da default).')
+            for name in old:
+                with transaction.atomic():
+                    detach_partition(cursor, name, drop=options['drop'])
+                self.stdout.write(f"Partição {name} {'removida' if options['drop'] else 'destacada'}.")
+
+            cursor.execute(f'SELECT count(*) FROM {DEFAULT_PARTITION}')
+            leftovers = cursor.fetchone()[0]
+        if leftovers:
+            self.stdout.write(self.style.WARNING(
+                f'{leftovers} agendamentos na partição default (datas além de --ahead).'
+            ))
+        self.stdout.write(self.style.SUCCESS('Partições atualizadas.'))
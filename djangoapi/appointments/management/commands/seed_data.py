@@ -0,0 +1,125 @@
+import random
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from core.cache import invalidate_cache
+from appointments.models import Appointments
+from appointments.occupancy import rebuild_occupancy
+from health_professionals.models import HealthProfessional, Profession
+from health_professionals.signals import PROFESSIONALS_CACHE
+
+
+PROFESSIONS = (
+    'Psicóloga', 'Psiquiatra', 'Nutricionista', 'Clínico Geral', 'Dermatologista',
+    'Ginecologista', 'Endocrinologista', 'Fisioterapeuta', 'Fonoaudióloga', 'Cardiologista',
+)
+
+
+class Command(BaseCommand):
+    help = 'Gera profissionais e agendamentos sintéticos em massa para testes de carga.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--professionals', type=int, default=1000)
+        parser.add_argument('--appointments', type=int, default=100000)
+        parser.add_argument('--start-date', type=date.fromisoformat, default=None,
+                            help='Primeiro dia da agenda (YYYY-MM-DD). Padrão: hoje.')
+        parser.add_argument('--occupancy', type=float, default=0.8,
+                            help='Fração dos dias de cada profissional que recebe agendamento.')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Linhas por INSERT quando o banco não suporta COPY.')
+        parser.add_argument('--seed', type=int, default=None, help='Semente para resultados reproduzíveis.')
+
+    def handle(self, *args, **options):
+        if not 0 < options['occupancy'] <= 1:
+            raise CommandError('--occupancy deve estar entre 0 (exclusivo) e 1.')
+
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        use_copy = connection.vendor == 'postgresql'
+
+        with transaction.atomic():
+            professional_ids = self.seed_professionals(options['professionals'], batch_size, use_copy)
+            created = self.seed_appointments(
+                professional_ids, options['appointments'], options['start_date'] or date.today(),
+                options['occupancy'], batch_size, use_copy, rng
+            )
+            # bulk_create/COPY também não atualizam os agregados de ocupação
+            rebuild_occupancy(batch_size)
+
+        # bulk_create/COPY não disparam post_save: invalida o cache manualmente
+        invalidate_cache(PROFESSIONALS_CACHE)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(professional_ids)} profissionais e {created} agendamentos criados.'
+        ))
+
+    def seed_professionals(self, total, batch_size, use_copy):
+        # Prefixo único por execução para não colidir com o índice único
+        # (nome social + profissão) de execuções anteriores
+        prefix = f'Profissional {HealthProfessional.objects.count()}'
+        professions = [Profession.objects.get_or_create(name=name)[0].pk for name in PROFESSIONS]
+        rows = (
+            (f'{prefix}-{index:07d}', professions[index % len(professions)],
+             f'Rua Sintética, {index} - São Paulo/SP', f'(11) 9{index % 100000000:08d}')
+            for index in range(total)
+        )
+        columns = ('social_name', 'profession_id', 'address', 'contact')
+
+        if use_copy:
+            self.copy_rows(HealthProfessional, columns, rows)
+        else:
+            self.bulk_create_rows(HealthProfessional, columns, rows, batch_size)
+
+        return list(
+            HealthProfessional.objects.filter(social_name__startswith=f'{prefix}-')
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def seed_appointments(self, professional_ids, total, start_date, occupancy, batch_size, use_copy, rng):
+        if not professional_ids or not total:
+            return 0
+
+        def rows():
+            # Percorre os dias a partir de start_date; em cada dia, cada
+            # profissional recebe agendamento com probabilidade "occupancy".
+            # (dia, profissional) nunca se repete, respeitando o unique_together
+            created = 0
+            day = start_date
+            while True:
+                for professional_id in professional_ids:
+                    if rng.random() < occupancy:
+                        yield (day, professional_id)
+                        created += 1
+                        if created == total:
+                            return
+                day += timedelta(days=1)
+
+        columns = ('date', 'health_professional_id')
+        if use_copy:
+            return self.copy_rows(Appointments, columns, rows())
+        return self.bulk_create_rows(Appointments, columns, rows(), batch_size)
+
+    def bulk_create_rows(self, model, columns, rows, batch_size):
+        created = 0
+        batch = []
+        for row in rows:
+            batch.append(model(**dict(zip(columns, row))))
+            if len(batch) == batch_size:
+                model.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch)
+            created += len(batch)
+        return created
+
+    def copy_rows(self, model, columns, rows):
+        # COPY FROM STDIN do psycopg 3: bem mais rápido que INSERTs em lote
+        table = connection.ops.quote_name(model._meta.db_table)
+        column_list = ', '.join(connection.ops.quote_name(column) for column in columns)
+        created = 0
+        with connection.cursor() as cursor:
+            with cursor.cursor.copy(f'COPY {table} ({column_list}) FROM STDIN') as copy:
+                for row in rows:
+                    copy.write_row(row)
+                    created += 1
+        return created
@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0004_alter_appointments_options_and_more'),
+        ('health_professionals', '0005_healthprofessional_professional_profession'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appointments',
+            index=models.Index(fields=['health_professional', 'date'], name='appointment_professional_date'),
+        ),
+        migrations.AddIndex(
+            model_name='appointments',
+            index=models.Index(fields=['date', 'id'], name='appointment_date_id'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:51
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0005_appointments_appointment_professional_date_and_more'),
+        ('health_professionals', '0007_healthprofessionaltombstone_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.BigIntegerField(verbose_name='ID removido')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_default=django.db.models.functions.datetime.Now(), verbose_name='Removido em')),
+            ],
+            options={
+                'verbose_name': 'Agendamento removido',
+                'verbose_name_plural': 'Agendamentos removidos',
+                'ordering': ['deleted_at', 'id'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='appointments',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_default=django.db.models.functions.datetime.Now(), db_index=True, verbose_name='Criado em'),
+        ),
+        migrations.AddField(
+            model_name='appointments',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now(), verbose_name='Atualizado em'),
+        ),
+        migrations.AddIndex(
+            model_name='appointments',
+            index=models.Index(fields=['updated_at', 'id'], name='appointment_updated_at_id'),
+        ),
+        migrations.AddIndex(
+            model_name='appointmenttombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='appointment_tombstone_deleted'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 6.1.2 on 2026-10-18 15:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+
+def populate_occupancy(apps, schema_editor):
+    # Preenche os agregados com os agendamentos já existentes
+    Appointments = apps.get_model('appointments', 'Appointments')
+    DailyOccupancy = apps.get_model('appointments', 'DailyOccupancy')
+    MonthlyOccupancy = apps.get_model('appointments', 'MonthlyOccupancy')
+
+    daily = (
+        Appointments.objects.values('date', 'health_professional__profession')
+        .annotate(total=Count('id')).order_by()
+    )
+    DailyOccupancy.objects.bulk_create([
+        DailyOccupancy(date=row['date'], profession=row['health_professional__profession'], booked=row['total'])
+        for row in daily
+    ], batch_size=5000)
+
+    monthly = (
+        Appointments.objects.annotate(month=TruncMonth('date')).values('month', 'health_professional_id')
+        .annotate(total=Count('id')).order_by()
+    )
+    MonthlyOccupancy.objects.bulk_create([
+        MonthlyOccupancy(month=row['month'], health_professional_id=row['health_professional_id'], booked=row['total'])
+        for row in monthly
+    ], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0006_appointmenttombstone_appointments_created_at_and_more'),
+        ('health_professionals', '0007_healthprofessionaltombstone_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('profession', models.CharField(max_length=100, verbose_name='Profissão')),
+                ('booked', models.IntegerField(default=0, verbose_name='Agendados')),
+            ],
+            options={
+                'verbose_name': 'Ocupação diária',
+                'verbose_name_plural': 'Ocupação diária',
+                'ordering': ['date', 'profession'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'profession'), name='occupancy_date_profession')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlyOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(verbose_name='Mês')),
+                ('booked', models.IntegerField(default=0, verbose_name='Agendados')),
+                ('health_professional', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_occupancy', to='health_professionals.healthprofessional', verbose_name='Profissional')),
+            ],
+            options={
+                'verbose_name': 'Ocupação mensal',
+                'verbose_name_plural': 'Ocupação mensal',
+                'ordering': ['month', 'health_professional'],
+                'indexes': [models.Index(fields=['health_professional', 'month'], name='occupancy_professional_month')],
+                'constraints': [models.UniqueConstraint(fields=('month', 'health_professional'), name='occupancy_month_professional')],
+            },
+        ),
+        migrations.RunPython(populate_occupancy, migrations.RunPython.noop),
+    ]
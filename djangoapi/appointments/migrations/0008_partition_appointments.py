@@ -0,0 +1,122 @@
+from datetime import date
+from django.db import migrations
+
+
+TABLE = 'appointments_appointments'
+# Meses criados à frente na migração; depois o comando manage_partitions
+# mantém essa janela
+MONTHS_AHEAD = 12
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def capture_schema(cursor, table):
+    # Definições dos índices e constraints atuais, para recriá-los com os
+    # mesmos nomes que o Django conhece na tabela nova. Só PK, unique, FK e
+    # check: desde o Postgres 18 os NOT NULL também ficam no pg_constraint
+    # (contype 'n'), mas esses o LIKE já copia
+    cursor.execute(
+        """
+        SELECT conname, contype, pg_get_constraintdef(oid)
+        FROM pg_constraint WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f', 'c')
+        """,
+        [table]
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+        FROM pg_index
+        WHERE indrelid = %s::regclass
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = indexrelid)
+        """,
+        [table]
+    )
+    indexes = cursor.fetchall()
+    return constraints, indexes
+
+
+def rebuild_table(cursor, partitioned):
+    old = f'{TABLE}_old'
+    constraints, indexes = capture_schema(cursor, TABLE)
+
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {old}')
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+    # Libera os nomes para a tabela nova; a antiga só serve de origem da cópia
+    for name, _, _ in constraints:
+        cursor.execute(f'ALTER TABLE {old} DROP CONSTRAINT {name}')
+
+    partition_clause = 'PARTITION BY RANGE (date)' if partitioned else ''
+    cursor.execute(f'CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS) {partition_clause}')
+    cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN id DROP DEFAULT')
+    if partitioned:
+        # Tabelas particionadas no Postgres 16 não aceitam coluna identity
+        cursor.execute(f'CREATE SEQUENCE {TABLE}_id_partitioned_seq OWNED BY {TABLE}.id')
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_partitioned_seq')")
+    else:
+        cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+
+    for name, kind, definition in sorted(constraints, key=lambda constraint: constraint[1] == 'f'):
+        if kind == 'p':
+            # A chave primária de uma tabela particionada inclui a coluna de partição
+            definition = 'PRIMARY KEY (id, date)' if partitioned else 'PRIMARY KEY (id)'
+        cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+    for _, definition in indexes:
+        cursor.execute(definition)
+
+    if partitioned:
+        cursor.execute(f'SELECT min(date), max(date) FROM {old}')
+        first, last = cursor.fetchone()
+        today = date.today().replace(day=1)
+        month = min(first or today, today).replace(day=1)
+        end = add_months(max(last or today, today), MONTHS_AHEAD)
+        while month < end:
+            following = add_months(month, 1)
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)",
+                [month, following]
+            )
+            month = following
+        # Datas fora das partições mensais (ex.: muito à frente) caem aqui
+        cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+    cursor.execute(f'INSERT INTO {TABLE} SELECT * FROM {old}')
+    cursor.execute(f'DROP TABLE {old} CASCADE')
+    cursor.execute(f"SELECT pg_get_serial_sequence('{TABLE}', 'id')")
+    sequence = cursor.fetchone()[0]
+    cursor.execute(f'SELECT setval(%s, coalesce(max(id), 0) + 1, false) FROM {TABLE}', [sequence])
+    if sequence != f'public.{TABLE}_id_seq':
+        # Mantém o nome de sequência padrão do Django
+        cursor.execute(f'ALTER SEQUENCE {sequence} RENAME TO {TABLE}_id_seq')
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        rebuild_table(cursor, partitioned=True)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        rebuild_table(cursor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+    # Particiona a tabela de agendamentos por mês (RANGE em "date") no
+    # Postgres. Copia os dados existentes numa única transação: em bases
+    # grandes, rode numa janela de manutenção. Nos demais bancos não faz nada
+
+    dependencies = [
+        ('appointments', '0007_dailyoccupancy_monthlyoccupancy'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 6.1.2 on 2026-10-18 15:19
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# Ativos + arquivados numa única relação, para leituras com
+# ?include_archived=true. Com UNION ALL os filtros por data e profissional
+# descem para os índices de cada tabela
+CREATE_HISTORY_VIEW = '''
+CREATE VIEW appointments_appointmenthistory AS
+SELECT id, date, health_professional_id, created_at, updated_at, FALSE AS archived
+FROM appointments_appointments
+UNION ALL
+SELECT id, date, health_professional_id, created_at, updated_at, TRUE AS archived
+FROM appointments_archivedappointment
+'''
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0008_partition_appointments'),
+        ('health_professionals', '0007_healthprofessionaltombstone_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppointmentHistory',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField(verbose_name='Data')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('archived', models.BooleanField(verbose_name='Arquivado')),
+            ],
+            options={
+                'verbose_name': 'Histórico de agendamentos',
+                'verbose_name_plural': 'Histórico de agendamentos',
+                'db_table': 'appointments_appointmenthistory',
+                'ordering': ['date'],
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedAppointment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField(verbose_name='Data')),
+                ('created_at', models.DateTimeField(verbose_name='Criado em')),
+                ('updated_at', models.DateTimeField(verbose_name='Atualizado em')),
+                ('archived_at', models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), default=django.utils.timezone.now, verbose_name='Arquivado em')),
+                ('health_professional', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_appointments', to='health_professionals.healthprofessional', verbose_name='Profissional')),
+            ],
+            options={
+                'verbose_name': 'Agendamento arquivado',
+                'verbose_name_plural': 'Agendamentos arquivados',
+                'ordering': ['date'],
+                'indexes': [models.Index(fields=['date', 'id'], name='archived_date_id'), models.Index(fields=['health_professional', 'date'], name='archived_professional_date')],
+            },
+        ),
+        migrations.RunSQL(CREATE_HISTORY_VIEW, 'DROP VIEW appointments_appointmenthistory'),
+    ]
@@ -0,0 +1,87 @@
+from collections import Counter
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def normalize(name):
+    # Mesma regra de Profession.normalize
+    return ' '.join(name.split()).title()
+
+
+def link_professions(apps, schema_editor):
+    # Reescreve o agregado com a FK do catálogo. Grafias diferentes da mesma
+    # profissão (ex.: "psicóloga" e "Psicóloga") viram uma linha só, somada
+    DailyOccupancy = apps.get_model('appointments', 'DailyOccupancy')
+    Profession = apps.get_model('health_professionals', 'Profession')
+
+    catalog = dict(Profession.objects.values_list('name', 'pk'))
+    booked = Counter()
+    for day, name, total in DailyOccupancy.objects.values_list('date', 'profession', 'booked').iterator():
+        normalized = normalize(name)
+        if normalized not in catalog:
+            # Profissão que nenhum profissional usa mais: mantém o histórico
+            catalog[normalized] = Profession.objects.create(name=normalized).pk
+        booked[(day, catalog[normalized])] += total
+
+    names = {pk: name for name, pk in catalog.items()}
+    DailyOccupancy.objects.all().delete()
+    DailyOccupancy.objects.bulk_create(
+        [
+            DailyOccupancy(date=day, profession=names[pk], profession_ref_id=pk, booked=total)
+            for (day, pk), total in booked.items()
+        ],
+        batch_size=1000
+    )
+
+
+def restore_profession_names(apps, schema_editor):
+    DailyOccupancy = apps.get_model('appointments', 'DailyOccupancy')
+    Profession = apps.get_model('health_professionals', 'Profession')
+    for profession in Profession.objects.all():
+        DailyOccupancy.objects.filter(profession_ref=profession).update(profession=profession.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0009_archivedappointment_appointmenthistory'),
+        ('health_professionals', '0010_profession'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='dailyoccupancy',
+            name='occupancy_date_profession',
+        ),
+        migrations.AddField(
+            model_name='dailyoccupancy',
+            name='profession_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_occupancy', to='health_professionals.profession', verbose_name='Profissão'),
+        ),
+        migrations.RunPython(link_professions, restore_profession_names),
+        # blank=True dá à coluna recriada na volta um default vazio, que o
+        # RunPython de volta preenche com os nomes
+        migrations.AlterField(
+            model_name='dailyoccupancy',
+            name='profession',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Profissão'),
+        ),
+        migrations.RemoveField(
+            model_name='dailyoccupancy',
+            name='profession',
+        ),
+        migrations.RenameField(
+            model_name='dailyoccupancy',
+            old_name='profession_ref',
+            new_name='profession',
+        ),
+        migrations.AlterField(
+            model_name='dailyoccupancy',
+            name='profession',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_occupancy', to='health_professionals.profession', verbose_name='Profissão'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyoccupancy',
+            constraint=models.UniqueConstraint(fields=('date', 'profession'), name='occupancy_date_profession'),
+        ),
+    ]
@@ -1,10 +1,17 @@
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.db.models.functions import Now
 from django.utils import timezone
-from health_professionals.models import HealthProfessional
+from core.models import TimestampedModel, Tombstone
+from health_professionals.models import HealthProfessional, Profession
 
 
-class Appointments(models.Model):
+# Nome que o Django gerou para o unique_together (date, health_professional),
+# preservado na migração que particiona a tabela
+APPOINTMENT_UNIQUE_CONSTRAINT = 'appointments_appointment_date_health_professional_3a3d4b0f_uniq'
+
+
+class Appointments(TimestampedModel):
     date = models.DateField(
         verbose_name='Data',
     )
@@ -21,6 +28,30 @@ class Appointments(models.Model):
         ordering = ['date']
         # Garante no banco que não há agendamentos duplicados
         unique_together = ['date', 'health_professional']
+        indexes = [
+            # Agenda de um ou vários profissionais num intervalo de datas
+            models.Index(
+                fields=['health_professional', 'date'],
+                name='appointment_professional_date'
+            ),
+            # Intervalos de datas e paginação por cursor (date, id)
+            models.Index(fields=['date', 'id'], name='appointment_date_id'),
+            # Feed de sincronização: keyset por (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='appointment_updated_at_id'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values, **kwargs):
+        instance = super().from_db(db, field_names, values, **kwargs)
+        # Data e profissional como estavam no banco: no post_save indicam de
+        # qual dia/profissional o agendamento saiu (relatórios de ocupação)
+        instance._loaded_slot = instance.slot
+        return instance
+
+    @property
+    def slot(self):
+        # __dict__ evita disparar query para campos adiados com .only()
+        return self.__dict__.get('date'), self.__dict__.get('health_professional_id')
 
     def __str__(self):
         return f"Agendamento {self.health_professional} - {self.date}"
@@ -30,3 +61,112 @@ class Appointments(models.Model):
             raise ValidationError({
                 'date': 'A data não pode ser anterior à data atual.'
             })
+
+
+class AppointmentTombstone(Tombstone):
+
+    class Meta(Tombstone.Meta):
+        verbose_name = 'Agendamento removido'
+        verbose_name_plural = 'Agendamentos removidos'
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='appointment_tombstone_deleted'),
+        ]
+
+
+class ArchivedAppointment(models.Model):
+    # Armazenamento frio: agendamentos antigos movidos pelo comando
+    # archive_appointments, com o mesmo id que tinham na tabela ativa
+    id = models.BigIntegerField(primary_key=True)
+    date = models.DateField(verbose_name='Data')
+    health_professional = models.ForeignKey(
+        HealthProfessional,
+        on_delete=models.PROTECT,
+        related_name='archived_appointments',
+        verbose_name='Profissional'
+    )
+    created_at = models.DateTimeField(verbose_name='Criado em')
+    updated_at = models.DateTimeField(verbose_name='Atualizado em')
+    archived_at = models.DateTimeField(
+        default=timezone.now,
+        db_default=Now(),
+        verbose_name='Arquivado em'
+    )
+
+    class Meta:
+        verbose_name = 'Agendamento arquivado'
+        verbose_name_plural = 'Agendamentos arquivados'
+        ordering = ['date']
+        indexes = [
+            models.Index(fields=['date', 'id'], name='archived_date_id'),
+            models.Index(fields=['health_professional', 'date'], name='archived_professional_date'),
+        ]
+
+    def __str__(self):
+        return f"Agendamento arquivado {self.health_professional} - {self.date}"
+
+
+class AppointmentHistory(models.Model):
+    # Somente leitura: view SQL (migração 0009) com os agendamentos ativos e
+    # os arquivados (UNION ALL). Usada pelo ?include_archived=true
+    id = models.BigIntegerField(primary_key=True)
+    date = models.DateField(verbose_name='Data')
+    health_professional = models.ForeignKey(
+        HealthProfessional,
+        on_delete=models.DO_NOTHING,
+        related_name='+',
+        verbose_name='Profissional'
+    )
+    created_at = models.DateTimeField(verbose_name='Criado em')
+    updated_at = models.DateTimeField(verbose_name='Atualizado em')
+    archived = models.BooleanField(verbose_name='Arquivado')
+
+    class Meta:
+        managed = False
+        db_table = 'appointments_appointmenthistory'
+        verbose_name = 'Histórico de agendamentos'
+        verbose_name_plural = 'Histórico de agendamentos'
+        ordering = ['date']
+
+
+class DailyOccupancy(models.Model):
+    # Agregado mantido a cada escrita (appointments/occupancy.py): quantos
+    # profissionais de cada profissão têm agendamento em cada dia
+    date = models.DateField(verbose_name='Data')
+    profession = models.ForeignKey(
+        Profession,
+        on_delete=models.CASCADE,
+        related_name='daily_occupancy',
+        verbose_name='Profissão'
+    )
+    booked = models.IntegerField(default=0, verbose_name='Agendados')
+
+    class Meta:
+        verbose_name = 'Ocupação diária'
+        verbose_name_plural = 'Ocupação diária'
+        ordering = ['date', 'profession']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'profession'], name='occupancy_date_profession'),
+        ]
+
+
+class MonthlyOccupancy(models.Model):
+    # Agendamentos de cada profissional por mês ('month' é o primeiro dia)
+    month = models.DateField(verbose_name='Mês')
+    health_professional = models.ForeignKey(
+        HealthProfessional,
+        on_delete=models.CASCADE,
+        related_name='monthly_occupancy',
+        verbose_name='Profissional'
+    )
+    booked = models.IntegerField(default=0, verbose_name='Agendados')
+
+    class Meta:
+        verbose_name = 'Ocupação mensal'
+        verbose_name_plural = 'Ocupação mensal'
+        ordering = ['month', 'health_professional']
+        constraints = [
+            models.UniqueConstraint(fields=['month', 'health_professional'], name='occupancy_month_professional'),
+        ]
+        indexes = [
+            models.Index(fields=['health_professional', 'month'], name='occupancy_professional_month'),
+        ]
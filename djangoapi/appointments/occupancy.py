@@ -0,0 +1,108 @@
+from collections import Counter
+from itertools import islice
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from appointments.models import AppointmentHistory, DailyOccupancy, MonthlyOccupancy
+from health_professionals.models import HealthProfessional
+
+
+UPSERT_BATCH_SIZE = 500
+
+
+def apply_occupancy_changes(changes, professions=None):
+    # 'changes' é um Counter {(data, id do profissional): +1/-1}. Converte em
+    # incrementos por (data, id da profissão) e (mês, profissional) e aplica com
+    # upsert, na mesma transação da escrita que os gerou
+    changes = {slot: delta for slot, delta in changes.items() if delta}
+    if not changes:
+        return
+
+    professional_ids = {professional for _, professional in changes}
+    if professions is None:
+        professions = dict(
+            HealthProfessional.objects.filter(pk__in=professional_ids).values_list('pk', 'profession_id')
+        )
+
+    daily = Counter()
+    monthly = Counter()
+    for (day, professional), delta in changes.items():
+        daily[(day, professions[professional])] += delta
+        monthly[(day.replace(day=1), professional)] += delta
+
+    upsert_counts(DailyOccupancy, ('date', 'profession_id'), daily)
+    upsert_counts(MonthlyOccupancy, ('month', 'health_professional_id'), monthly)
+
+
+def upsert_counts(model, key_columns, counts):
+    # INSERT ... ON CONFLICT DO UPDATE soma o delta ao valor atual num único
+    # comando (Postgres e SQLite). Chaves em ordem fixa evitam deadlock entre
+    # transações que atualizam as mesmas linhas
+    rows = sorted((key + (delta,) for key, delta in counts.items() if delta), key=lambda row: row[:-1])
+    if not rows:
+        return
+
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = [quote(model._meta.get_field(column).column) for column in key_columns]
+    booked = quote('booked')
+    with connection.cursor() as cursor:
+        # Lotes limitados para não estourar o máximo de parâmetros por comando
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            placeholders = ', '.join(['(%s)' % ', '.join(['%s'] * (len(columns) + 1))] * len(batch))
+            cursor.execute(
+                f'INSERT INTO {table} ({", ".join(columns)}, {booked}) VALUES {placeholders} '
+                f'ON CONFLICT ({", ".join(columns)}) DO UPDATE SET {booked} = {table}.{booked} + EXCLUDED.{booked}',
+                [value for row in batch for value in row]
+            )
+
+
+def move_profession(professional_id, old_profession_id, new_profession_id):
+    # Profissional trocou de profissão: os dias dele mudam de grupo,
+    # inclusive os já arquivados
+    days = Counter(dict(
+        AppointmentHistory.objects.filter(health_professional_id=professional_id)
+        .values_list('date').annotate(total=Count('id')).values_list('date', 'total')
+    ))
+    if not days:
+        return
+    daily = Counter()
+    for day, total in days.items():
+        daily[(day, old_profession_id)] -= total
+        daily[(day, new_profession_id)] += total
+    upsert_counts(DailyOccupancy, ('date', 'profession_id'), daily)
+
+
+def rebuild_occupancy(batch_size=5000):
+    # Recalcula os dois agregados do zero a partir dos agendamentos ativos e
+    # arquivados: o arquivamento não apaga o histórico de ocupação
+    DailyOccupancy.objects.all().delete()
+    MonthlyOccupancy.objects.all().delete()
+
+    daily = (
+        AppointmentHistory.objects.values('date', 'health_professional__profession_id')
+        .annotate(total=Count('id')).order_by()
+    )
+    insert_batches(DailyOccupancy, (
+        DailyOccupancy(
+            date=row['date'], profession_id=row['health_professional__profession_id'], booked=row['total']
+        )
+        for row in daily.iterator(chunk_size=batch_size)
+    ), batch_size)
+
+    monthly = (
+        AppointmentHistory.objects.annotate(month=TruncMonth('date')).values('month', 'health_professional_id')
+        .annotate(total=Count('id')).order_by()
+    )
+    insert_batches(MonthlyOccupancy, (
+        MonthlyOccupancy(month=row['month'], health_professional_id=row['health_professional_id'], booked=row['total'])
+        for row in monthly.iterator(chunk_size=batch_size)
+    ), batch_size)
+    return DailyOccupancy.objects.count(), MonthlyOccupancy.objects.count()
+
+
+def insert_batches(model, objects, batch_size):
+    # bulk_create transformaria o gerador inteiro em lista
+    while batch := list(islice(objects, batch_size)):
+        model.objects.bulk_create(batch)
@@ -0,0 +1,12 @@
+from core.pagination import DefaultCursorPagination
+
+
+class AppointmentsCursorPagination(DefaultCursorPagination):
+    # 'id' desempata agendamentos na mesma data
+    ordering = ('date', 'id')
+
+
+class MonthlyOccupancyCursorPagination(DefaultCursorPagination):
+    # Uma linha por profissional no mês: o cursor (month, profissional)
+    # percorre o índice único occupancy_month_professional
+    ordering = ('month', 'health_professional_id')
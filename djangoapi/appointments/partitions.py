@@ -0,0 +1,86 @@
+import re
+from datetime import date
+from django.db import connection
+from appointments.models import Appointments
+
+
+# Particionamento mensal da tabela de agendamentos (Postgres). A tabela é
+# convertida pela migração 0008; aqui ficam as rotinas de manutenção usadas
+# pelo comando manage_partitions
+TABLE = Appointments._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+PARTITION_NAME = re.compile(rf'^{TABLE}_p(\d{{4}})(\d{{2}})$')
+
+
+def add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def is_partitioned(cursor):
+    if connection.vendor != 'postgresql':
+        return False
+    cursor.execute(
+        'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)', [TABLE]
+    )
+    return cursor.fetchone()[0]
+
+
+def list_partitions(cursor):
+    # {primeiro dia do mês: nome da partição}, só as mensais
+    cursor.execute(
+        """
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = %s::regclass
+        """,
+        [TABLE]
+    )
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def create_partition(cursor, month):
+    # Cria a tabela fora do particionamento, move para ela as linhas do mês
+    # que tenham caído na partição default e só então a anexa. O CHECK com
+    # os limites do mês evita que o ATTACH varra a tabela para validá-la.
+    # Deve rodar numa transação: a trava na default (até o commit) segura as
+    # escritas que cairiam nela, senão um agendamento do mês inserido entre
+    # a cópia e o ATTACH faria o ATTACH falhar. Leituras e escritas nas
+    # outras partições seguem normalmente
+    name = partition_name(month)
+    following = add_months(month, 1)
+    cursor.execute(f'LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE')
+    cursor.execute(f'CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION} WHERE date >= %s AND date < %s RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+        """,
+        [month, following]
+    )
+    moved = cursor.rowcount
+    cursor.execute(f'ALTER TABLE {name} ADD CONSTRAINT {name}_bounds CHECK (date >= %s AND date < %s)',
+                   [month, following])
+    cursor.execute(f'ALTER TABLE {TABLE} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)',
+                   [month, following])
+    cursor.execute(f'ALTER TABLE {name} DROP CONSTRAINT {name}_bounds')
+    return name, moved
+
+
+def detach_partition(cursor, name, drop=False):
+    # Sem a partição, as consultas deixam de enxergar o mês. A tabela
+    # destacada continua no banco (consulta manual/backup) a menos que drop
+    cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+    if drop:
+        cursor.execute(f'DROP TABLE {name}')
@@ -1,6 +1,14 @@
+from collections import Counter
+from datetime import timedelta
 from rest_framework import serializers
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils import timezone
-from appointments.models import Appointments
+from core.exceptions import Conflict, is_unique_conflict
+from appointments.models import APPOINTMENT_UNIQUE_CONSTRAINT, Appointments, DailyOccupancy, MonthlyOccupancy
+from appointments.occupancy import apply_occupancy_changes
+from health_professionals.models import HealthProfessional
+from health_professionals.serializers import HealthProfessionalModelSerializers
 
 
 class AppointmentsModelSerializers(serializers.ModelSerializer):
@@ -9,6 +17,9 @@ class AppointmentsModelSerializers(serializers.ModelSerializer):
 
         model = Appointments
         fields = '__all__'
+        # Sem UniqueTogetherValidator: o unique_together do banco é a
+        # garantia, e a violação vira 409 na view (IntegrityConflictMixin)
+        validators = []
 
     def validate_date(self, value):
         today = timezone.now().date()
@@ -25,18 +36,192 @@ class AppointmentsModelSerializers(serializers.ModelSerializer):
             )
         return value
 
-    def validate_mult_fields(self, data):
-        date = data.get('date')
-        professional = data.get('health_professional')
-        if date and professional:
-            query = Appointments.objects.filter(
-                date=date,
-                health_professional=professional
+
+class AppointmentsExpandedSerializer(AppointmentsModelSerializers):
+    # Somente leitura: embute o profissional, carregado pelo select_related da view
+    health_professional = HealthProfessionalModelSerializers(read_only=True)
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    profession = serializers.CharField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1)
+
+    def validate_limit(self, value):
+        return min(value, settings.API_MAX_PAGE_SIZE)
+
+    def validate(self, data):
+        today = timezone.now().date()
+        start = data.get('start') or today
+        end = data.get('end') or start + timedelta(days=settings.AVAILABILITY_DEFAULT_DAYS)
+
+        if start < today:
+            raise serializers.ValidationError({
+                'start': 'A data inicial não pode ser anterior à data atual.'
+            })
+        if end < start:
+            raise serializers.ValidationError({
+                'end': 'A data final deve ser igual ou posterior à data inicial.'
+            })
+        if (end - start).days > settings.AVAILABILITY_MAX_DAYS:
+            raise serializers.ValidationError({
+                'end': f'O intervalo não pode exceder {settings.AVAILABILITY_MAX_DAYS} dias.'
+            })
+
+        data['start'] = start
+        data['end'] = end
+        return data
+
+
+class AvailabilitySlotSerializer(serializers.Serializer):
+    health_professional = serializers.IntegerField()
+    social_name = serializers.CharField()
+    profession = serializers.CharField()
+    date = serializers.DateField()
+
+
+class AppointmentsBulkListSerializer(serializers.ListSerializer):
+    # Valida o lote inteiro com consultas fixas (profissionais existentes e
+    # conflitos de data) em vez de uma consulta por item, e guarda os erros
+    # por posição para que itens válidos sejam gravados mesmo com falhas
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError({
+                'non_field_errors': ['Envie uma lista de agendamentos.']
+            })
+        if not data:
+            raise serializers.ValidationError({
+                'non_field_errors': ['A lista de agendamentos não pode ser vazia.']
+            })
+        if len(data) > settings.BULK_CREATE_MAX_ITEMS:
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    f'O lote não pode exceder {settings.BULK_CREATE_MAX_ITEMS} agendamentos.'
+                ]
+            })
+
+        self.item_errors = {}
+        self.valid_indexes = []
+        candidates = []
+        for index, item in enumerate(data):
+            try:
+                candidates.append((index, self.child.run_validation(item)))
+            except serializers.ValidationError as exc:
+                self.item_errors[index] = exc.detail
+
+        if not candidates:
+            return []
+
+        professional_ids = {item['health_professional'] for _, item in candidates}
+        dates = {item['date'] for _, item in candidates}
+        existing_professionals = set(
+            HealthProfessional.objects.filter(pk__in=professional_ids).values_list('pk', flat=True)
+        )
+        booked = set(
+            Appointments.objects.filter(
+                health_professional_id__in=professional_ids,
+                date__in=dates
+            ).values_list('date', 'health_professional_id')
+        )
+
+        valid = []
+        for index, item in candidates:
+            key = (item['date'], item['health_professional'])
+            if item['health_professional'] not in existing_professionals:
+                self.item_errors[index] = {
+                    'health_professional': ['Profissional de saúde não encontrado.']
+                }
+            elif key in booked:
+                self.item_errors[index] = {
+                    'non_field_errors': ['Este profissional já possui agendamento nesta data.']
+                }
+            else:
+                # Marca como ocupado para barrar duplicatas dentro do próprio lote
+                booked.add(key)
+                self.valid_indexes.append(index)
+                valid.append(item)
+        return valid
+
+    def create(self, validated_data):
+        # Um agendamento concorrente pode ocupar a data entre a validação e
+        # o INSERT; nesse caso o lote inteiro é desfeito e vira 409
+        try:
+            with transaction.atomic():
+                created = Appointments.objects.bulk_create([
+                    Appointments(
+                        date=item['date'],
+                        health_professional_id=item['health_professional']
+                    )
+                    for item in validated_data
+                ])
+                # bulk_create não dispara post_save: atualiza a ocupação aqui
+                apply_occupancy_changes(Counter(
+                    (item['date'], item['health_professional']) for item in validated_data
+                ))
+                return created
+        except IntegrityError as exc:
+            if not is_unique_conflict(exc, [APPOINTMENT_UNIQUE_CONSTRAINT]):
+                raise
+            raise Conflict(
+                'Um dos agendamentos do lote foi ocupado por outra requisição. Nenhum item foi gravado.'
+            )
+
+
+class AppointmentsBulkItemSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    health_professional = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        list_serializer_class = AppointmentsBulkListSerializer
+
+    def validate_date(self, value):
+        today = timezone.now().date()
+        if value < today:
+            raise serializers.ValidationError(
+                'A data não pode ser anterior à data atual.'
             )
-            if self.instance:
-                query = query.exclude(pk=self.instance.pk)
-            if query.exists():
-                raise serializers.ValidationError(
-                    'Este profissional já possui agendamento nesta data.'
-                )
+        return value
+
+
+class OccupancyQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    profession = serializers.CharField(required=False)
+
+    def validate(self, data):
+        start = data.get('start') or timezone.now().date()
+        end = data.get('end') or start + timedelta(days=settings.AVAILABILITY_DEFAULT_DAYS)
+
+        if end < start:
+            raise serializers.ValidationError({
+                'end': 'A data final deve ser igual ou posterior à data inicial.'
+            })
+        if (end - start).days > settings.OCCUPANCY_MAX_DAYS:
+            raise serializers.ValidationError({
+                'end': f'O intervalo não pode exceder {settings.OCCUPANCY_MAX_DAYS} dias.'
+            })
+
+        data['start'] = start
+        data['end'] = end
         return data
+
+
+class DailyOccupancySerializer(serializers.ModelSerializer):
+    profession = serializers.CharField(source='profession.name')
+    professionals = serializers.IntegerField()
+    utilization = serializers.FloatField()
+
+    class Meta:
+        model = DailyOccupancy
+        fields = ['date', 'profession', 'booked', 'professionals', 'utilization']
+
+
+class MonthlyOccupancySerializer(serializers.ModelSerializer):
+    social_name = serializers.CharField(source='health_professional.social_name')
+    profession = serializers.CharField(source='health_professional.profession.name')
+
+    class Meta:
+        model = MonthlyOccupancy
+        fields = ['month', 'health_professional', 'social_name', 'profession', 'booked']
@@ -0,0 +1,75 @@
+from collections import Counter
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from appointments.models import Appointments, AppointmentTombstone
+from appointments.occupancy import apply_occupancy_changes, move_profession
+from health_professionals.models import HealthProfessional
+
+
+@receiver(pre_delete, sender=Appointments)
+def lock_deleted_slot(sender, instance, **kwargs):
+    # O post_delete dispara mesmo quando o DELETE não removeu nada (instância
+    # desatualizada, já apagada por outra requisição). Trava e relê a linha:
+    # sem ela não há ocupação a descontar nem tombstone a gravar
+    instance._deleted_slot = Appointments.objects.select_for_update().filter(pk=instance.pk).values_list(
+        'date', 'health_professional_id'
+    ).first()
+
+
+@receiver(post_delete, sender=Appointments)
+def record_appointment_tombstone(sender, instance, **kwargs):
+    if instance._deleted_slot is not None:
+        AppointmentTombstone.objects.create(object_id=instance.pk)
+
+
+def cached_professions(instance):
+    # Evita buscar a profissão quando o profissional já está carregado
+    # (caso das views, em que o serializer resolve a FK na validação)
+    if Appointments.health_professional.is_cached(instance):
+        return {instance.health_professional_id: instance.health_professional.profession_id}
+    return None
+
+
+@receiver(pre_save, sender=Appointments)
+def load_previous_slot(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding or None not in getattr(instance, '_loaded_slot', (None,)):
+        return
+    # Instância sem os valores originais (campos adiados): busca no banco
+    instance._loaded_slot = Appointments.objects.filter(pk=instance.pk).values_list(
+        'date', 'health_professional_id'
+    ).first()
+
+
+@receiver(post_save, sender=Appointments)
+def update_occupancy_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    previous = None if created else getattr(instance, '_loaded_slot', None)
+    if previous == instance.slot:
+        return
+
+    changes = Counter({instance.slot: 1})
+    professions = cached_professions(instance)
+    if previous is not None:
+        changes[previous] -= 1
+        if previous[1] != instance.health_professional_id:
+            professions = None
+    apply_occupancy_changes(changes, professions)
+    instance._loaded_slot = instance.slot
+
+
+@receiver(post_delete, sender=Appointments)
+def update_occupancy_on_delete(sender, instance, **kwargs):
+    previous = instance._deleted_slot
+    if previous is None:
+        return
+    professions = cached_professions(instance) if previous == instance.slot else None
+    apply_occupancy_changes(Counter({previous: -1}), professions)
+
+
+@receiver(post_save, sender=HealthProfessional)
+def move_occupancy_on_profession_change(sender, instance, created, raw, **kwargs):
+    previous = getattr(instance, '_loaded_profession', None)
+    if not created and not raw and previous is not None and previous != instance.profession_id:
+        move_profession(instance.pk, previous, instance.profession_id)
+    instance._loaded_profession = instance.profession_id
@@ -0,0 +1,156 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.db import connection
+from django.db.models import Count
+from datetime import date, timedelta
+from io import StringIO
+from unittest import skipIf, skipUnless
+from health_professionals.models import HealthProfessional
+from appointments.models import (
+    AppointmentHistory, Appointments, AppointmentTombstone, ArchivedAppointment, DailyOccupancy, MonthlyOccupancy
+)
+from appointments.partitions import DEFAULT_PARTITION, add_months, create_partition, list_partitions
+from core.testing import get_profession
+
+
+class SeedDataCommandTestCase(TestCase):
+
+    def test_seed_data_creates_rows(self):
+        call_command(
+            'seed_data', professionals=20, appointments=300, seed=1, batch_size=50,
+            stdout=StringIO()
+        )
+
+        self.assertEqual(HealthProfessional.objects.count(), 20)
+        self.assertEqual(Appointments.objects.count(), 300)
+        duplicates = (
+            Appointments.objects.values('date', 'health_professional')
+            .annotate(total=Count('id')).filter(total__gt=1)
+        )
+        self.assertFalse(duplicates.exists())
+
+    def test_seed_data_can_run_twice(self):
+        call_command('seed_data', professionals=5, appointments=10, stdout=StringIO())
+        call_command('seed_data', professionals=5, appointments=10, stdout=StringIO())
+
+        self.assertEqual(HealthProfessional.objects.count(), 10)
+        self.assertEqual(Appointments.objects.count(), 20)
+
+
+class RebuildOccupancyCommandTestCase(TestCase):
+
+    def test_rebuild_occupancy_fixes_drift(self):
+        call_command('seed_data', professionals=10, appointments=200, seed=1, stdout=StringIO())
+        self.assertEqual(sum(DailyOccupancy.objects.values_list('booked', flat=True)), 200)
+
+        DailyOccupancy.objects.update(booked=0)
+        MonthlyOccupancy.objects.all().delete()
+        call_command('rebuild_occupancy', stdout=StringIO())
+
+        self.assertEqual(sum(DailyOccupancy.objects.values_list('booked', flat=True)), 200)
+        self.assertEqual(sum(MonthlyOccupancy.objects.values_list('booked', flat=True)), 200)
+        professional = HealthProfessional.objects.first()
+        self.assertEqual(
+            sum(MonthlyOccupancy.objects.filter(health_professional=professional).values_list('booked', flat=True)),
+            Appointments.objects.filter(health_professional=professional).count()
+        )
+
+
+class ManagePartitionsCommandTestCase(TestCase):
+
+    @skipUnless(connection.vendor == 'postgresql', 'Particionamento só existe no PostgreSQL')
+    def test_manage_partitions_creates_and_detaches(self):
+        professional = HealthProfessional.objects.create(
+            social_name='Dra. Ana Silva', profession=get_profession('Psicóloga'), address='Rua das Flores, 123', contact='(11) 99999-9999'
+        )
+        far = add_months(date.today(), 30)
+        appointment = Appointments.objects.create(date=far, health_professional=professional)
+        with connection.cursor() as cursor:
+            self.assertNotIn(far, list_partitions(cursor))
+
+        call_command('manage_partitions', ahead=31, stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            partitions = list_partitions(cursor)
+            self.assertIn(far, partitions)
+            cursor.execute(f'SELECT count(*) FROM {DEFAULT_PARTITION}')
+            self.assertEqual(cursor.fetchone()[0], 0)
+            cursor.execute(f'SELECT count(*) FROM {partitions[far]}')
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertTrue(Appointments.objects.filter(pk=appointment.pk).exists())
+
+    @skipUnless(connection.vendor == 'postgresql', 'Particionamento só existe no PostgreSQL')
+    def test_manage_partitions_detaches_old_months(self):
+        professional = HealthProfessional.objects.create(
+            social_name='Dra. Ana Silva', profession=get_profession('Psicóloga'), address='Rua das Flores, 123', contact='(11) 99999-9999'
+        )
+        old = add_months(date.today(), -30)
+        appointment = Appointments.objects.create(date=old, health_professional=professional)
+        with connection.cursor() as cursor:
+            create_partition(cursor, old)
+
+        call_command('manage_partitions', ahead=0, detach_older_than=24, drop=True, stdout=StringIO())
+
+        with connection.cursor() as cursor:
+            self.assertNotIn(old, list_partitions(cursor))
+        self.assertFalse(Appointments.objects.filter(pk=appointment.pk).exists())
+
+    @skipUnless(connection.vendor == 'postgresql', 'Particionamento só existe no PostgreSQL')
+    def test_create_partition_locks_default_partition(self):
+        month = add_months(date.today(), 40)
+        with connection.cursor() as cursor:
+            create_partition(cursor, month)
+            # A trava fica com a transação até o commit
+            cursor.execute(
+                "SELECT mode FROM pg_locks WHERE pid = pg_backend_pid() AND relation = %s::regclass",
+                [DEFAULT_PARTITION]
+            )
+            self.assertIn('ShareRowExclusiveLock', [mode for (mode,) in cursor.fetchall()])
+
+    @skipIf(connection.vendor == 'postgresql', 'No PostgreSQL a tabela é particionada')
+    def test_manage_partitions_requires_postgres(self):
+        with self.assertRaises(CommandError):
+            call_command('manage_partitions', stdout=StringIO())
+
+
+class ArchiveAppointmentsCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.professional = HealthProfessional.objects.create(
+            social_name='Dra. Ana Silva', profession=get_profession('Psicóloga'), address='Rua das Flores, 123', contact='(11) 99999-9999'
+        )
+        Appointments.objects.bulk_create([
+            Appointments(date=date.today() - timedelta(days=days), health_professional=self.professional)
+            for days in range(395, 405)
+        ])
+        self.upcoming = Appointments.objects.create(date=date.today(), health_professional=self.professional)
+
+    def test_archive_moves_old_appointments_in_batches(self):
+        call_command('archive_appointments', days=365, batch_size=3, max_batches=2, stdout=StringIO())
+        # Interrompido após 2 lotes: a próxima execução continua de onde parou
+        self.assertEqual(ArchivedAppointment.objects.count(), 6)
+        self.assertEqual(Appointments.objects.count(), 5)
+
+        call_command('archive_appointments', days=365, batch_size=3, stdout=StringIO())
+
+        self.assertEqual(list(Appointments.objects.values_list('id', flat=True)), [self.upcoming.id])
+        self.assertEqual(ArchivedAppointment.objects.count(), 10)
+        self.assertEqual(AppointmentHistory.objects.count(), 11)
+        self.assertEqual(AppointmentHistory.objects.filter(archived=True).count(), 10)
+        # Não é uma exclusão: sem tombstone no feed de sincronização
+        self.assertFalse(AppointmentTombstone.objects.exists())
+
+    def test_archive_keeps_occupancy_history(self):
+        call_command('rebuild_occupancy', stdout=StringIO())
+        call_command('archive_appointments', days=365, stdout=StringIO())
+        call_command('rebuild_occupancy', stdout=StringIO())
+
+        self.assertEqual(sum(DailyOccupancy.objects.values_list('booked', flat=True)), 11)
+
+    def test_archive_dry_run(self):
+        out = StringIO()
+        call_command('archive_appointments', days=365, dry_run=True, stdout=out)
+
+        self.assertIn('10 agendamentos', out.getvalue())
+        self.assertFalse(ArchivedAppointment.objects.exists())
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import date, timedelta
+from health_professionals.models import HealthProfessional
+from core.testing import get_profession
+
+
+class AppointmentsEventsTestCase(APITestCase):
+
+    def setUp(self):
+        self.normal_user = User.objects.create_user(username='userTest', password='userPass')
+        self.health_professional = HealthProfessional.objects.create(
+            social_name='Dra. Ana Silva',
+            profession=get_profession('Psicóloga'),
+            address='Rua das Flores, 123',
+            contact='(11) 99999-9999'
+        )
+        self.other_professional = HealthProfessional.objects.create(
+            social_name='Dr. João Santos',
+            profession=get_profession('Psiquiatra'),
+            address='Av. Paulista, 1000',
+            contact='(11) 98888-8888'
+        )
+        self.events_url = reverse('appointments-events')
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.normal_user)}'}
+
+    async def connect(self, **params):
+        response = await self.async_client.get(self.events_url, params, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        # A inscrição acontece na primeira mensagem
+        self.assertIn(b'conectado', await anext(stream))
+        return stream
+
+    async def next_event(self, stream):
+        chunk = (await asyncio.wait_for(anext(stream), 2)).decode()
+        event, data = chunk.strip().split('\n')
+        return event.removeprefix('event: '), json.loads(data.removeprefix('data: '))
+
+    def write(self, method, url, data=None):
+        # Escrita pela view síncrona, executando os callbacks de on_commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.force_authenticate(user=self.normal_user)
+            return getattr(self.client, method)(url, data, format='json')
+
+    async def test_events_stream_create_update_delete(self):
+        stream = await self.connect()
+        list_url = reverse('appointments-create-list')
+        tomorrow = str(date.today() + timedelta(days=1))
+
+        response = await sync_to_async(self.write)('post', list_url, {
+            'date': tomorrow, 'health_professional': self.health_professional.id
+        })
+        event, data = await self.next_event(stream)
+        self.assertEqual(event, 'appointment.created')
+        self.assertEqual(data['id'], response.data['id'])
+
+        detail_url = reverse('appointments-detail-view', kwargs={'pk': data['id']})
+        await sync_to_async(self.write)('patch', detail_url, {'health_professional': self.other_professional.id})
+        event, data = await self.next_event(stream)
+        self.assertEqual(event, 'appointment.updated')
+        self.assertEqual(data['health_professional'], self.other_professional.id)
+
+        await sync_to_async(self.write)('delete', detail_url)
+        event, data = await self.next_event(stream)
+        self.assertEqual(event, 'appointment.deleted')
+        await stream.aclose()
+
+    async def test_events_stream_filters_by_professional(self):
+        stream = await self.connect(health_professional=self.health_professional.id)
+
+        await sync_to_async(self.write)('post', reverse('appointments-bulk-create'), [
+            {'date': str(date.today() + timedelta(days=1)), 'health_professional': self.other_professional.id},
+            {'date': str(date.today() + timedelta(days=1)), 'health_professional': self.health_professional.id},
+        ])
+        event, data = await self.next_event(stream)
+        self.assertEqual(data['health_professional'], self.health_professional.id)
+
+        # Nenhum outro evento: o do outro profissional foi filtrado
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(anext(stream), 0.2)
+        await stream.aclose()
+
+    async def test_events_stream_with_invalid_filter(self):
+        response = await self.async_client.get(
+            self.events_url, {'health_professional': 'abc'}, headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_events_stream_requires_asgi(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.events_url)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_unauthorized_events_stream(self):
+        response = self.client.get(self.events_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
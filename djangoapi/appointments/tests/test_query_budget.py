@@ -0,0 +1,195 @@
+from asgiref.sync import async_to_sync
+from django.urls import reverse
+from django.test import override_settings
+from django.db import connection
+from unittest import skipUnless
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth.models import User
+from datetime import date, timedelta
+from core.testing import QueryBudgetMixin, get_profession
+from health_professionals.models import HealthProfessional
+from appointments.models import Appointments
+
+
+class AppointmentsQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        self.normal_user = User.objects.create_user(username='userTest', password='userPass')
+        self.client.force_authenticate(user=self.normal_user)
+        self.health_professional = HealthProfessional.objects.create(
+            social_name='Dra. Ana Silva',
+            profession=get_profession('Psicóloga'),
+            address='Rua das Flores, 123',
+            contact='(11) 99999-9999'
+        )
+        self.appointment = Appointments.objects.create(
+            date=date.today() + timedelta(days=1),
+            health_professional=self.health_professional
+        )
+        self.detail_url = reverse('appointments-detail-view', kwargs={'pk': self.appointment.pk})
+
+    def grow(self, total=1000):
+        profession = get_profession('Psicóloga')
+        professionals = HealthProfessional.objects.bulk_create([
+            HealthProfessional(
+                social_name=f'Profissional {index}',
+                profession=profession,
+                address='Rua das Flores, 123',
+                contact='(11) 99999-9999'
+            )
+            for index in range(total // 100)
+        ])
+        Appointments.objects.bulk_create([
+            Appointments(
+                date=date.today() + timedelta(days=2 + index // len(professionals)),
+                health_professional=professionals[index % len(professionals)]
+            )
+            for index in range(total)
+        ])
+
+    def test_list_budget(self):
+        url = reverse('appointments-create-list')
+        self.assertQueryBudget(1, lambda: self.client.get(url), grow=self.grow)
+
+    def test_list_expanded_budget(self):
+        url = reverse('appointments-create-list')
+        params = {'expand': 'health_professional'}
+        self.assertQueryBudget(1, lambda: self.client.get(url, params), grow=self.grow)
+
+    def test_list_sparse_fields_budget(self):
+        url = reverse('appointments-create-list')
+        # Sem 'date': a paginação ainda precisa dele e não pode gerar query extra
+        params = {'fields': 'id,health_professional'}
+        self.assertQueryBudget(1, lambda: self.client.get(url, params), grow=self.grow)
+
+    def test_list_filtered_budget(self):
+        url = reverse('appointments-create-list')
+        params = {
+            'date__gte': str(date.today()),
+            'date__lte': str(date.today() + timedelta(days=7)),
+            'health_professional__in': str(self.health_professional.id),
+            'profession': 'psicóloga',
+        }
+        self.assertQueryBudget(1, lambda: self.client.get(url, params), grow=self.grow)
+
+    def test_list_filtered_by_profession_id_budget(self):
+        url = reverse('appointments-create-list')
+        params = {'profession_id': self.health_professional.profession_id}
+        self.assertQueryBudget(1, lambda: self.client.get(url, params), grow=self.grow)
+
+    def test_create_budget(self):
+        url = reverse('appointments-create-list')
+        days = iter(range(2000, 3000))
+
+        def create():
+            data = {
+                'date': str(date.today() + timedelta(days=next(days))),
+                'health_professional': self.health_professional.id,
+            }
+            return self.client.post(url, data, format='json')
+
+        # Inclui os upserts dos agregados de ocupação
+        self.assertQueryBudget(6, create, grow=self.grow)
+
+    def test_bulk_create_budget(self):
+        url = reverse('appointments-bulk-create')
+        offsets = iter(range(2000, 100000, 100))
+
+        def create():
+            start = next(offsets)
+            data = [
+                {'date': str(date.today() + timedelta(days=start + day)), 'health_professional': self.health_professional.id}
+                for day in range(50)
+            ]
+            return self.client.post(url, data, format='json')
+
+        # Inclui a profissão e os upserts dos agregados de ocupação
+        self.assertQueryBudget(8, create, grow=self.grow)
+
+    def test_detail_budget(self):
+        self.assertQueryBudget(1, lambda: self.client.get(self.detail_url), grow=self.grow)
+
+    def test_detail_expanded_budget(self):
+        params = {'expand': 'health_professional'}
+        self.assertQueryBudget(1, lambda: self.client.get(self.detail_url, params), grow=self.grow)
+
+    def test_update_budget(self):
+        # Saltos de 40 dias: o agendamento sempre muda de dia e de mês
+        days = iter(range(1500, 5000, 40))
+
+        def update():
+            data = {
+                'date': str(date.today() + timedelta(days=next(days))),
+                'health_professional': self.health_professional.id,
+            }
+            return self.client.put(self.detail_url, data, format='json')
+
+        # Inclui os upserts dos agregados de ocupação (o agendamento muda de dia)
+        # e o savepoint da transação que mantém a linha travada
+        self.assertQueryBudget(9, update, grow=self.grow)
+
+    def test_delete_budget(self):
+        # Inclui a trava da linha, o tombstone do feed de sincronização, a
+        # ocupação e o savepoint da transação
+        self.assertQueryBudget(9, lambda: self.client.delete(self.detail_url))
+
+    def test_export_budget(self):
+        url = reverse('appointments-export')
+        self.assertQueryBudget(1, lambda: self.client.get(url), grow=self.grow)
+
+    def test_availability_budget(self):
+        url = reverse('appointments-availability')
+        self.assertQueryBudget(1, lambda: self.client.get(url, {'limit': 50}), grow=self.grow)
+
+    @override_settings(SYNC_LAG_SECONDS=0)
+    def test_sync_budget(self):
+        url = reverse('appointments-sync')
+        # Uma query para as linhas alteradas e outra para os tombstones
+        self.assertQueryBudget(2, lambda: self.client.get(url, {'limit': 50}), grow=self.grow)
+
+    def test_occupancy_report_budget(self):
+        url = reverse('appointments-occupancy-report')
+        # Agregado diário + total de profissionais por profissão
+        self.assertQueryBudget(2, lambda: self.client.get(url), grow=self.grow)
+
+    def test_monthly_report_budget(self):
+        url = reverse('appointments-monthly-report')
+        self.assertQueryBudget(1, lambda: self.client.get(url), grow=self.grow)
+
+    @skipUnless(connection.vendor == 'postgresql', 'EXPLAIN só no PostgreSQL')
+    def test_seq_scan_on_partition_is_caught(self):
+        # Sem varredura por índice e sem filtro indexável ('id + 0') o
+        # planner só tem o Seq Scan, que no plano aparece nas partições
+        # (appointments_appointments_p...)
+        with connection.cursor() as cursor:
+            for setting in ('enable_indexscan', 'enable_indexonlyscan', 'enable_bitmapscan'):
+                cursor.execute(f'SET LOCAL {setting} = off')
+        sql = 'SELECT id FROM appointments_appointments WHERE id + 0 = 1'
+        with self.assertRaisesRegex(AssertionError, 'Seq Scan em appointments_appointments_'):
+            self.assertNoSeqScan([sql])
+
+    def test_events_setup_budget(self):
+        # SSE: orçamento das queries até a primeira mensagem. Só a busca do
+        # usuário na autenticação; o filtro é lido da query string e depois
+        # disso o stream só repassa eventos, sem banco
+        url = reverse('appointments-events')
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.normal_user)}'}
+
+        async def connect():
+            response = await self.async_client.get(
+                url, {'health_professional': self.health_professional.id}, headers=headers
+            )
+            stream = aiter(response.streaming_content)
+            await anext(stream)
+            await stream.aclose()
+            return response
+
+        response = self.assertQueryBudget(1, async_to_sync(connect), grow=self.grow)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+    def test_list_include_archived_budget(self):
+        url = reverse('appointments-create-list')
+        params = {'include_archived': 'true', 'health_professional': self.health_professional.id}
+        # + a validação do profissional pelo filtro
+        self.assertQueryBudget(2, lambda: self.client.get(url, params), grow=self.grow)
@@ -1,10 +1,21 @@
+import json
 from django.urls import reverse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import IntegrityError, connection
+from unittest import skipUnless
+from django.core.management import call_command
+from io import StringIO
+from asgiref.sync import sync_to_async
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth.models import User
 from rest_framework import status
 from datetime import date, timedelta
 from health_professionals.models import HealthProfessional
-from appointments.models import Appointments
+from appointments.views import AppointmentsCreateView
+from appointments.models import Appointments, AppointmentTombstone, DailyOccupancy, MonthlyOccupancy
+from core.testing import get_profession
 
 
 class AppointmentsTestCase(APITestCase):
@@ -17,7 +28,7 @@ class AppointmentsTestCase(APITestCase):
 
         self.health_professional = HealthProfessional.objects.create(
             social_name='Dra. Ana Silva',
-            profession='Psicóloga',
+            profession=get_profession('Psicóloga'),
             address='Rua das Flores, 123',
             contact='(11) 99999-9999'
         )
@@ -80,7 +91,35 @@ class AppointmentsTestCase(APITestCase):
 
         response = self.client.post(self.list_url, data, format='json')
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'], 'Este profissional já possui agendamento nesta data.')
+        self.assertEqual(Appointments.objects.count(), 1)
+
+    def test_other_integrity_errors_are_not_conflicts(self):
+        # Só a unicidade (profissional, data) vira 409; um NOT NULL violado
+        # (ou uma FK de profissional removido) continua sendo erro
+        health_professional = self.health_professional
+
+        class BrokenSerializer:
+            def save(self):
+                return Appointments.objects.create(date=None, health_professional=health_professional)
+
+        with self.assertRaises(IntegrityError):
+            AppointmentsCreateView().save_or_conflict(BrokenSerializer())
+
+    def test_update_appointment_to_booked_date(self):
+        self.client.force_authenticate(user=self.normal_user)
+        other = Appointments.objects.create(
+            date=self.future_date + timedelta(days=1),
+            health_professional=self.health_professional
+        )
+
+        url = reverse('appointments-detail-view', kwargs={'pk': other.pk})
+        response = self.client.patch(url, {"date": str(self.future_date)}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        other.refresh_from_db()
+        self.assertEqual(other.date, self.future_date + timedelta(days=1))
 
     # TEST GET
     def test_list_appointments_success(self):
@@ -88,7 +127,70 @@ class AppointmentsTestCase(APITestCase):
 
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_list_appointments_cursor_pagination(self):
+        self.client.force_authenticate(user=self.normal_user)
+        for days in range(6, 11):
+            Appointments.objects.create(
+                date=date.today() + timedelta(days=days),
+                health_professional=self.health_professional
+            )
+
+        response = self.client.get(self.list_url, {'page_size': 4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = [item['id'] for item in response.data['results']]
+        self.assertEqual(len(first_page), 4)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        second_page = [item['id'] for item in response.data['results']]
+        self.assertEqual(len(second_page), 2)
+        self.assertIsNone(response.data['next'])
+
+        ordered_ids = list(Appointments.objects.order_by('date', 'id').values_list('id', flat=True))
+        self.assertEqual(first_page + second_page, ordered_ids)
+
+    def test_list_appointments_cursor_pagination_many_on_same_date(self):
+        # Mais de 1000 agendamentos na mesma data: o cursor precisa levar
+        # (date, id), senão os empates são paginados por OFFSET
+        self.client.force_authenticate(user=self.normal_user)
+        profession = get_profession('Psicóloga')
+        professionals = HealthProfessional.objects.bulk_create([
+            HealthProfessional(
+                social_name=f'Profissional {index}', profession=profession,
+                address='Rua das Flores, 123', contact='(11) 99999-9999'
+            )
+            for index in range(1200)
+        ])
+        Appointments.objects.bulk_create([
+            Appointments(date=self.future_date, health_professional=professional)
+            for professional in professionals
+        ])
+
+        ids = []
+        pages = 0
+        url, params = self.list_url, {'page_size': 100}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in response.data['results']]
+            url, params = response.data['next'], None
+            pages += 1
+            self.assertLessEqual(pages, 13)
+
+        ordered_ids = list(Appointments.objects.order_by('date', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, ordered_ids)
+
+        # E o link "previous" volta exatamente para a página anterior
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([item['id'] for item in response.data['results']], ordered_ids[-101:-1])
+
+    def test_list_appointments_invalid_cursor(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'cursor': 'invalido'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_get_appointment_by_id_success(self):
         self.client.force_authenticate(user=self.normal_user)
@@ -97,11 +199,50 @@ class AppointmentsTestCase(APITestCase):
         self.assertEqual(response.data['id'], self.appointment.id)
         self.assertEqual(response.data['date'], str(self.future_date))
 
+    def test_list_appointments_expand_professional(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'expand': 'health_professional'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        professional = response.data['results'][0]['health_professional']
+        self.assertEqual(professional['id'], self.health_professional.id)
+        self.assertEqual(professional['social_name'], 'Dra. Ana Silva')
+
+    def test_get_appointment_expand_professional(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.url, {'expand': 'health_professional'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['health_professional']['profession'], 'Psicóloga')
+
+    def test_list_appointments_sparse_fields(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'fields': 'id,date'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0], {'id': self.appointment.id, 'date': str(self.future_date)})
+
+    def test_get_appointment_sparse_fields_with_expand(self):
+        self.client.force_authenticate(user=self.normal_user)
+        params = {'fields': 'health_professional', 'expand': 'health_professional'}
+        response = self.client.get(self.url, params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ['health_professional'])
+        self.assertEqual(response.data['health_professional']['social_name'], 'Dra. Ana Silva')
+
+    def test_list_appointments_invalid_expand(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'expand': 'user'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('expand', response.data)
+
     def test_filter_appointments_by_professional(self):
         self.client.force_authenticate(user=self.normal_user)
         another_professional = HealthProfessional.objects.create(
             social_name='Dr. João Santos',
-            profession='Psiquiatra',
+            profession=get_profession('Psiquiatra'),
             address='Av. Paulista, 1000',
             contact='(11) 98888-8888'
         )
@@ -115,8 +256,56 @@ class AppointmentsTestCase(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['health_professional'], self.health_professional.id)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['health_professional'], self.health_professional.id)
+
+    def test_filter_appointments_by_date_range(self):
+        self.client.force_authenticate(user=self.normal_user)
+        Appointments.objects.create(
+            date=date.today() + timedelta(days=30),
+            health_professional=self.health_professional
+        )
+
+        response = self.client.get(self.list_url, {
+            'date__gte': str(date.today()),
+            'date__lte': str(date.today() + timedelta(days=7)),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.appointment.id])
+
+    def test_filter_appointments_by_professional_list_and_profession(self):
+        self.client.force_authenticate(user=self.normal_user)
+        psychiatrist = HealthProfessional.objects.create(
+            social_name='Dr. João Santos',
+            profession=get_profession('Psiquiatra'),
+            address='Av. Paulista, 1000',
+            contact='(11) 98888-8888'
+        )
+        nutritionist = HealthProfessional.objects.create(
+            social_name='Dra. Carla Lima',
+            profession=get_profession('Nutricionista'),
+            address='Av. Brasil, 500',
+            contact='(11) 97777-7777'
+        )
+        for professional in (psychiatrist, nutritionist):
+            Appointments.objects.create(
+                date=date.today() + timedelta(days=7),
+                health_professional=professional
+            )
+
+        ids = f'{self.health_professional.id},{psychiatrist.id}'
+        response = self.client.get(self.list_url, {'health_professional__in': ids})
+        professionals = {item['health_professional'] for item in response.data['results']}
+        self.assertEqual(professionals, {self.health_professional.id, psychiatrist.id})
+
+        response = self.client.get(self.list_url, {'profession': 'nutricionista'})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['health_professional'], nutritionist.id)
+
+        response = self.client.get(self.list_url, {'profession_id': psychiatrist.profession_id})
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['health_professional'], psychiatrist.id)
 
     def test_get_nonexistent_appointment(self):
         self.client.force_authenticate(user=self.normal_user)
@@ -229,3 +418,406 @@ class AppointmentsTestCase(APITestCase):
         response = self.client.delete(self.url)
 
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # TEST EXPORT
+
+    def test_export_appointments_ndjson(self):
+        self.client.force_authenticate(user=self.normal_user)
+        Appointments.objects.create(
+            date=date.today() + timedelta(days=30),
+            health_professional=self.health_professional
+        )
+        url = reverse('appointments-export')
+        response = self.client.get(url, {'date__lte': str(self.future_date)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0]), {
+            'id': self.appointment.id,
+            'date': str(self.future_date),
+            'health_professional': self.health_professional.id,
+        })
+
+    def test_export_appointments_csv(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('appointments-export')
+        response = self.client.get(url, {'output': 'csv'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,date,health_professional')
+        self.assertEqual(lines[1], f'{self.appointment.id},{self.future_date},{self.health_professional.id}')
+
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    async def test_export_appointments_streams_under_asgi(self):
+        # Pelo handler ASGI o corpo sai em blocos, sem montar o arquivo inteiro
+        token = await sync_to_async(AccessToken.for_user)(self.normal_user)
+        for days in (31, 32):
+            await Appointments.objects.acreate(
+                date=date.today() + timedelta(days=days),
+                health_professional=self.health_professional
+            )
+        response = await self.async_client.get(
+            reverse('appointments-export'), headers={'Authorization': f'Bearer {token}'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual([json.loads(chunk)['date'] for chunk in chunks], [
+            str(self.future_date),
+            str(date.today() + timedelta(days=31)),
+            str(date.today() + timedelta(days=32)),
+        ])
+
+    def test_export_appointments_invalid_output(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(reverse('appointments-export'), {'output': 'xml'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unauthorized_export_appointments(self):
+        response = self.client.get(reverse('appointments-export'))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # TEST AVAILABILITY
+
+    def test_availability_skips_booked_dates(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('appointments-availability')
+        start = self.future_date - timedelta(days=1)
+
+        response = self.client.get(url, {
+            'start': str(start),
+            'end': str(start + timedelta(days=2)),
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['date'] for item in response.data],
+            [str(start), str(start + timedelta(days=2))]
+        )
+        self.assertEqual(response.data[0]['health_professional'], self.health_professional.id)
+
+    def test_availability_filters_by_profession_and_limit(self):
+        self.client.force_authenticate(user=self.normal_user)
+        psychiatrist = HealthProfessional.objects.create(
+            social_name='Dr. João Santos',
+            profession=get_profession('Psiquiatra'),
+            address='Av. Paulista, 1000',
+            contact='(11) 98888-8888'
+        )
+        url = reverse('appointments-availability')
+
+        response = self.client.get(url, {'profession': 'psiquiatra', 'limit': 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual({item['health_professional'] for item in response.data}, {psychiatrist.id})
+        self.assertEqual(response.data[0]['date'], str(date.today()))
+
+    def test_availability_with_past_start(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('appointments-availability')
+
+        response = self.client.get(url, {'start': str(date.today() - timedelta(days=1))})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('start', response.data)
+
+    # TEST BULK CREATE
+
+    def test_bulk_create_appointments_success(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('appointments-bulk-create')
+        data = [
+            {"date": str(date.today() + timedelta(days=days)), "health_professional": self.health_professional.id}
+            for days in range(10, 20)
+        ]
+
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 10)
+        self.assertEqual(response.data['failed'], 0)
+        self.assertEqual(Appointments.objects.count(), 11)
+        self.assertEqual(response.data['results'][0]['status'], 'created')
+
+    def test_bulk_create_appointments_partial_failure(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('appointments-bulk-create')
+        new_date = str(date.today() + timedelta(days=10))
+        data = [
+            {"date": new_date, "health_professional": self.health_professional.id},
+            {"date": str(self.future_date), "health_professional": self.health_professional.id},
+            {"date": new_date, "health_professional": self.health_professional.id},
+            {"date": str(date.today() - timedelta(days=1)), "health_professional": self.health_professional.id},
+            {"date": new_date, "health_professional": 9999},
+        ]
+
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['failed'], 4)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['created', 'error', 'error', 'error', 'error']
+        )
+        self.assertIn('date', response.data['results'][3]['errors'])
+        self.assertIn('health_professional', response.data['results'][4]['errors'])
+        self.assertEqual(Appointments.objects.count(), 2)
+
+    def test_bulk_create_appointments_all_invalid(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('appointments-bulk-create')
+        data = [{"date": str(self.future_date), "health_professional": self.health_professional.id}]
+
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Appointments.objects.count(), 1)
+
+    def test_bulk_create_appointments_requires_list(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('appointments-bulk-create')
+        data = {"date": str(self.future_date), "health_professional": self.health_professional.id}
+
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(SYNC_LAG_SECONDS=0)
+    def test_sync_appointments_changes_and_deletions(self):
+        self.client.force_authenticate(user=self.normal_user)
+        sync_url = reverse('appointments-sync')
+        other = Appointments.objects.create(
+            date=date.today() + timedelta(days=8),
+            health_professional=self.health_professional
+        )
+
+        response = self.client.get(sync_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['changed']], [self.appointment.id, other.id])
+        self.assertEqual(response.data['deleted'], [])
+        self.assertFalse(response.data['has_more'])
+
+        # Nada mudou: o próximo poll não devolve nada
+        since = response.data['since']
+        response = self.client.get(sync_url, {'since': since})
+        self.assertEqual(response.data['changed'], [])
+
+        self.client.patch(self.url, {'date': str(date.today() + timedelta(days=20))}, format='json')
+        other_id = other.id
+        other.delete()
+
+        response = self.client.get(sync_url, {'since': since})
+        self.assertEqual([item['id'] for item in response.data['changed']], [self.appointment.id])
+        self.assertEqual(response.data['deleted'], [other_id])
+
+    @override_settings(SYNC_LAG_SECONDS=0)
+    def test_sync_appointments_pagination(self):
+        self.client.force_authenticate(user=self.normal_user)
+        sync_url = reverse('appointments-sync')
+        Appointments.objects.create(
+            date=date.today() + timedelta(days=8),
+            health_professional=self.health_professional
+        )
+
+        first = self.client.get(sync_url, {'limit': 1})
+        self.assertTrue(first.data['has_more'])
+        second = self.client.get(sync_url, {'limit': 1, 'since': first.data['since']})
+        self.assertFalse(second.data['has_more'])
+        self.assertNotEqual(first.data['changed'][0]['id'], second.data['changed'][0]['id'])
+
+    def test_sync_appointments_invalid_since(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(reverse('appointments-sync'), {'since': 'invalido'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('since', response.data)
+
+    def occupancy(self):
+        daily = {
+            (row.date, row.profession.name): row.booked
+            for row in DailyOccupancy.objects.select_related('profession') if row.booked
+        }
+        monthly = {
+            (row.month, row.health_professional_id): row.booked
+            for row in MonthlyOccupancy.objects.all() if row.booked
+        }
+        return daily, monthly
+
+    def test_occupancy_maintained_on_writes(self):
+        self.client.force_authenticate(user=self.normal_user)
+        other = HealthProfessional.objects.create(
+            social_name='Dr. João Santos',
+            profession=get_profession('Psiquiatra'),
+            address='Av. Paulista, 1000',
+            contact='(11) 98888-8888'
+        )
+        day = date.today() + timedelta(days=40)
+
+        self.client.post(self.list_url, {'date': str(day), 'health_professional': other.id}, format='json')
+        self.client.post(reverse('appointments-bulk-create'), [
+            {'date': str(day), 'health_professional': self.health_professional.id},
+        ], format='json')
+        # Move o agendamento original para outro dia e outro profissional
+        self.client.patch(self.url, {'date': str(day + timedelta(days=1)), 'health_professional': other.id}, format='json')
+        deleted = Appointments.objects.get(date=day, health_professional=other)
+        self.client.delete(reverse('appointments-detail-view', kwargs={'pk': deleted.pk}))
+        # Troca de profissão move os dias do profissional de grupo
+        self.client.patch(
+            reverse('professionals-detail-view', kwargs={'pk': self.health_professional.pk}),
+            {'profession': 'Terapeuta'}, format='json'
+        )
+
+        daily, monthly = self.occupancy()
+        self.assertEqual(daily, {
+            (day, 'Terapeuta'): 1,
+            (day + timedelta(days=1), 'Psiquiatra'): 1,
+        })
+        self.assertEqual(sum(monthly.values()), 2)
+
+        call_command('rebuild_occupancy', stdout=StringIO())
+        self.assertEqual(self.occupancy(), (daily, monthly))
+
+    def test_occupancy_stale_instances_deleted_twice(self):
+        first = Appointments.objects.get(pk=self.appointment.pk)
+        second = Appointments.objects.get(pk=self.appointment.pk)
+        first.delete()
+        # O segundo DELETE não encontra a linha: nada a descontar
+        second.delete()
+
+        self.assertEqual(self.occupancy(), ({}, {}))
+        self.assertFalse(DailyOccupancy.objects.filter(booked__lt=0).exists())
+        self.assertFalse(MonthlyOccupancy.objects.filter(booked__lt=0).exists())
+        self.assertEqual(AppointmentTombstone.objects.count(), 1)
+
+    @skipUnless(connection.vendor == 'postgresql', 'SELECT ... FOR UPDATE só no PostgreSQL')
+    def test_write_locks_appointment_row(self):
+        self.client.force_authenticate(user=self.normal_user)
+        day = date.today() + timedelta(days=41)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(self.url, {'date': str(day)}, format='json')
+        self.assertTrue(any(
+            query['sql'].startswith('SELECT') and query['sql'].endswith('FOR UPDATE') for query in queries
+        ))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse(any(query['sql'].endswith('FOR UPDATE') for query in queries))
+
+    def test_occupancy_report(self):
+        self.client.force_authenticate(user=self.normal_user)
+        HealthProfessional.objects.create(
+            social_name='Dra. Maria Lima',
+            profession=get_profession('Psicóloga'),
+            address='Rua das Flores, 456',
+            contact='(11) 97777-7777'
+        )
+
+        response = self.client.get(reverse('appointments-occupancy-report'), {
+            'start': str(self.future_date), 'end': str(self.future_date), 'profession': 'psicóloga'
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{
+            'date': str(self.future_date),
+            'profession': 'Psicóloga',
+            'booked': 1,
+            'professionals': 2,
+            'utilization': 0.5,
+        }])
+
+    def test_monthly_occupancy_report(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(reverse('appointments-monthly-report'), {
+            'month': self.future_date.strftime('%Y-%m')
+        })
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['social_name'], 'Dra. Ana Silva')
+        self.assertEqual(response.data['results'][0]['booked'], 1)
+
+    def test_monthly_occupancy_report_pagination_many_professionals(self):
+        # Uma linha por profissional no mês: com mais de 1000 profissionais o
+        # cursor precisa levar (month, health_professional)
+        self.client.force_authenticate(user=self.normal_user)
+        month = self.future_date.replace(day=1)
+        profession = get_profession('Psicóloga')
+        professionals = HealthProfessional.objects.bulk_create([
+            HealthProfessional(
+                social_name=f'Profissional {index}', profession=profession,
+                address='Rua das Flores, 123', contact='(11) 99999-9999'
+            )
+            for index in range(1100)
+        ])
+        MonthlyOccupancy.objects.bulk_create([
+            MonthlyOccupancy(month=month, health_professional=professional, booked=1)
+            for professional in professionals
+        ])
+
+        ids = []
+        pages = 0
+        url, params = reverse('appointments-monthly-report'), {'month': month.strftime('%Y-%m'), 'page_size': 100}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item['health_professional'] for item in response.data['results']]
+            url, params = response.data['next'], None
+            pages += 1
+            self.assertLessEqual(pages, 12)
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 1101)
+
+    def test_monthly_occupancy_report_invalid_month(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(reverse('appointments-monthly-report'), {'month': '2026-13'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_include_archived(self):
+        self.client.force_authenticate(user=self.normal_user)
+        old = Appointments.objects.create(
+            date=date.today() - timedelta(days=400), health_professional=self.health_professional
+        )
+        call_command('archive_appointments', days=365, stdout=StringIO())
+
+        response = self.client.get(self.list_url)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.appointment.id])
+
+        response = self.client.get(self.list_url, {
+            'include_archived': 'true', 'health_professional': self.health_professional.id
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [old.id, self.appointment.id])
+
+    def test_retrieve_archived_appointment(self):
+        self.client.force_authenticate(user=self.normal_user)
+        old = Appointments.objects.create(
+            date=date.today() - timedelta(days=400), health_professional=self.health_professional
+        )
+        call_command('archive_appointments', days=365, stdout=StringIO())
+        url = reverse('appointments-detail-view', kwargs={'pk': old.pk})
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(url, {'include_archived': 'true', 'expand': 'health_professional'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['health_professional']['social_name'], 'Dra. Ana Silva')
+        # Arquivados são somente leitura
+        response = self.client.delete(f'{url}?include_archived=true')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_include_archived_invalid_value(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'include_archived': 'talvez'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -5,6 +5,13 @@ from . import views
 urlpatterns = [
 
     path('appointments/', views.AppointmentsCreateView.as_view(), name='appointments-create-list'),
+    path('appointments/bulk/', views.AppointmentsBulkCreateView.as_view(), name='appointments-bulk-create'),
+    path('appointments/availability/', views.AppointmentsAvailabilityView.as_view(), name='appointments-availability'),
+    path('appointments/events/', views.AppointmentsEventsView.as_view(), name='appointments-events'),
+    path('appointments/sync/', views.AppointmentsSyncView.as_view(), name='appointments-sync'),
+    path('appointments/reports/occupancy/', views.OccupancyReportView.as_view(), name='appointments-occupancy-report'),
+    path('appointments/reports/monthly/', views.MonthlyOccupancyReportView.as_view(), name='appointments-monthly-report'),
+    path('appointments/export/', views.AppointmentsExportView.as_view(), name='appointments-export'),
     path('appointments/<int:pk>/', views.AppointmentsRetrieveUpdateDestroyAPIView.as_view(), name='appointments-detail-view'),
 
 ]
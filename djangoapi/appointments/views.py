@@ -1,58 +1,187 @@
-from rest_framework import generics
-from drf_spectacular.utils import extend_schema
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from appointments.serializers import AppointmentsModelSerializers
-from appointments.models import Appointments
+from core.mixins import IntegrityConflictMixin, SparseFieldsetMixin, SPARSE_FIELDS_PARAMETER
+from core.sync import SyncFeedView, SYNC_PARAMETERS
+from core.events import event_stream
+from appointments.serializers import AppointmentsModelSerializers, AppointmentsExpandedSerializer
+from appointments.serializers import AvailabilityQuerySerializer, AvailabilitySlotSerializer
+from appointments.serializers import AppointmentsBulkItemSerializer
+from appointments.serializers import OccupancyQuerySerializer, DailyOccupancySerializer, MonthlyOccupancySerializer
+from appointments.models import Appointments, AppointmentHistory, AppointmentTombstone, DailyOccupancy, MonthlyOccupancy
+from appointments.models import APPOINTMENT_UNIQUE_CONSTRAINT
+from appointments.pagination import AppointmentsCursorPagination, MonthlyOccupancyCursorPagination
+from appointments.filters import AppointmentsFilter, AppointmentHistoryFilter, MonthlyOccupancyFilter
+from health_professionals.models import HealthProfessional, Profession
+from appointments.exports import EXPORT_FORMATS, stream_async
+from appointments.availability import find_free_slots
+from appointments.events import APPOINTMENTS_CHANNEL, professional_filter, publish_appointment_events
 
 
 logger = logging.getLogger(__name__)
 
+EXPAND_PARAMETER = OpenApiParameter(
+    'expand', str, enum=['health_professional'],
+    description="Use 'health_professional' para embutir os dados do profissional em cada agendamento."
+)
+
+INCLUDE_ARCHIVED_PARAMETER = OpenApiParameter(
+    'include_archived', bool, default=False,
+    description="Inclui os agendamentos antigos já movidos para o arquivo (somente leitura)."
+)
+
+
+class AppointmentsArchiveMixin:
+    # Por padrão só a tabela ativa é lida. ?include_archived=true (apenas
+    # GET) lê a view que junta ativos e arquivados
+    def include_archived(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method != 'GET':
+            return False
+        value = request.query_params.get('include_archived', 'false').lower()
+        if value not in ('true', 'false', '1', '0'):
+            raise ValidationError({'include_archived': "Use 'true' ou 'false'."})
+        return value in ('true', '1')
+
+    def get_queryset(self):
+        if self.include_archived():
+            return AppointmentHistory.objects.all()
+        return super().get_queryset()
+
+
+class AppointmentsExpandMixin:
+    # ?expand=health_professional troca o id pelo profissional completo, com
+    # JOIN na mesma query em vez de uma requisição extra por agendamento
+    expandable_fields = ('health_professional',)
+
+    def get_expand(self):
+        if self.request.method != 'GET':
+            return set()
+        expand = {
+            field.strip()
+            for field in self.request.query_params.get('expand', '').split(',')
+            if field.strip()
+        }
+        invalid = expand - set(self.expandable_fields)
+        if invalid:
+            raise ValidationError({
+                'expand': f"Campo inválido. Use um de: {', '.join(self.expandable_fields)}."
+            })
+        return expand
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if 'health_professional' in self.get_expand():
+            queryset = queryset.select_related('health_professional__profession')
+        return queryset
+
+    def get_serializer_class(self):
+        if 'health_professional' in self.get_expand():
+            return AppointmentsExpandedSerializer
+        return super().get_serializer_class()
+
 
 @extend_schema(tags=['Appointments'])
-class AppointmentsCreateView(generics.ListCreateAPIView):
+class AppointmentsCreateView(SparseFieldsetMixin, AppointmentsExpandMixin, AppointmentsArchiveMixin,
+                             IntegrityConflictMixin, generics.ListCreateAPIView):
     queryset = Appointments.objects.all()
     serializer_class = AppointmentsModelSerializers
+    pagination_class = AppointmentsCursorPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['health_professional']
+    conflict_message = 'Este profissional já possui agendamento nesta data.'
+    conflict_constraints = (APPOINTMENT_UNIQUE_CONSTRAINT,)
+
+    @property
+    def filterset_class(self):
+        # O FilterSet é ligado ao model do queryset filtrado
+        return AppointmentHistoryFilter if self.include_archived() else AppointmentsFilter
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        publish_appointment_events('created', [serializer.data])
 
     @extend_schema(
         summary="Lista ou cria Agendamentos",
         description="Este endpoint permite listar todos os agendametnos ou cadastrar um novo.",
-        responses={201: AppointmentsModelSerializers}
+        responses={201: AppointmentsModelSerializers, 409: dict}
     )
     def post(self, request, *args, **kwargs):
         logger.info('Criando novo agendamento')
         try:
             response = super().post(request, *args, **kwargs)
-            logger.info(f"Agendamento criado - ID: {response.data.get('id')}")
+            logger.info("Agendamento criado - ID: %s", response.data.get('id'))
             return response
         except Exception as e:
-            logger.error(f"Erro ao criar agendamento: {str(e)}")
+            logger.error("Erro ao criar agendamento: %s", e)
             raise
 
     @extend_schema(
         summary="Lista agendamentos com filtros opcionais",
-        description="Filtre usando os parâmetros 'health_professional' (ID) ou 'data' (YYYY-MM-DD)."
+        description="Filtre usando 'health_professional' (ID), 'health_professional__in' (IDs separados por vírgula), "
+                    "'profession' (nome), 'profession_id' (ID do catálogo de profissões), 'date', 'date__gte' "
+                    "e 'date__lte' (YYYY-MM-DD).",
+        parameters=[EXPAND_PARAMETER, SPARSE_FIELDS_PARAMETER, INCLUDE_ARCHIVED_PARAMETER],
     )
     def get(self, request, *args, **kwargs):
-        logger.info(f"Usuário {request.user} listando agendamentos")
+        logger.info("Usuário %s listando agendamentos", request.user)
         return super().get(request, *args, **kwargs)
 
 
 @extend_schema(tags=['Appointments'])
-class AppointmentsRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class AppointmentsRetrieveUpdateDestroyAPIView(SparseFieldsetMixin, AppointmentsExpandMixin, AppointmentsArchiveMixin,
+                                               IntegrityConflictMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Appointments.objects.all()
     serializer_class = AppointmentsModelSerializers
+    conflict_message = 'Este profissional já possui agendamento nesta data.'
+    conflict_constraints = (APPOINTMENT_UNIQUE_CONSTRAINT,)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in ('PUT', 'PATCH', 'DELETE'):
+            # Trava a linha até o fim da requisição: escritas concorrentes no
+            # mesmo agendamento esperam e leem o dia/profissional já gravados,
+            # em vez de descontar a ocupação do slot antigo duas vezes
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        previous_professional = serializer.instance.health_professional_id
+        super().perform_update(serializer)
+        publish_appointment_events('updated', [serializer.data], previous_professional)
+
+    def perform_destroy(self, instance):
+        data = AppointmentsModelSerializers(instance).data
+        super().perform_destroy(instance)
+        publish_appointment_events('deleted', [data])
 
-    @extend_schema(summary="Busca um Agendamento específico pelo ID")
+    @extend_schema(
+        summary="Busca um Agendamento específico pelo ID",
+        parameters=[EXPAND_PARAMETER, SPARSE_FIELDS_PARAMETER, INCLUDE_ARCHIVED_PARAMETER],
+    )
     def get(self, request, *args, **kwargs):
         return super().get(request, *args, **kwargs)
 
     @extend_schema(summary="Atualiza os dados de um agendamento (PUT)")
     def put(self, request, *args, **kwargs):
         appointment_id = kwargs.get('pk')
-        logger.info(f"Usuário {request.user} atualizando agendamento ID: {appointment_id}")
+        logger.info("Usuário %s atualizando agendamento ID: %s", request.user, appointment_id)
         return super().put(request, *args, **kwargs)
 
     @extend_schema(summary="Atualiza parcialmente um agendamento (PATCH)")
@@ -62,5 +191,227 @@ class AppointmentsRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPI
     @extend_schema(summary="Remove um agendamento do sistema")
     def delete(self, request, *args, **kwargs):
         appointment_id = kwargs.get('pk')
-        logger.warning(f"Usuário {request.user} deletando agendamento ID: {appointment_id}")
+        logger.warning("Usuário %s deletando agendamento ID: %s", request.user, appointment_id)
         return super().delete(request, *args, **kwargs)
+
+
+@extend_schema(tags=['Appointments'])
+class AppointmentsExportView(generics.GenericAPIView):
+    queryset = Appointments.objects.order_by('date', 'id')
+    serializer_class = AppointmentsModelSerializers
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = AppointmentsFilter
+    pagination_class = None
+
+    @extend_schema(
+        summary="Exporta agendamentos em streaming (NDJSON ou CSV)",
+        description="Gera o arquivo linha a linha, sem carregar a tabela em memória. "
+                    "Aceita os filtros 'health_professional', 'date__gte' e 'date__lte'.",
+        parameters=[
+            OpenApiParameter('output', str, enum=list(EXPORT_FORMATS), default='ndjson'),
+        ],
+        responses={(200, 'application/x-ndjson'): str, (200, 'text/csv'): str},
+    )
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({
+                'output': f"Formato inválido. Use um de: {', '.join(EXPORT_FORMATS)}."
+            })
+        stream, content_type = EXPORT_FORMATS[output]
+
+        queryset = self.filter_queryset(self.get_queryset())
+        logger.info("Usuário %s exportando agendamentos (%s)", request.user, output)
+
+        content = stream(queryset, settings.EXPORT_CHUNK_SIZE)
+        if isinstance(request._request, ASGIRequest):
+            content = stream_async(content, settings.EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="appointments.{output}"'
+        return response
+
+
+@extend_schema(tags=['Appointments'])
+class AppointmentsAvailabilityView(APIView):
+
+    @extend_schema(
+        summary="Busca os próximos dias livres dos profissionais",
+        description="Retorna pares (profissional, data) sem agendamento dentro da janela "
+                    "'start'..'end', opcionalmente filtrados por 'profession', até 'limit' resultados.",
+        parameters=[AvailabilityQuerySerializer],
+        responses={200: AvailabilitySlotSerializer(many=True)},
+    )
+    def get(self, request, *args, **kwargs):
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        logger.info("Usuário %s buscando horários livres", request.user)
+        slots = find_free_slots(
+            start=params['start'],
+            end=params['end'],
+            limit=params['limit'],
+            profession=params.get('profession'),
+        )
+        return Response(AvailabilitySlotSerializer(slots, many=True).data)
+
+
+@extend_schema(tags=['Appointments'])
+class AppointmentsBulkCreateView(APIView):
+
+    @extend_schema(
+        summary="Cria vários agendamentos em um único lote",
+        description="Recebe uma lista de agendamentos, valida o lote com consultas fixas e "
+                    "grava os itens válidos com um único INSERT em transação. Retorna o "
+                    "resultado de cada item pela posição ('index') na lista enviada.",
+        request=AppointmentsBulkItemSerializer(many=True),
+        responses={201: dict, 207: dict, 400: dict},
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = AppointmentsBulkItemSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        created = serializer.save()
+        publish_appointment_events('created', AppointmentsModelSerializers(created, many=True).data)
+
+        results = [
+            {
+                'index': index,
+                'status': 'created',
+                'id': appointment.pk,
+                'date': appointment.date,
+                'health_professional': appointment.health_professional_id,
+            }
+            for index, appointment in zip(serializer.valid_indexes, created)
+        ]
+        results += [
+            {'index': index, 'status': 'error', 'errors': errors}
+            for index, errors in serializer.item_errors.items()
+        ]
+        results.sort(key=lambda result: result['index'])
+
+        failed = len(serializer.item_errors)
+        logger.info("Usuário %s criou %s agendamentos em lote (%s com erro)", request.user, len(created), failed)
+
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {'created': len(created), 'failed': failed, 'results': results},
+            status=response_status
+        )
+
+
+@extend_schema(tags=['Appointments'])
+class AppointmentsSyncView(SyncFeedView):
+    queryset = Appointments.objects.all()
+    serializer_class = AppointmentsModelSerializers
+    tombstone_model = AppointmentTombstone
+
+    @extend_schema(
+        summary="Feed incremental de agendamentos alterados e removidos",
+        description="Retorna os agendamentos criados ou alterados ('changed') e os ids removidos ('deleted') "
+                    "desde o watermark 'since'. Guarde o 'since' da resposta para a próxima chamada e repita "
+                    "enquanto 'has_more' for verdadeiro.",
+        parameters=SYNC_PARAMETERS,
+        responses={200: dict},
+    )
+    def get(self, request, *args, **kwargs):
+        logger.info("Usuário %s sincronizando agendamentos", request.user)
+        return super().get(request, *args, **kwargs)
+
+
+@extend_schema(tags=['Appointments'])
+class AppointmentsEventsView(APIView):
+
+    @extend_schema(
+        summary="Recebe em tempo real as alterações de agendamentos (SSE)",
+        description="Mantém a conexão aberta e envia um evento Server-Sent Events a cada agendamento "
+                    "criado ('appointment.created'), alterado ('appointment.updated') ou removido "
+                    "('appointment.deleted'). Filtre com 'health_professional' (IDs separados por vírgula). "
+                    "Requer o servidor ASGI (SERVER_MODE=asgi).",
+        parameters=[OpenApiParameter('health_professional', str)],
+        responses={(200, 'text/event-stream'): str, 503: dict},
+    )
+    def get(self, request, *args, **kwargs):
+        if not isinstance(request._request, ASGIRequest):
+            # No WSGI o worker ficaria preso a uma única conexão
+            return Response(
+                {'detail': 'O streaming de eventos requer o servidor ASGI (SERVER_MODE=asgi).'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        raw = request.query_params.get('health_professional', '')
+        try:
+            professionals = {int(value) for value in raw.split(',') if value.strip()}
+        except ValueError:
+            raise ValidationError({'health_professional': 'Informe IDs numéricos separados por vírgula.'})
+
+        logger.info("Usuário %s conectado aos eventos de agendamentos", request.user)
+        response = StreamingHttpResponse(
+            event_stream(APPOINTMENTS_CHANNEL, professional_filter(professionals)),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Desliga o buffer de proxies (nginx) para os eventos saírem na hora
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+@extend_schema(tags=['Relatórios'])
+class OccupancyReportView(APIView):
+
+    @extend_schema(
+        summary="Ocupação diária por profissão",
+        description="Para cada dia entre 'start' e 'end' e cada profissão, quantos profissionais têm "
+                    "agendamento ('booked'), quantos profissionais a profissão tem hoje ('professionals') "
+                    "e a taxa de ocupação. Lido do agregado mantido a cada escrita.",
+        parameters=[OccupancyQuerySerializer],
+        responses={200: DailyOccupancySerializer(many=True)},
+    )
+    def get(self, request, *args, **kwargs):
+        query = OccupancyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        rows = DailyOccupancy.objects.select_related('profession').filter(
+            date__range=(params['start'], params['end']), booked__gt=0
+        )
+        professionals = HealthProfessional.objects.all()
+        if params.get('profession'):
+            name = Profession.normalize(params['profession'])
+            rows = rows.filter(profession__name=name)
+            professionals = professionals.filter(profession__name=name)
+
+        # Agrupa pela FK (inteiro), sem JOIN com o catálogo
+        totals = dict(
+            professionals.order_by().values('profession_id').annotate(total=Count('id'))
+            .values_list('profession_id', 'total')
+        )
+        rows = list(rows)
+        for row in rows:
+            row.professionals = totals.get(row.profession_id, 0)
+            row.utilization = round(row.booked / row.professionals, 4) if row.professionals else 0.0
+
+        logger.info("Usuário %s consultando ocupação diária", request.user)
+        return Response(DailyOccupancySerializer(rows, many=True).data)
+
+
+@extend_schema(tags=['Relatórios'])
+class MonthlyOccupancyReportView(generics.ListAPIView):
+    queryset = MonthlyOccupancy.objects.select_related('health_professional__profession').filter(booked__gt=0)
+    serializer_class = MonthlyOccupancySerializer
+    pagination_class = MonthlyOccupancyCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = MonthlyOccupancyFilter
+
+    @extend_schema(
+        summary="Agendamentos por profissional no mês",
+        description="Filtre por 'month' (AAAA-MM), 'health_professional' (ID), 'profession' (nome) "
+                    "e 'profession_id' (ID do catálogo de profissões)."
+    )
+    def get(self, request, *args, **kwargs):
+        logger.info("Usuário %s consultando ocupação mensal", request.user)
+        return super().get(request, *args, **kwargs)
@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class AuthenticationConfig(AppConfig):
     name = "authentication"
+
+    def ready(self):
+        from core.metrics import REGISTRY
+        from authentication.metrics import token_table_metrics
+
+        REGISTRY.register(token_table_metrics)
@@ -0,0 +1,29 @@
+import threading
+import time
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class CachedUserJWTAuthentication(JWTAuthentication):
+    # Igual ao JWTAuthentication, mas guarda o usuário carregado do banco em
+    # memória do processo por JWT_USER_CACHE_TTL segundos. Desativações e
+    # trocas de senha passam a valer depois desse prazo.
+    _cache = {}
+    _lock = threading.Lock()
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        now = time.monotonic()
+
+        cached = self._cache.get(user_id)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        user = super().get_user(validated_token)
+        with self._lock:
+            if len(self._cache) >= settings.JWT_USER_CACHE_SIZE:
+                # Descarta a entrada mais antiga (dict mantém a ordem de inserção)
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[user_id] = (user, now + settings.JWT_USER_CACHE_TTL)
+        return user
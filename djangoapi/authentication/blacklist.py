@@ -0,0 +1,110 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    # Conjunto compacto e probabilístico: "não contém" é sempre exato,
+    # "contém" erra em ~error_rate dos casos. Não permite remover itens
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        # Double hashing: k posições a partir de um único digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + index * step) % self.size for index in range(self.hashes)]
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+
+class BlacklistFilter:
+    # Bloom filter dos jti na blacklist, em memória do processo. Recarrega
+    # de forma incremental (id > último lido) no máximo a cada
+    # JWT_BLACKLIST_BLOOM_REFRESH segundos. Pode ficar atrasado em relação
+    # a outros workers: por isso só serve de pré-checagem no refresh, onde a
+    # própria gravação na blacklist confirma o token (authentication.tokens)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.bloom = None
+            self.last_id = 0
+            self.loaded_at = None
+
+    def might_contain(self, jti):
+        self.refresh()
+        bloom = self.bloom
+        # Primeira carga ainda em andamento em outro thread: consulta o banco
+        return bloom is None or jti in bloom
+
+    def add(self, jti):
+        if self.bloom is not None:
+            with self._lock:
+                self.bloom.add(jti)
+
+    def refresh(self):
+        now = time.monotonic()
+        with self._lock:
+            loaded_at = self.loaded_at
+            if loaded_at is not None and now - loaded_at < settings.JWT_BLACKLIST_BLOOM_REFRESH:
+                return
+            # Só um thread recarrega; os demais seguem com o filtro atual
+            self.loaded_at = now
+            bloom, last_id = self.bloom, self.last_id
+
+        # As consultas rodam fora da trava, sem segurar os outros threads
+        try:
+            rebuild = bloom is None or bloom.count > bloom.capacity
+            if rebuild:
+                # Itens removidos pela limpeza só saem reconstruindo o filtro.
+                # A capacidade acompanha a tabela, senão um filtro cheio seria
+                # reconstruído (com a tabela inteira) a cada recarga
+                capacity = max(settings.JWT_BLACKLIST_BLOOM_CAPACITY, 2 * BlacklistedToken.objects.count())
+                bloom, last_id = BloomFilter(capacity), 0
+            rows = (
+                BlacklistedToken.objects.filter(id__gt=last_id).order_by('id')
+                .values_list('id', 'token__jti')
+            )
+            if rebuild:
+                # Filtro novo, ainda invisível aos outros threads
+                for last_id, jti in rows.iterator(chunk_size=10000):
+                    bloom.add(jti)
+                new_rows = []
+            else:
+                new_rows = list(rows)
+        except Exception:
+            with self._lock:
+                self.loaded_at = loaded_at
+            raise
+
+        with self._lock:
+            for last_id, jti in new_rows:
+                bloom.add(jti)
+            self.bloom, self.last_id = bloom, last_id
+        logger.debug("Filtro da blacklist atualizado: %s tokens", bloom.count)
+
+
+BLACKLIST_FILTER = BlacklistFilter()
@@ -0,0 +1,66 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    help = ('Remove em lotes os tokens JWT expirados das tabelas de tokens emitidos e da blacklist. '
+            'Pode ser interrompido e executado de novo.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--grace-hours', type=int, default=0,
+                            help='Mantém os tokens expirados há menos de N horas.')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Para depois de N lotes (o restante fica para a próxima execução).')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Segundos de espera entre lotes, para aliviar o banco.')
+        parser.add_argument('--dry-run', action='store_true', help='Só conta quantos seriam removidos.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size deve ser maior que zero.')
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        if options['dry_run']:
+            expired = OutstandingToken.objects.filter(expires_at__lt=cutoff).count()
+            self.stdout.write(f'{expired} tokens expirados antes de {cutoff:%Y-%m-%d %H:%M} seriam removidos.')
+            return
+
+        total = batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            purged = self.purge_batch(cutoff, options['batch_size'])
+            if not purged:
+                break
+            total += purged
+            batches += 1
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.SUCCESS(f'{total} tokens expirados removidos em {batches} lotes.'))
+
+    def purge_batch(self, cutoff, batch_size):
+        # Token expirado já é recusado pela validação do 'exp': a linha na
+        # blacklist não protege mais nada. Em vez do flushexpiredtokens do
+        # simplejwt (um único DELETE pelo ORM, que carrega as linhas para o
+        # cascade), cada lote é uma transação curta com DELETE direto. A
+        # ordem por id segue a de emissão, então o lote sai do começo do
+        # índice da PK sem varrer a tabela
+        quote = connection.ops.quote_name
+        outstanding = quote(OutstandingToken._meta.db_table)
+        blacklisted = quote(BlacklistedToken._meta.db_table)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id FROM {outstanding} WHERE expires_at < %s ORDER BY id LIMIT %s',
+                [cutoff, batch_size]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return 0
+            placeholders = ', '.join(['%s'] * len(ids))
+            cursor.execute(f'DELETE FROM {blacklisted} WHERE token_id IN ({placeholders})', ids)
+            cursor.execute(f'DELETE FROM {outstanding} WHERE id IN ({placeholders})', ids)
+            return cursor.rowcount
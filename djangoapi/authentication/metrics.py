@@ -0,0 +1,51 @@
+import logging
+from django.db import DatabaseError, connection
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_TABLES = {
+    'outstanding': OutstandingToken._meta.db_table,
+    'blacklisted': BlacklistedToken._meta.db_table,
+}
+
+
+def token_table_metrics():
+    # Tamanho das tabelas de tokens, lido a cada scrape. No Postgres usa a
+    # estimativa do planner (reltuples) e o tamanho em disco, sem varrer as
+    # tabelas; nos demais bancos, count(*)
+    lines = [
+        '# HELP jwt_token_table_rows Linhas nas tabelas de tokens JWT (estimativa no Postgres).',
+        '# TYPE jwt_token_table_rows gauge',
+    ]
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    """
+                    SELECT relname, greatest(reltuples, 0)::bigint, pg_total_relation_size(oid)
+                    FROM pg_class WHERE relname = ANY(%s)
+                    """,
+                    [list(TOKEN_TABLES.values())]
+                )
+                sizes = {name: (rows, size) for name, rows, size in cursor.fetchall()}
+            else:
+                sizes = {}
+                for table in TOKEN_TABLES.values():
+                    cursor.execute(f'SELECT count(*) FROM {connection.ops.quote_name(table)}')
+                    sizes[table] = (cursor.fetchone()[0], None)
+    except DatabaseError:
+        logger.exception("Falha ao ler o tamanho das tabelas de tokens")
+        return []
+
+    for label, table in TOKEN_TABLES.items():
+        lines.append(f'jwt_token_table_rows{{table="{label}"}} {sizes.get(table, (0, None))[0]}')
+    if connection.vendor == 'postgresql':
+        lines += [
+            '# HELP jwt_token_table_bytes Tamanho em disco das tabelas de tokens JWT, com índices.',
+            '# TYPE jwt_token_table_bytes gauge',
+        ]
+        for label, table in TOKEN_TABLES.items():
+            lines.append(f'jwt_token_table_bytes{{table="{label}"}} {sizes.get(table, (0, 0))[1]}')
+    return lines
@@ -0,0 +1,20 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from authentication.tokens import PrecheckedRefreshToken
+
+
+class TokenClaimsObtainPairSerializer(TokenObtainPairSerializer):
+    # Inclui no token os dados que o modo "stateless" precisa para montar o
+    # request.user (TokenUser) sem consultar a tabela de usuários. O access
+    # token gerado no refresh herda essas claims do refresh token.
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['username'] = user.get_username()
+        token['is_staff'] = user.is_staff
+        return token
+
+
+class PrecheckedTokenRefreshSerializer(TokenRefreshSerializer):
+    # Rotação com blacklist atômica e pré-checagem opcional (Bloom filter)
+    token_class = PrecheckedRefreshToken
@@ -0,0 +1,41 @@
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class PurgeTokensCommandTestCase(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='userTest', password='userPass')
+        now = timezone.now()
+        tokens = OutstandingToken.objects.bulk_create([
+            OutstandingToken(
+                user=user, jti=f'jti-{index}', token='token', created_at=now,
+                expires_at=now + timedelta(hours=-1 if index < 7 else 1)
+            )
+            for index in range(10)
+        ])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=token) for token in tokens[::2]])
+
+    def test_purge_removes_only_expired_tokens(self):
+        call_command('purge_tokens', batch_size=2, max_batches=1, stdout=StringIO())
+        self.assertEqual(OutstandingToken.objects.count(), 8)
+
+        call_command('purge_tokens', batch_size=2, stdout=StringIO())
+
+        self.assertEqual(
+            sorted(OutstandingToken.objects.values_list('jti', flat=True)), ['jti-7', 'jti-8', 'jti-9']
+        )
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), ['jti-8'])
+
+    def test_purge_grace_and_dry_run(self):
+        out = StringIO()
+        call_command('purge_tokens', dry_run=True, stdout=out)
+        self.assertIn('7 tokens', out.getvalue())
+
+        call_command('purge_tokens', grace_hours=2, stdout=StringIO())
+        self.assertEqual(OutstandingToken.objects.count(), 10)
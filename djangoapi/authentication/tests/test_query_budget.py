@@ -0,0 +1,50 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from core.testing import QueryBudgetMixin
+from authentication.blacklist import BLACKLIST_FILTER
+
+
+class AuthenticationQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        User.objects.create_user(username='userTest', password='userPass')
+        self.credentials = {'username': 'userTest', 'password': 'userPass'}
+
+    def grow(self, total=1000):
+        User.objects.bulk_create([User(username=f'user{index}') for index in range(total)])
+
+    def obtain(self):
+        return self.client.post(reverse('token_obtain_pair'), self.credentials, format='json')
+
+    def test_token_obtain_budget(self):
+        self.assertQueryBudget(3, self.obtain, grow=self.grow)
+
+    def test_token_refresh_budget(self):
+        url = reverse('token_refresh')
+
+        def refresh():
+            return self.client.post(url, {'refresh': self.obtain().data['refresh']}, format='json')
+
+        # Inclui as 3 queries do obtain usado para gerar o refresh token;
+        # o restante é a rotação com blacklist do token antigo
+        self.assertQueryBudget(16, refresh, grow=self.grow)
+
+    def test_token_verify_budget(self):
+        url = reverse('token_verify')
+        access = self.obtain().data['access']
+
+        # Única query: consulta da blacklist
+        self.assertQueryBudget(1, lambda: self.client.post(url, {'token': access}, format='json'))
+
+    def test_token_refresh_bloom_budget(self):
+        url = reverse('token_refresh')
+
+        def refresh():
+            return self.client.post(url, {'refresh': self.obtain().data['refresh']}, format='json')
+
+        # O Bloom filter dispensa a consulta da blacklist para tokens válidos
+        with self.settings(JWT_BLACKLIST_BLOOM=True, JWT_BLACKLIST_BLOOM_REFRESH=3600):
+            BLACKLIST_FILTER.reset()
+            self.client.post(url, {'refresh': self.obtain().data['refresh']}, format='json')
+            self.assertQueryBudget(15, refresh, grow=self.grow)
@@ -0,0 +1,147 @@
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIRequestFactory
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.settings import api_settings
+from authentication.backends import CachedUserJWTAuthentication
+from authentication.blacklist import BLACKLIST_FILTER, BloomFilter
+
+
+class AuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        self.normal_user = User.objects.create_user(
+            username='userTest',
+            password='userPass',
+            is_staff=True
+        )
+        self.factory = APIRequestFactory()
+        CachedUserJWTAuthentication._cache.clear()
+        BLACKLIST_FILTER.reset()
+
+    def get_token(self):
+        response = self.client.post(
+            reverse('token_obtain_pair'),
+            {'username': 'userTest', 'password': 'userPass'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def authorized_request(self, access):
+        return self.factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_token_contains_user_claims(self):
+        tokens = self.get_token()
+        access = AccessToken(tokens['access'])
+
+        self.assertEqual(access['username'], 'userTest')
+        self.assertTrue(access['is_staff'])
+
+    def test_refreshed_token_keeps_user_claims(self):
+        tokens = self.get_token()
+        response = self.client.post(
+            reverse('token_refresh'),
+            {'refresh': tokens['refresh']},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(response.data['access'])['username'], 'userTest')
+
+    def test_stateless_authentication_without_queries(self):
+        access = self.get_token()['access']
+        request = self.authorized_request(access)
+
+        with self.assertNumQueries(0):
+            user, _ = JWTStatelessUserAuthentication().authenticate(request)
+
+        self.assertEqual(str(user.id), str(self.normal_user.id))
+        self.assertEqual(user.username, 'userTest')
+        self.assertTrue(user.is_staff)
+        self.assertTrue(user.is_authenticated)
+
+    def test_cached_authentication_queries_once(self):
+        access = self.get_token()['access']
+        backend = CachedUserJWTAuthentication()
+
+        with self.assertNumQueries(1):
+            user, _ = backend.authenticate(self.authorized_request(access))
+        with self.assertNumQueries(0):
+            cached_user, _ = backend.authenticate(self.authorized_request(access))
+
+        self.assertEqual(user.pk, self.normal_user.pk)
+        self.assertIs(cached_user, user)
+
+    def test_rotated_refresh_token_cannot_be_reused(self):
+        refresh = self.get_token()['refresh']
+        url = reverse('token_refresh')
+
+        self.assertEqual(self.client.post(url, {'refresh': refresh}, format='json').status_code, status.HTTP_200_OK)
+        response = self.client.post(url, {'refresh': refresh}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bloom_precheck_rejects_token_blacklisted_elsewhere(self):
+        refresh = self.get_token()['refresh']
+        url = reverse('token_refresh')
+        with self.settings(JWT_BLACKLIST_BLOOM=True, JWT_BLACKLIST_BLOOM_REFRESH=3600):
+            # Filtro carregado antes da revogação (ex.: feita em outro worker)
+            BLACKLIST_FILTER.refresh()
+            RefreshToken(refresh).blacklist()
+
+            response = self.client.post(url, {'refresh': refresh}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bloom_precheck_requires_rotation(self):
+        refresh = self.get_token()['refresh']
+        url = reverse('token_refresh')
+        # override_settings(SIMPLE_JWT=...) não alcança o api_settings já
+        # importado pelos módulos do simplejwt; troca o atributo direto
+        with self.settings(JWT_BLACKLIST_BLOOM=True, JWT_BLACKLIST_BLOOM_REFRESH=3600), \
+                patch.object(api_settings, 'ROTATE_REFRESH_TOKENS', False):
+            BLACKLIST_FILTER.refresh()
+            RefreshToken(refresh).blacklist()
+
+            # Sem rotação nada grava o token de novo: a blacklist é consultada
+            response = self.client.post(url, {'refresh': refresh}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bloom_filter_capacity_follows_blacklist(self):
+        for _ in range(5):
+            RefreshToken.for_user(self.normal_user).blacklist()
+        with self.settings(JWT_BLACKLIST_BLOOM_CAPACITY=2, JWT_BLACKLIST_BLOOM_REFRESH=0):
+            BLACKLIST_FILTER.refresh()
+            bloom = BLACKLIST_FILTER.bloom
+            self.assertEqual(bloom.capacity, 10)
+
+            token = RefreshToken.for_user(self.normal_user)
+            token.blacklist()
+            BLACKLIST_FILTER.refresh()
+
+        # Recarga incremental, sem reconstruir o filtro
+        self.assertIs(BLACKLIST_FILTER.bloom, bloom)
+        self.assertEqual(bloom.count, 6)
+        self.assertTrue(BLACKLIST_FILTER.might_contain(token['jti']))
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f'jti-{index}' for index in range(1000)]
+        for key in keys:
+            bloom.add(key)
+
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'outro-{index}' in bloom for index in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_token_table_metrics(self):
+        self.get_token()
+        response = self.client.get(reverse('metrics'))
+
+        self.assertIn('jwt_token_table_rows{table="outstanding"}', response.content.decode())
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from authentication.blacklist import BLACKLIST_FILTER
+
+
+class PrecheckedRefreshToken(RefreshToken):
+    # Refresh token do endpoint de refresh. Com JWT_BLACKLIST_BLOOM=1 a
+    # consulta à blacklist só acontece quando o Bloom filter indica que o
+    # jti pode estar lá; no caso comum (token válido) nenhuma query. Exige
+    # rotação com blacklist: sem ela nada confirmaria um token que o filtro
+    # ainda não conhece
+
+    def check_blacklist(self):
+        rotation = api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION
+        if settings.JWT_BLACKLIST_BLOOM and rotation:
+            if not BLACKLIST_FILTER.might_contain(self.payload[api_settings.JTI_CLAIM]):
+                # O filtro pode estar atrasado; quem garante é o blacklist()
+                # da rotação, logo em seguida
+                return
+        super().check_blacklist()
+
+    def blacklist(self):
+        blacklisted, created = super().blacklist()
+        if not created:
+            # Token já usado em outro refresh (ou em outro worker, antes do
+            # filtro saber). Também cobre dois refreshes simultâneos
+            raise TokenError(_("Token is blacklisted"))
+        BLACKLIST_FILTER.add(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted, created
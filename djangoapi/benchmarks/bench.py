@@ -0,0 +1,351 @@
+"""Benchmark HTTP da API: mede throughput e latência por endpoint.
+
+Uso:
+    python benchmarks/bench.py run --base-url http://localhost:8000 \\
+        --username admin --password admin --concurrency 16 --requests 500 \\
+        --output bench-$(git rev-parse --short HEAD).json
+
+    python benchmarks/bench.py compare antes.json depois.json
+
+Usa só a biblioteca padrão, para rodar de qualquer máquina contra
+qualquer ambiente. Popule o banco antes com `manage.py seed_data`.
+Com --writes entram também os cenários que gravam (login, refresh, criação
+unitária e em lote, PUT/PATCH/DELETE do detalhe); eles criam registros
+próprios com datas distantes e não alteram os dados do seed.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from datetime import date, datetime, timedelta, timezone
+
+
+# Itens por requisição no cenário de criação em lote
+BULK_SIZE = 50
+
+# path pode ter campos ({id}) preenchidos por path_params(ctx) a cada
+# requisição; after(ctx, status, payload) recebe cada resposta e
+# prepare(args, ctx) roda uma vez antes do aquecimento
+Scenario = namedtuple('Scenario', 'method path body path_params after prepare', defaults=(None, None, None, None))
+
+
+def far_date(ctx):
+    # Datas distantes e sempre novas para as escritas não colidirem (409)
+    return str(date.today() + timedelta(days=3650 + ctx['counter']()))
+
+
+def build_scenarios(ids, include_writes):
+    today = date.today()
+    week = f'date__gte={today}&date__lte={today + timedelta(days=7)}'
+    scenarios = {
+        'professionals-create-list': Scenario('GET', '/api/v1/professionals/'),
+        'professionals-search': Scenario('GET', f"/api/v1/professionals/?q={ids['search']}"),
+        'professionals-detail-view': Scenario('GET', f"/api/v1/professionals/{ids['professional']}/"),
+        'professionals-nearby': Scenario('GET', '/api/v1/professionals/nearby/?latitude=-23.55&longitude=-46.63'),
+        'professionals-sync': Scenario('GET', '/api/v1/professionals/sync/?limit=100'),
+        'professions-list': Scenario('GET', '/api/v1/professions/'),
+        'appointments-create-list': Scenario('GET', '/api/v1/appointments/'),
+        'appointments-create-list-week': Scenario('GET', f'/api/v1/appointments/?{week}'),
+        'appointments-create-list-expand': Scenario('GET', '/api/v1/appointments/?expand=health_professional'),
+        'appointments-create-list-fields': Scenario('GET', '/api/v1/appointments/?fields=id,date'),
+        'appointments-create-list-archived': Scenario(
+            'GET', f"/api/v1/appointments/?include_archived=true&health_professional={ids['professional']}"
+        ),
+        'appointments-detail-view': Scenario('GET', f"/api/v1/appointments/{ids['appointment']}/"),
+        'appointments-availability': Scenario('GET', '/api/v1/appointments/availability/?limit=20'),
+        'appointments-export': Scenario('GET', f'/api/v1/appointments/export/?{week}'),
+        'appointments-sync': Scenario('GET', '/api/v1/appointments/sync/?limit=100'),
+        'appointments-occupancy-report': Scenario(
+            'GET', f'/api/v1/appointments/reports/occupancy/?start={today}&end={today + timedelta(days=30)}'
+        ),
+        'appointments-monthly-report': Scenario('GET', f'/api/v1/appointments/reports/monthly/?month={today:%Y-%m}'),
+        'token_verify': Scenario('POST', '/api/v1/authentication/token/verify/', lambda ctx: {'token': ctx['access']}),
+        'schema': Scenario('GET', '/api/schema/'),
+        'metrics': Scenario('GET', '/metrics/'),
+    }
+    if include_writes:
+        professional = ids['professional']
+        scenarios.update({
+            'token_obtain_pair': Scenario('POST', '/api/v1/authentication/token/', lambda ctx: ctx['credentials']),
+            # Com rotação cada refresh vale uma vez: o token devolvido volta à fila
+            'token_refresh': Scenario(
+                'POST', '/api/v1/authentication/token/refresh/',
+                body=lambda ctx: {'refresh': ctx['refresh'].get()},
+                after=return_refresh_token,
+                prepare=prepare_refresh_tokens,
+            ),
+            'appointments-create': Scenario(
+                'POST', '/api/v1/appointments/',
+                lambda ctx: {'date': far_date(ctx), 'health_professional': professional}
+            ),
+            'appointments-bulk-create': Scenario(
+                'POST', '/api/v1/appointments/bulk/',
+                lambda ctx: [{'date': far_date(ctx), 'health_professional': professional} for _ in range(BULK_SIZE)]
+            ),
+            'professionals-create': Scenario(
+                'POST', '/api/v1/professionals/', lambda ctx: {
+                    'social_name': f"Benchmark {ctx['counter']()}",
+                    'profession': 'Benchmark',
+                    'address': 'Rua do Benchmark, 1',
+                    'contact': '(11) 90000-0000',
+                }
+            ),
+            # PUT/PATCH alternam entre 'concurrency' agendamentos próprios:
+            # mede a escrita (e a ocupação) sem todas as threads disputarem
+            # a mesma linha
+            'appointments-update': Scenario(
+                'PUT', '/api/v1/appointments/{id}/',
+                body=lambda ctx: {'date': far_date(ctx), 'health_professional': professional},
+                path_params=next_target,
+                prepare=prepare_targets,
+            ),
+            'appointments-partial-update': Scenario(
+                'PATCH', '/api/v1/appointments/{id}/',
+                body=lambda ctx: {'date': far_date(ctx)},
+                path_params=next_target,
+                prepare=prepare_targets,
+            ),
+            # Cada DELETE remove um agendamento criado só para isso
+            'appointments-delete': Scenario(
+                'DELETE', '/api/v1/appointments/{id}/',
+                path_params=lambda ctx: {'id': ctx['doomed'].get()},
+                prepare=prepare_doomed,
+            ),
+        })
+    return scenarios
+
+
+def login(args, credentials):
+    status, _, payload = request(args.base_url, 'POST', '/api/v1/authentication/token/', body=credentials)
+    if status != 200:
+        sys.exit(f'Falha na autenticação: HTTP {status}')
+    return json.loads(payload)
+
+
+def prepare_refresh_tokens(args, ctx):
+    ctx['refresh'] = Queue()
+    for _ in range(args.concurrency):
+        ctx['refresh'].put(login(args, ctx['credentials'])['refresh'])
+
+
+def return_refresh_token(ctx, status, payload):
+    if status == 200:
+        ctx['refresh'].put(json.loads(payload)['refresh'])
+    else:
+        # Mantém a fila cheia mesmo se um refresh falhar
+        ctx['refresh'].put(login(ctx['args'], ctx['credentials'])['refresh'])
+
+
+def create_appointments(args, ctx, total):
+    ids = []
+    while len(ids) < total:
+        size = min(500, total - len(ids))
+        body = [{'date': far_date(ctx), 'health_professional': ctx['ids']['professional']} for _ in range(size)]
+        status, _, payload = request(args.base_url, 'POST', '/api/v1/appointments/bulk/', ctx['access'], body)
+        if status != 201:
+            sys.exit(f'Falha ao criar agendamentos para o benchmark: HTTP {status}')
+        ids += [result['id'] for result in json.loads(payload)['results']]
+    return ids
+
+
+def prepare_targets(args, ctx):
+    if 'targets' not in ctx:
+        ctx['targets'] = create_appointments(args, ctx, args.concurrency)
+
+
+def next_target(ctx):
+    return {'id': ctx['targets'][ctx['counter']() % len(ctx['targets'])]}
+
+
+def prepare_doomed(args, ctx):
+    ctx['doomed'] = Queue()
+    for appointment in create_appointments(args, ctx, args.requests + min(args.warmup, args.requests)):
+        ctx['doomed'].put(appointment)
+
+
+def request(base_url, method, path, token=None, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method)
+    req.add_header('Content-Type', 'application/json')
+    if token:
+        req.add_header('Authorization', f'Bearer {token}')
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            payload = response.read()
+            status = response.status
+    except urllib.error.HTTPError as exc:
+        payload = exc.read()
+        status = exc.code
+    except (urllib.error.URLError, TimeoutError):
+        payload, status = b'', 0
+    return status, time.perf_counter() - start, payload
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_scenario(args, ctx, scenario):
+    def one(_):
+        body = scenario.body(ctx) if scenario.body else None
+        path = scenario.path.format(**scenario.path_params(ctx)) if scenario.path_params else scenario.path
+        result = request(args.base_url, scenario.method, path, ctx['access'], body)
+        if scenario.after:
+            scenario.after(ctx, result[0], result[2])
+        return result
+
+    if scenario.prepare:
+        scenario.prepare(args, ctx)
+
+    # Aquecimento: conexões, caches e JIT do banco
+    for _ in range(min(args.warmup, args.requests)):
+        one(None)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency * 1000 for _, latency, _ in results)
+    errors = sum(1 for status, _, _ in results if not 200 <= status < 400)
+    return {
+        'method': scenario.method,
+        'path': scenario.path,
+        'requests': len(results),
+        'errors': errors,
+        'duration_s': round(elapsed, 3),
+        'throughput_rps': round(len(results) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies), 2),
+            'p50': round(percentile(latencies, 0.50), 2),
+            'p90': round(percentile(latencies, 0.90), 2),
+            'p99': round(percentile(latencies, 0.99), 2),
+            'max': round(latencies[-1], 2),
+        },
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def first_item(base_url, token, path):
+    status, _, payload = request(base_url, 'GET', path + '?page_size=1', token)
+    if status != 200:
+        sys.exit(f'Falha ao consultar {path}: HTTP {status}')
+    results = json.loads(payload)['results']
+    if not results:
+        sys.exit(f'Nenhum registro em {path}. Rode "manage.py seed_data" antes.')
+    return results[0]
+
+
+def command_run(args):
+    credentials = {'username': args.username, 'password': args.password}
+    access = login(args, credentials)['access']
+
+    counter = iter(range(1, 10 ** 9))
+    professional = first_item(args.base_url, access, '/api/v1/professionals/')
+    ids = {
+        'professional': professional['id'],
+        # Busca pela última palavra do nome de um profissional existente
+        'search': urllib.parse.quote(professional['social_name'].split()[-1]),
+        'appointment': first_item(args.base_url, access, '/api/v1/appointments/')['id'],
+    }
+    ctx = {'args': args, 'access': access, 'credentials': credentials, 'ids': ids, 'counter': lambda: next(counter)}
+
+    scenarios = build_scenarios(ids, args.writes)
+    selected = args.scenarios or list(scenarios)
+    unknown = set(selected) - set(scenarios)
+    if unknown:
+        sys.exit(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'base_url': args.base_url,
+        'concurrency': args.concurrency,
+        'requests_per_scenario': args.requests,
+        'results': {},
+    }
+    for name in selected:
+        result = run_scenario(args, ctx, scenarios[name])
+        report['results'][name] = result
+        print(
+            f"{name:32} {result['throughput_rps']:>9.1f} req/s  "
+            f"p50 {result['latency_ms']['p50']:>8.1f} ms  p99 {result['latency_ms']['p99']:>8.1f} ms  "
+            f"erros {result['errors']}"
+        )
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f'Resultado salvo em {args.output}')
+
+
+def command_compare(args):
+    with open(args.baseline) as baseline_file, open(args.candidate) as candidate_file:
+        baseline = json.load(baseline_file)
+        candidate = json.load(candidate_file)
+
+    print(f"{'cenário':32} {'req/s':>18} {'p50 ms':>20} {'p99 ms':>20}")
+    print(f"{'':32} {baseline.get('commit')} -> {candidate.get('commit')}")
+    for name, new in candidate['results'].items():
+        old = baseline['results'].get(name)
+        if not old:
+            continue
+
+        def delta(before, after):
+            change = (after - before) / before * 100 if before else 0.0
+            return f'{before:.1f}->{after:.1f} ({change:+.0f}%)'
+
+        print(
+            f"{name:32} {delta(old['throughput_rps'], new['throughput_rps']):>18} "
+            f"{delta(old['latency_ms']['p50'], new['latency_ms']['p50']):>20} "
+            f"{delta(old['latency_ms']['p99'], new['latency_ms']['p99']):>20}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='Executa os cenários e gera o relatório JSON.')
+    run.add_argument('--base-url', default='http://localhost:8000')
+    run.add_argument('--username', required=True)
+    run.add_argument('--password', required=True)
+    run.add_argument('--concurrency', type=int, default=8)
+    run.add_argument('--requests', type=int, default=200, help='Requisições por cenário.')
+    run.add_argument('--warmup', type=int, default=10)
+    run.add_argument('--scenarios', nargs='*', help='Cenários a executar (padrão: todos).')
+    run.add_argument('--writes', action='store_true', help='Inclui cenários que gravam no banco.')
+    run.add_argument('--output', help='Arquivo JSON de saída.')
+    run.set_defaults(func=command_run)
+
+    compare = subparsers.add_parser('compare', help='Compara dois relatórios JSON.')
+    compare.add_argument('baseline')
+    compare.add_argument('candidate')
+    compare.set_defaults(func=command_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
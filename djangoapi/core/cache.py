@@ -0,0 +1,78 @@
+import hashlib
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_cache_version(namespace):
+    # Token que identifica a "geração" atual dos dados de um namespace.
+    # Invalidar é só trocar o token: as chaves antigas deixam de ser lidas
+    # e expiram sozinhas, sem precisar apagar uma a uma.
+    # O token expira junto com as respostas: uma divergência entre
+    # processos nunca dura mais que API_CACHE_TIMEOUT
+    key = f'cache-version:{namespace}'
+    version = cache.get(key)
+    if version is None:
+        # add() não sobrescreve um token criado por outro processo
+        cache.add(key, uuid.uuid4().hex, settings.API_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_cache(namespace):
+    # Só depois do commit: trocado antes, uma leitura entre a troca e o
+    # commit gravaria os dados antigos sob a versão nova. Fora de uma
+    # transação o on_commit roda na hora
+    transaction.on_commit(
+        lambda: cache.set(f'cache-version:{namespace}', uuid.uuid4().hex, settings.API_CACHE_TIMEOUT)
+    )
+
+
+class CachedResponseMixin:
+    # Cacheia as respostas de listagem e detalhe por URL absoluta (inclui
+    # host, filtros e cursor) e responde 304 quando o ETag enviado pelo cliente
+    # ainda é o atual, sem consultar o banco nem serializar nada.
+    # A autenticação e as permissões continuam rodando antes (initial()).
+    # Desligado (API_CACHE_ENABLED) quando há vários processos sem cache
+    # compartilhado: cada um teria a sua versão e responderia 304 a ETags
+    # que outro processo já invalidou.
+    cache_namespace = None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.API_CACHE_ENABLED:
+            return handler(request, *args, **kwargs)
+
+        version = get_cache_version(self.cache_namespace)
+        digest = hashlib.md5(
+            f'{version}:{request.build_absolute_uri()}'.encode(),
+            usedforsecurity=False
+        ).hexdigest()
+        etag = quote_etag(digest)
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            key = f'response:{self.cache_namespace}:{digest}'
+            data = cache.get(key)
+            if data is None:
+                response = handler(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                cache.set(key, response.data, settings.API_CACHE_TIMEOUT)
+            else:
+                response = Response(data)
+
+        response['ETag'] = etag
+        # Dados exigem autenticação: só o cliente guarda, sempre revalidando
+        response['Cache-Control'] = 'private, no-cache'
+        return response
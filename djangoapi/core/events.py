@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+
+logger = logging.getLogger(__name__)
+
+# Canal do Postgres usado pela ponte LISTEN/NOTIFY entre processos
+NOTIFY_CHANNEL = 'api_events'
+# O payload do NOTIFY é limitado a 8000 bytes
+NOTIFY_MAX_PAYLOAD = 7500
+
+
+class Subscription:
+    # Fila de um cliente conectado, sempre manipulada no event loop dele.
+    # Se o cliente não acompanhar o ritmo, a fila enche e ele recebe um
+    # aviso para ressincronizar pelo feed, em vez de segurar memória
+
+    def __init__(self, loop, match=None):
+        self.loop = loop
+        self.match = match
+        self.queue = asyncio.Queue(settings.EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, events):
+        if self.overflowed:
+            return
+        for event in events:
+            if self.match is not None and not self.match(event):
+                continue
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.overflowed = True
+                return
+
+
+class EventBroker:
+    # Fan-out em memória: cada processo entrega os eventos aos clientes
+    # conectados nele. Com EVENTS_NOTIFY=1 (Postgres) o evento passa pelo
+    # NOTIFY, entregue pelo banco a todos os processos só após o commit
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+        self._listener = None
+
+    def subscribe(self, channel, match=None):
+        subscription = Subscription(asyncio.get_running_loop(), match)
+        with self._lock:
+            self._subscribers[channel].add(subscription)
+        if self.use_notify():
+            self.start_listener()
+        return subscription
+
+    def unsubscribe(self, channel, subscription):
+        with self._lock:
+            self._subscribers[channel].discard(subscription)
+
+    def dispatch(self, channel, events):
+        # Pode ser chamado de qualquer thread (views síncronas, listener)
+        with self._lock:
+            subscriptions = list(self._subscribers[channel])
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, events)
+            except RuntimeError:
+                # Event loop já encerrado: cliente que não foi removido
+                self.unsubscribe(channel, subscription)
+
+    def publish(self, channel, events):
+        # Chamado dentro da transação da escrita: nada é entregue se ela
+        # for desfeita
+        if not events:
+            return
+        if self.use_notify():
+            self.notify(channel, events)
+        else:
+            transaction.on_commit(lambda: self.dispatch(channel, events))
+
+    def use_notify(self):
+        return settings.EVENTS_NOTIFY and connection.vendor == 'postgresql'
+
+    def notify(self, channel, events):
+        with connection.cursor() as cursor:
+            for payload in self.notify_payloads(channel, events):
+                cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, payload])
+
+    def notify_payloads(self, channel, events):
+        # Agrupa vários eventos por NOTIFY (ex.: criação em lote) respeitando
+        # o limite de tamanho do payload
+        header = json.dumps(channel)
+        batch, size = [], 0
+        for event in events:
+            encoded = json.dumps(event, cls=DjangoJSONEncoder)
+            if batch and size + len(encoded.encode()) > NOTIFY_MAX_PAYLOAD:
+                yield f'{{"channel": {header}, "events": [{",".join(batch)}]}}'
+                batch, size = [], 0
+            batch.append(encoded)
+            size += len(encoded.encode()) + 1
+        if batch:
+            yield f'{{"channel": {header}, "events": [{",".join(batch)}]}}'
+
+    def start_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = PostgresListener(self, connection.get_connection_params())
+                self._listener.start()
+
+
+class PostgresListener(threading.Thread):
+    # Conexão dedicada (fora do pool do Django) em LISTEN; repassa cada
+    # NOTIFY para o broker local. Reconecta sozinha se a conexão cair
+
+    def __init__(self, broker, connection_params):
+        super().__init__(name='events-listener', daemon=True)
+        self.broker = broker
+        self.connection_params = connection_params
+
+    def run(self):
+        import psycopg
+
+        while True:
+            try:
+                with psycopg.connect(**self.connection_params, autocommit=True) as conn:
+                    conn.execute(f'LISTEN {NOTIFY_CHANNEL}')
+                    logger.info("Escutando eventos via LISTEN %s", NOTIFY_CHANNEL)
+                    for notify in conn.notifies():
+                        payload = json.loads(notify.payload)
+                        self.broker.dispatch(payload['channel'], payload['events'])
+            except Exception:
+                logger.exception("Listener de eventos desconectado; tentando novamente")
+                time.sleep(1)
+
+
+BROKER = EventBroker()
+
+
+def format_sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+async def event_stream(channel, match=None):
+    # Gerador de Server-Sent Events. A inscrição acontece na primeira
+    # iteração, já no event loop do servidor ASGI; ao desconectar o cliente
+    # o gerador é cancelado e a inscrição removida
+    subscription = BROKER.subscribe(channel, match)
+    try:
+        yield f'retry: {settings.EVENTS_RETRY_MS}\n: conectado\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Mantém proxies e balanceadores com a conexão aberta
+                yield ': ping\n\n'
+                continue
+            yield format_sse(event['type'], event['data'])
+            if subscription.overflowed and subscription.queue.empty():
+                yield format_sse('resync', {'detail': 'Eventos perdidos; sincronize pelo feed.'})
+                return
+    finally:
+        BROKER.unsubscribe(channel, subscription)
@@ -0,0 +1,45 @@
+from django.db import connection
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# SQLSTATE unique_violation do Postgres
+UNIQUE_VIOLATION = '23505'
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'O registro conflita com um registro já existente.'
+    default_code = 'conflict'
+
+
+def violated_unique_constraints(exc):
+    # Nome da constraint única violada por um IntegrityError do Postgres e,
+    # numa tabela particionada, dos índices pais: o erro traz o nome gerado
+    # para o índice da partição (ex.: appointments_appointments_p202_..._key1)
+    cause = exc.__cause__
+    diag = getattr(cause, 'diag', None)
+    if getattr(cause, 'sqlstate', None) != UNIQUE_VIOLATION or not getattr(diag, 'constraint_name', None):
+        return set()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH RECURSIVE chain(oid) AS (
+                SELECT c.oid FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = %s AND c.relname = %s
+                UNION
+                SELECT pg_inherits.inhparent FROM pg_inherits JOIN chain ON pg_inherits.inhrelid = chain.oid
+            )
+            SELECT relname FROM pg_class WHERE oid IN (SELECT oid FROM chain)
+            """,
+            [diag.schema_name, diag.constraint_name]
+        )
+        return {name for (name,) in cursor.fetchall()}
+
+
+def is_unique_conflict(exc, constraints):
+    # Só as constraints únicas conhecidas viram 409. FK (profissional removido
+    # no meio da escrita), CHECK e NOT NULL continuam sendo erros
+    if connection.vendor == 'postgresql':
+        return bool(violated_unique_constraints(exc) & set(constraints))
+    # O SQLite não informa o nome da constraint em todos os casos, só o tipo
+    return str(exc).startswith('UNIQUE constraint failed')
@@ -0,0 +1,91 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    # Entrega o registro a uma fila limitada e volta imediatamente: a
+    # formatação e a escrita em console/arquivo acontecem na thread do
+    # QueueListener. Com a fila cheia o registro é descartado e contado,
+    # para que um disco lento nunca trave a requisição.
+    # O listener é criado pelo dictConfig (chave "handlers") e iniciado no
+    # primeiro log de cada processo, inclusive após o fork dos workers.
+    instances = []
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._listener_pid = None
+        BoundedQueueHandler.instances.append(self)
+
+    def prepare(self, record):
+        # Sem formatar aqui (o QueueHandler padrão formata na thread atual);
+        # os handlers de destino formatam o registro original no listener
+        return record
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self._start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _start_listener(self):
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            listener = getattr(self, 'listener', None)
+            if listener is not None:
+                # Threads não sobrevivem ao fork: descarta a referência herdada
+                listener._thread = None
+                listener.start()
+                atexit.register(listener.stop)
+            self._listener_pid = os.getpid()
+
+
+def dropped_log_records():
+    return sum(handler.dropped for handler in BoundedQueueHandler.instances)
+
+
+class SamplingFilter(logging.Filter):
+    # Mantém só uma fração dos registros INFO/DEBUG de cada logger listado
+    # em "rates" (o nome vale para os filhos: "appointments" cobre
+    # "appointments.views"). WARNING e acima passam sempre.
+    def __init__(self, rates=None):
+        super().__init__()
+        self.rates = rates or {}
+
+    def filter(self, record):
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        name = record.name
+        while name:
+            if name in self.rates:
+                return random.random() < self.rates[name]
+            name = name.rpartition('.')[0]
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    # Uma linha JSON por registro, para ingestão em ferramentas de log
+    def format(self, record):
+        data = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'process': record.process,
+            'thread': record.thread,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
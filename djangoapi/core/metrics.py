@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from core.logging import dropped_log_records
+
+
+# Limites (le) dos buckets dos histogramas
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class QueryTimer:
+    # execute_wrapper do Django: conta e cronometra cada query da requisição
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {cumulative}')
+        return lines
+
+
+class MetricsRegistry:
+    # Agregados em memória do processo (worker do Gunicorn), não do pod:
+    # cada scrape cai num worker qualquer e só traz os números dele. O label
+    # 'worker' (pid) mantém as séries de cada worker separadas; some por rota
+    # com sum(rate(...)) sem esse label.
+    HISTOGRAMS = (
+        ('http_request_duration_seconds', 'Tempo total da requisição por rota.', LATENCY_BUCKETS),
+        ('http_request_db_queries', 'Quantidade de queries por requisição.', QUERY_BUCKETS),
+        ('http_request_db_duration_seconds', 'Tempo gasto no banco por requisição.', LATENCY_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Funções chamadas a cada scrape que devolvem linhas extras (gauges
+        # lidos na hora, ex.: tamanho de tabelas)
+        self.collectors = []
+        self.reset()
+
+    def register(self, collector):
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}
+            self.histograms = {name: {} for name, _, _ in self.HISTOGRAMS}
+
+    def observe(self, route, method, status, duration, queries, db_duration):
+        values = {
+            'http_request_duration_seconds': duration,
+            'http_request_db_queries': queries,
+            'http_request_db_duration_seconds': db_duration,
+        }
+        with self._lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            for name, _, buckets in self.HISTOGRAMS:
+                histogram = self.histograms[name].get((route, method))
+                if histogram is None:
+                    histogram = self.histograms[name][(route, method)] = Histogram(buckets)
+                histogram.observe(values[name])
+
+    def render(self):
+        lines = [
+            '# HELP http_requests_total Requisições atendidas por rota, método e status.',
+            '# TYPE http_requests_total counter',
+        ]
+        # Lido no scrape: com preload o registro é criado antes do fork
+        worker = os.getpid()
+        with self._lock:
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'http_requests_total{{route="{route}",method="{method}",status="{status}",'
+                    f'worker="{worker}"}} {count}'
+                )
+            for name, description, _ in self.HISTOGRAMS:
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} histogram')
+                for (route, method), histogram in sorted(self.histograms[name].items()):
+                    lines.extend(histogram.render(name, f'route="{route}",method="{method}",worker="{worker}"'))
+
+        lines += [
+            '# HELP logging_dropped_records_total Registros de log descartados com a fila cheia.',
+            '# TYPE logging_dropped_records_total counter',
+            f'logging_dropped_records_total{{worker="{worker}"}} {dropped_log_records()}',
+        ]
+        for collector in self.collectors:
+            lines += collector()
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,32 @@
+import time
+from django.db import connection
+from core.metrics import REGISTRY, QueryTimer
+
+
+class MetricsMiddleware:
+    # Mede tempo total, quantidade e tempo de queries de cada requisição,
+    # agrega por nome da rota (url_name) e devolve o header Server-Timing.
+    # Em respostas em streaming o tempo cobre só a montagem da resposta.
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.url_name if match and match.url_name else 'unmatched'
+        REGISTRY.observe(
+            route, request.method, response.status_code,
+            duration, timer.count, timer.duration
+        )
+
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={timer.duration * 1000:.1f};desc="{timer.count} queries"'
+        )
+        return response
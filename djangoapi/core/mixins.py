@@ -0,0 +1,116 @@
+import logging
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, transaction
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from core.exceptions import Conflict, is_unique_conflict
+
+
+logger = logging.getLogger(__name__)
+
+
+class IntegrityConflictMixin:
+    # A unicidade é garantida pelas constraints do banco: em vez de um
+    # SELECT ... exists() antes de cada escrita (que ainda deixa uma janela
+    # de corrida), grava direto e traduz a violação em 409 Conflict.
+    # O savepoint mantém a transação externa utilizável após o erro.
+    # Só as constraints de conflict_constraints viram 409; qualquer outra
+    # violação de integridade é repassada.
+    conflict_message = None
+    conflict_constraints = ()
+
+    def perform_create(self, serializer):
+        self.save_or_conflict(serializer)
+
+    def perform_update(self, serializer):
+        self.save_or_conflict(serializer)
+
+    def save_or_conflict(self, serializer):
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except IntegrityError as exc:
+            if not is_unique_conflict(exc, self.conflict_constraints):
+                raise
+            logger.warning("Conflito de integridade em %s: %s", type(self).__name__, exc)
+            raise Conflict(self.conflict_message)
+
+
+SPARSE_FIELDS_PARAMETER = OpenApiParameter(
+    'fields', str,
+    description="Campos a retornar, separados por vírgula (ex.: 'id,social_name'). Padrão: todos."
+)
+
+
+def select_related_paths(tree, prefix=''):
+    # {'a': {'b': {}}} -> ['a__b'], como o select_related recebe
+    for name, children in tree.items():
+        if children:
+            yield from select_related_paths(children, f'{prefix}{name}__')
+        else:
+            yield f'{prefix}{name}'
+
+
+class SparseFieldsetMixin:
+    # ?fields=id,social_name devolve só esses campos e aplica o mesmo corte
+    # no SELECT (.only()), reduzindo payload, serialização e leitura do banco.
+    # Vale apenas para leituras; escritas sempre usam o serializer completo.
+
+    def get_sparse_fields(self):
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+
+        self._sparse_fields = None
+        raw = self.request.query_params.get('fields', '') if self.request.method == 'GET' else ''
+        requested = [field.strip() for field in raw.split(',') if field.strip()]
+        if requested:
+            available = self.get_serializer_class()().fields
+            invalid = [field for field in requested if field not in available]
+            if invalid:
+                raise ValidationError({
+                    'fields': f"Campos inválidos: {', '.join(invalid)}. Use um de: {', '.join(available)}."
+                })
+            self._sparse_fields = {field: available[field].source for field in requested}
+        return self._sparse_fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if not fields:
+            return queryset
+
+        model = queryset.model
+        columns = set()
+        for source in fields.values():
+            try:
+                model._meta.get_field(source)
+            except FieldDoesNotExist:
+                # Campo calculado no serializer: não dá para restringir o SELECT
+                return queryset
+            columns.add(source)
+        # A paginação por cursor lê os campos de ordenação do último item.
+        # Anotações (ex.: relevância da busca) já vêm no SELECT
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        field_names = {field.name for field in model._meta.concrete_fields}
+        columns.update(field.lstrip('-') for field in ordering if field.lstrip('-') in field_names)
+        # select_related de um campo cortado pelo .only() é erro no Django:
+        # mantém só os JOINs que partem dos campos pedidos
+        related = queryset.query.select_related
+        if isinstance(related, dict):
+            paths = [path for path in select_related_paths(related) if path.split('__')[0] in columns]
+            queryset = queryset.select_related(None)
+            if paths:
+                queryset = queryset.select_related(*paths)
+        return queryset.only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fields = self.get_sparse_fields()
+        if fields:
+            target = getattr(serializer, 'child', serializer)
+            for name in list(target.fields):
+                if name not in fields:
+                    target.fields.pop(name)
+        return serializer
@@ -0,0 +1,36 @@
+from django.db import models
+from django.db.models.functions import Now
+
+
+class TimestampedModel(models.Model):
+    # db_default preenche as linhas antigas na migração e as gravadas por
+    # COPY/SQL direto; pelo ORM valem o auto_now_add/auto_now
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_default=Now(),
+        db_index=True,
+        verbose_name='Criado em'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        db_default=Now(),
+        verbose_name='Atualizado em'
+    )
+
+    class Meta:
+        abstract = True
+
+
+class Tombstone(models.Model):
+    # Registro de exclusão para o feed de sincronização: o cliente precisa
+    # saber quais ids sumiram desde a última consulta
+    object_id = models.BigIntegerField(verbose_name='ID removido')
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        db_default=Now(),
+        verbose_name='Removido em'
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ['deleted_at', 'id']
@@ -0,0 +1,115 @@
+import json
+from base64 import b64decode, b64encode
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.db.models.fields.tuple_lookups import Tuple, TupleGreaterThan, TupleLessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class DefaultCursorPagination(CursorPagination):
+    # Paginação por keyset: o cursor guarda os valores de todos os campos de
+    # 'ordering' do último item, e a página seguinte é um
+    # "WHERE (date, id) > (d, i)" sobre o índice, sem OFFSET, então páginas
+    # profundas custam o mesmo que a primeira, mesmo com milhares de empates
+    # no primeiro campo. (O CursorPagination do DRF só compara o primeiro
+    # campo e pula os empates com OFFSET, limitado a 1000 linhas.)
+    # O cursor é opaco (base64) e estável entre inserções.
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.fields = [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+        reverse, position = self.decode_cursor(request, queryset)
+
+        # Página anterior: percorre a ordem invertida a partir do cursor
+        queryset = queryset.order_by(*(
+            f'-{name}' if descending != reverse else name for name, descending in self.fields
+        ))
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(position, reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        return self.page
+
+    def keyset_filter(self, position, reverse):
+        names = [name for name, _ in self.fields]
+        directions = {descending != reverse for _, descending in self.fields}
+        if len(names) > 1 and len(directions) == 1:
+            # Mesma direção em todos os campos: comparação de linha, que vira
+            # uma única faixa do índice composto
+            lookup = TupleLessThan if directions.pop() else TupleGreaterThan
+            return lookup(Tuple(*(F(name) for name in names)), tuple(position))
+
+        # Direções mistas (ex.: relevância decrescente, id crescente):
+        # a > x OR (a = x AND b > y) ...
+        condition = Q()
+        for index, (name, descending) in enumerate(self.fields):
+            operator = 'lt' if descending != reverse else 'gt'
+            condition |= Q(
+                **dict(zip(names[:index], position[:index])),
+                **{f'{name}__{operator}': position[index]}
+            )
+        return condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Página anterior vazia: não há nada antes do cursor, então a
+            # próxima página é a primeira
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def encode_cursor(self, reverse, item):
+        position = [getattr(item, name) for name, _ in self.fields]
+        data = {'p': position, 'r': 1} if reverse else {'p': position}
+        cursor = b64encode(json.dumps(data, cls=DjangoJSONEncoder).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+        try:
+            data = json.loads(b64decode(encoded.encode(), validate=True))
+            position = data['p']
+            if len(position) != len(self.fields):
+                raise ValueError
+            # Converte de volta para o tipo de cada campo (datas vêm como texto)
+            position = [
+                self.get_field(queryset, name).to_python(value)
+                for (name, _), value in zip(self.fields, position)
+            ]
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return bool(data.get('r')), position
+
+    def get_field(self, queryset, name):
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Anotação (ex.: relevância da busca)
+            return queryset.query.annotations[name].output_field
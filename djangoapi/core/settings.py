@@ -41,6 +41,10 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     "django.middleware.security.SecurityMiddleware",
+    # Serve os arquivos estáticos direto do WSGI/ASGI, antes do Django
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Tempo, queries e histogramas por rota (/metrics/)
+    "core.middleware.MetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -51,6 +55,9 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "core.urls"
 
+# Token exigido no header Authorization do /metrics/ (vazio = aberto)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -84,6 +91,9 @@ def get_env_variable(var_name):
         raise ImproperlyConfigured(error_msg)
 
 
+# Servidor em uso (definido pelo scripts/commands.sh)
+SERVER_MODE = os.getenv('SERVER_MODE', 'dev')
+
 DATABASES = {
     'default': {
 
@@ -94,9 +104,61 @@ DATABASES = {
         'USER': get_env_variable('POSTGRES_USER'),
         'PASSWORD': get_env_variable('POSTGRES_PASSWORD'),
         'HOST': get_env_variable('POSTGRES_HOST'),
+
+        # Reaproveita a conexão entre requisições por até N segundos
+        # (0 fecha a cada requisição) e testa a conexão antes de reutilizar.
+        # No ASGI o padrão é 0: o ORM roda em threads que mudam entre
+        # requisições e cada conexão persistente ficaria aberta sem reuso
+        # (para reaproveitar conexões no ASGI use DB_POOL=1)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0 if SERVER_MODE == 'asgi' else 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Pool de conexões nativo do psycopg 3 (um pool por processo/worker).
+# Com o pool ativo o Django exige CONN_MAX_AGE = 0: a conexão volta para
+# o pool ao fim da requisição em vez de ficar presa à thread.
+DB_POOL = bool(int(os.getenv('DB_POOL', 0)))
+
+if DB_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 4)),
+            # Segundos esperando uma conexão livre antes de falhar
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', 10)),
+        },
+    }
+
+# Cache
+# Memória local por padrão. Com vários workers/containers defina CACHE_URL
+# (ex.: redis://redis:6379/0, requer o pacote "redis") para que a
+# invalidação feita por um processo valha para todos.
+CACHE_URL = os.getenv('CACHE_URL')
+
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'api-appointments',
+        }
+    }
+
+# Tempo máximo (segundos) de uma resposta cacheada de listagem/detalhe
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+# O cache de respostas (e os 304 por ETag) exige cache compartilhado quando
+# o Gunicorn sobe mais de um worker (o padrão do gunicorn.conf.py): na
+# memória local cada worker só enxerga as próprias invalidações
+API_CACHE_ENABLED = bool(CACHE_URL) or SERVER_MODE == 'dev' or os.getenv('GUNICORN_WORKERS') == '1'
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -132,16 +194,55 @@ STATIC_URL = "/static/"
 
 # /data/web/static
 STATIC_ROOT = BASE_DIR / 'static'
+# O WhiteNoise espera que o diretório exista mesmo antes do collectstatic
+STATIC_ROOT.mkdir(exist_ok=True)
+
+# Arquivos estáticos comprimidos e com hash no nome (cache longo)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
 
 MEDIA_URL = '/media/'
 # /data/web/media
 MEDIA_ROOT = BASE_DIR / 'media'
 
 
+# Modo de autenticação JWT:
+#   database  - carrega o usuário do banco a cada requisição (padrão)
+#   cached    - idem, mas guarda o usuário em memória por JWT_USER_CACHE_TTL
+#   stateless - monta o usuário só com as claims assinadas do token
+#               (id, username, is_staff), sem nenhuma consulta
+JWT_AUTHENTICATION_CLASSES = {
+    'database': 'rest_framework_simplejwt.authentication.JWTAuthentication',
+    'cached': 'authentication.backends.CachedUserJWTAuthentication',
+    'stateless': 'rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication',
+}
+JWT_AUTH_MODE = os.getenv('JWT_AUTH_MODE', 'database')
+
+if JWT_AUTH_MODE not in JWT_AUTHENTICATION_CLASSES:
+    raise ImproperlyConfigured(
+        f"JWT_AUTH_MODE inválido: {JWT_AUTH_MODE}. Use {', '.join(JWT_AUTHENTICATION_CLASSES)}."
+    )
+
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', 30))
+JWT_USER_CACHE_SIZE = int(os.getenv('JWT_USER_CACHE_SIZE', 1000))
+
+# Pré-checagem da blacklist no refresh com um Bloom filter em memória: o
+# caso comum (token não revogado) dispensa a consulta. O filtro é
+# recarregado a cada JWT_BLACKLIST_BLOOM_REFRESH segundos
+JWT_BLACKLIST_BLOOM = os.getenv('JWT_BLACKLIST_BLOOM', '0') == '1'
+JWT_BLACKLIST_BLOOM_CAPACITY = int(os.getenv('JWT_BLACKLIST_BLOOM_CAPACITY', 1000000))
+JWT_BLACKLIST_BLOOM_REFRESH = int(os.getenv('JWT_BLACKLIST_BLOOM_REFRESH', 30))
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        JWT_AUTHENTICATION_CLASSES[JWT_AUTH_MODE],
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -151,6 +252,51 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Tamanho padrão da página nas listagens paginadas por cursor
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 50))
+# Limite máximo que o cliente pode pedir via ?page_size=
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 500))
+
+# Linhas buscadas por vez no cursor do banco durante a exportação
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))
+
+# Quantidade máxima de agendamentos aceitos por lote
+BULK_CREATE_MAX_ITEMS = int(os.getenv('BULK_CREATE_MAX_ITEMS', 1000))
+
+# Busca de horários livres: janela padrão e janela máxima (em dias)
+AVAILABILITY_DEFAULT_DAYS = int(os.getenv('AVAILABILITY_DEFAULT_DAYS', 30))
+AVAILABILITY_MAX_DAYS = int(os.getenv('AVAILABILITY_MAX_DAYS', 366))
+
+# Busca de profissionais próximos: raio inicial (dobra até achar o
+# suficiente) e raio máximo, em km
+GEO_INITIAL_RADIUS_KM = float(os.getenv('GEO_INITIAL_RADIUS_KM', 5))
+GEO_MAX_RADIUS_KM = float(os.getenv('GEO_MAX_RADIUS_KM', 200))
+
+# Relatório de ocupação diária: intervalo máximo (em dias)
+OCCUPANCY_MAX_DAYS = int(os.getenv('OCCUPANCY_MAX_DAYS', 366))
+
+# Feed de sincronização: itens por resposta e atraso (segundos) em relação
+# ao relógio, para não pular linhas de transações que ainda não fizeram commit
+SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', 500))
+SYNC_LAG_SECONDS = float(os.getenv('SYNC_LAG_SECONDS', 2))
+
+# Particionamento mensal de agendamentos (Postgres): meses à frente que o
+# comando manage_partitions mantém criados
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 12))
+
+# Arquivamento: agendamentos com mais de ARCHIVE_AFTER_DAYS dias saem da
+# tabela ativa, ARCHIVE_BATCH_SIZE linhas por transação
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 1000))
+
+# Eventos em tempo real (SSE). EVENTS_NOTIFY=1 usa LISTEN/NOTIFY do Postgres
+# para que todos os workers recebam os eventos gravados em qualquer um deles
+EVENTS_NOTIFY = os.getenv('EVENTS_NOTIFY', '0') == '1'
+# Eventos pendentes por cliente antes de pedir ressincronização
+EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', 1000))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+EVENTS_RETRY_MS = int(os.getenv('EVENTS_RETRY_MS', 3000))
+
 # Define tempo de vida dos tokens de autenticação
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),  # Token expira em 1 hora
@@ -161,6 +307,11 @@ SIMPLE_JWT = {
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    # Claims extras (username, is_staff) usadas pelo modo stateless
+    'TOKEN_OBTAIN_SERIALIZER': 'authentication.serializers.TokenClaimsObtainPairSerializer',
+    # Recusa o reuso de um refresh já rotacionado na própria gravação da
+    # blacklist; permite a pré-checagem por Bloom filter (JWT_BLACKLIST_BLOOM)
+    'TOKEN_REFRESH_SERIALIZER': 'authentication.serializers.PrecheckedTokenRefreshSerializer',
 }
 if DEBUG:
     # Desenvolvimento: permite localhost nas portas comuns de frontend
@@ -219,6 +370,21 @@ SPECTACULAR_SETTINGS = {
 LOGS_DIR = BASE_DIR / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
+# text ou json (uma linha JSON por registro)
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+# 1 = formatação e escrita dos logs em thread separada (QueueHandler)
+LOG_ASYNC = bool(int(os.getenv('LOG_ASYNC', 0)))
+# Registros aguardando escrita; acima disso são descartados e contados
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+# Amostragem dos logs INFO por logger: fração mantida de cada um
+# (ex.: "appointments=0.1,health_professionals=0.5"; ausente = todos)
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (
+        item.split('=') for item in os.getenv('LOG_SAMPLE_RATES', '').split(',') if '=' in item
+    )
+}
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -231,6 +397,15 @@ LOGGING = {
             'format': '{levelname} {asctime} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'core.logging.JsonFormatter',
+        },
+    },
+    'filters': {
+        'sample_info': {
+            '()': 'core.logging.SamplingFilter',
+            'rates': LOG_SAMPLE_RATES,
+        },
     },
     'handlers': {
         'console': {
@@ -292,3 +467,26 @@ LOGGING = {
         },
     },
 }
+
+if LOG_FORMAT == 'json':
+    for handler in LOGGING['handlers'].values():
+        handler['formatter'] = 'json'
+
+if LOG_ASYNC:
+    # Cada logger passa a escrever numa fila; um QueueListener por conjunto
+    # de handlers de destino faz a formatação e o I/O fora da requisição
+    for logger_config in LOGGING['loggers'].values():
+        targets = logger_config['handlers']
+        queue_handler = 'queue_' + '_'.join(targets)
+        LOGGING['handlers'].setdefault(queue_handler, {
+            'class': 'core.logging.BoundedQueueHandler',
+            'queue': {'()': 'queue.Queue', 'maxsize': LOG_QUEUE_SIZE},
+            'handlers': targets,
+            'respect_handler_level': True,
+            # Amostra antes de enfileirar, sem ocupar espaço na fila
+            'filters': ['sample_info'],
+        })
+        logger_config['handlers'] = [queue_handler]
+else:
+    for handler in LOGGING['handlers'].values():
+        handler['filters'] = ['sample_info']
@@ -0,0 +1,102 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import generics, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+def encode_watermark(changed, deleted):
+    payload = json.dumps({'changed': changed, 'deleted': deleted}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_watermark(value):
+    # Aceita o watermark devolvido pelo próprio feed ou, na primeira
+    # sincronização, uma data/hora ISO 8601 a partir da qual buscar
+    moment = parse_datetime(value)
+    if moment is not None:
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        position = [moment.isoformat(), 0]
+        return position, position
+
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(value.encode()))
+        changed, deleted = payload['changed'], payload['deleted']
+        for position in (changed, deleted):
+            if position is not None and (parse_datetime(position[0]) is None or not isinstance(position[1], int)):
+                raise ValueError
+    except (binascii.Error, ValueError, TypeError, KeyError, IndexError, AttributeError):
+        raise ValidationError({'since': 'Watermark inválido.'})
+    return changed, deleted
+
+
+def keyset_page(queryset, field, position, until, limit):
+    # Linhas depois de (field, id) = position, até o corte "until", em ordem
+    # estável; usa o índice (field, id) e não depende do tamanho da tabela
+    queryset = queryset.filter(**{f'{field}__lte': until})
+    if position is not None:
+        moment, last_id = parse_datetime(position[0]), position[1]
+        queryset = queryset.filter(Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': last_id}))
+    rows = list(queryset.order_by(field, 'id')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = [getattr(rows[-1], field).isoformat(), rows[-1].id]
+    return rows, position, has_more
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    since = serializers.CharField(required=False)
+    limit = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_limit(self, value):
+        return min(value, settings.SYNC_PAGE_SIZE)
+
+
+SYNC_PARAMETERS = [
+    OpenApiParameter('since', str, description="Watermark da resposta anterior ou data/hora ISO 8601. "
+                                               "Sem ele, o feed começa do início."),
+    OpenApiParameter('limit', int, description="Máximo de itens de cada lista (alterados e removidos)."),
+]
+
+
+class SyncFeedView(generics.GenericAPIView):
+    # Feed incremental: devolve as linhas criadas/alteradas e os ids
+    # removidos (tombstones) desde o watermark informado, cada fluxo paginado
+    # por keyset. O cliente guarda o 'since' da resposta e repete a chamada
+    # enquanto 'has_more' for verdadeiro
+    tombstone_model = None
+    pagination_class = None
+
+    def get(self, request, *args, **kwargs):
+        query = SyncQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        changed_position = deleted_position = None
+        if params.get('since'):
+            changed_position, deleted_position = decode_watermark(params['since'])
+        limit = params.get('limit', settings.SYNC_PAGE_SIZE)
+        until = timezone.now() - timedelta(seconds=settings.SYNC_LAG_SECONDS)
+
+        changed, changed_position, more_changed = keyset_page(
+            self.get_queryset(), 'updated_at', changed_position, until, limit
+        )
+        deleted, deleted_position, more_deleted = keyset_page(
+            self.tombstone_model.objects.all(), 'deleted_at', deleted_position, until, limit
+        )
+
+        return Response({
+            'changed': self.get_serializer(changed, many=True).data,
+            'deleted': [tombstone.object_id for tombstone in deleted],
+            'since': encode_watermark(changed_position, deleted_position),
+            'has_more': more_changed or more_deleted,
+        })
@@ -0,0 +1,86 @@
+import json
+import os
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from health_professionals.models import Profession
+
+
+# Com QUERY_PLAN_CHECKS=1 (e banco Postgres) cada SELECT executado dentro
+# de um orçamento passa por EXPLAIN e falha se fizer Seq Scan nas tabelas
+# de QUERY_PLAN_TABLES (ou nas partições delas: o plano de uma tabela
+# particionada só mostra os nomes das partições)
+QUERY_PLAN_CHECKS = bool(int(os.getenv('QUERY_PLAN_CHECKS', 0)))
+QUERY_PLAN_TABLES = ('appointments_appointments',)
+
+
+def get_profession(name):
+    # Profissão do catálogo pelo nome, criada na primeira vez
+    return Profession.objects.get_or_create(name=name)[0]
+
+
+class QueryBudgetMixin:
+    # Orçamento de queries por rota para os APITestCase: falha se a view
+    # passar do limite ou se o número de queries crescer com o volume de
+    # dados (sinal de N+1).
+
+    def run_with_budget(self, budget, request):
+        with CaptureQueriesContext(connection) as context:
+            response = request()
+            if getattr(response, 'streaming', False) and not response.is_async:
+                # O corpo em streaming só consulta o banco quando consumido
+                # (streams assíncronos, como o SSE, ficam a cargo do teste)
+                b''.join(response.streaming_content)
+
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertLessEqual(
+            len(queries), budget,
+            f'{len(queries)} queries (orçamento: {budget}):\n' + '\n'.join(queries)
+        )
+        if QUERY_PLAN_CHECKS and connection.vendor == 'postgresql':
+            self.assertNoSeqScan(queries)
+        return response, len(queries)
+
+    def assertQueryBudget(self, budget, request, grow=None):
+        response, before = self.run_with_budget(budget, request)
+        if grow is not None:
+            grow()
+            response, after = self.run_with_budget(budget, request)
+            self.assertEqual(
+                before, after,
+                f'O número de queries mudou com mais dados: {before} -> {after}'
+            )
+        return response
+
+    def assertNoSeqScan(self, queries, tables=QUERY_PLAN_TABLES):
+        with connection.cursor() as cursor:
+            # Tabelas de teste são pequenas e o planner prefere Seq Scan
+            # mesmo com índice; desligando-o, só sobra Seq Scan quando
+            # nenhum índice atende a query
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            try:
+                for sql in queries:
+                    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+                        continue
+                    if not any(table in sql for table in tables):
+                        continue
+                    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    for node in self._plan_nodes(plan[0]['Plan']):
+                        if node.get('Node Type') == 'Seq Scan' and self._is_plan_table(node.get('Relation Name'), tables):
+                            self.fail(f"Seq Scan em {node['Relation Name']}:\n{sql}")
+            finally:
+                cursor.execute('SET LOCAL enable_seqscan = on')
+
+    def _is_plan_table(self, name, tables):
+        # Partições mensais (<tabela>_pAAAAMM) e a default (<tabela>_default)
+        return name is not None and any(
+            name == table or name.startswith(f'{table}_p') or name == f'{table}_default'
+            for table in tables
+        )
+
+    def _plan_nodes(self, node):
+        yield node
+        for child in node.get('Plans', []):
+            yield from self._plan_nodes(child)
@@ -0,0 +1,19 @@
+import json
+from django.test import SimpleTestCase
+from core.events import EventBroker, NOTIFY_MAX_PAYLOAD
+
+
+class EventBrokerTestCase(SimpleTestCase):
+
+    def test_notify_payloads_respect_size_limit(self):
+        events = [{'type': 'appointment.created', 'data': {'id': index, 'note': 'x' * 500}} for index in range(100)]
+        payloads = list(EventBroker().notify_payloads('appointments', events))
+
+        self.assertGreater(len(payloads), 1)
+        received = []
+        for payload in payloads:
+            self.assertLessEqual(len(payload.encode()), NOTIFY_MAX_PAYLOAD + 100)
+            message = json.loads(payload)
+            self.assertEqual(message['channel'], 'appointments')
+            received += message['events']
+        self.assertEqual(received, events)
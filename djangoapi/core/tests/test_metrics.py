@@ -0,0 +1,54 @@
+import os
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from rest_framework import status
+from core.metrics import REGISTRY
+
+
+class MetricsTestCase(APITestCase):
+
+    def setUp(self):
+        REGISTRY.reset()
+        self.normal_user = User.objects.create_user(username='userTest', password='userPass')
+        self.metrics_url = reverse('metrics')
+
+    def test_server_timing_header(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(reverse('appointments-create-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('app;dur=', response['Server-Timing'])
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    def test_metrics_by_route(self):
+        self.client.force_authenticate(user=self.normal_user)
+        self.client.get(reverse('appointments-create-list'))
+        self.client.get(reverse('appointments-create-list'))
+
+        response = self.client.get(self.metrics_url)
+        content = response.content.decode()
+        worker = os.getpid()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            f'http_requests_total{{route="appointments-create-list",method="GET",status="200",worker="{worker}"}} 2',
+            content
+        )
+        self.assertIn(
+            f'http_request_duration_seconds_count{{route="appointments-create-list",method="GET",worker="{worker}"}} 2',
+            content
+        )
+        self.assertIn(
+            f'http_request_db_queries_bucket{{route="appointments-create-list",method="GET",worker="{worker}",le="+Inf"}} 2',
+            content
+        )
+        self.assertIn(f'logging_dropped_records_total{{worker="{worker}"}}', content)
+
+    def test_metrics_token(self):
+        with self.settings(METRICS_TOKEN='scrape-token'):
+            response = self.client.get(self.metrics_url)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+            response = self.client.get(self.metrics_url, HTTP_AUTHORIZATION='Bearer scrape-token')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,17 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from core.metrics import REGISTRY
+
+
+def metrics_view(request):
+    # Endpoint de scrape no formato texto do Prometheus. Fora do DRF para
+    # não depender de JWT; protegido opcionalmente por METRICS_TOKEN.
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+            return HttpResponseForbidden()
+    return HttpResponse(
+        REGISTRY.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
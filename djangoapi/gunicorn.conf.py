@@ -0,0 +1,32 @@
+import multiprocessing
+import os
+
+
+# Configuração do Gunicorn para produção (WSGI ou ASGI via UvicornWorker).
+# Todos os valores podem ser ajustados por variáveis de ambiente.
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Processos: padrão (2 x CPUs) + 1
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# Threads por processo (somente no modo WSGI; o UvicornWorker é assíncrono)
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+
+# Segundos que uma conexão ociosa fica aberta esperando a próxima requisição
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Recicla workers periodicamente para conter vazamentos de memória
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# Carrega a aplicação antes do fork (menos memória, boot mais rápido)
+preload_app = bool(int(os.getenv('GUNICORN_PRELOAD', 1)))
+
+# Heartbeat dos workers em memória em vez de disco
+worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
@@ -1,7 +1,14 @@
 from django.contrib import admin
-from .models import HealthProfessional
+from .models import HealthProfessional, Profession
+
+
+@admin.register(Profession)
+class ProfessionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name')
+    search_fields = ('name',)
 
 
 @admin.register(HealthProfessional)
 class HealthProfessionalAdmin(admin.ModelAdmin):
     list_display = ('id', 'social_name', 'profession', 'address', 'contact')
+    list_select_related = ('profession',)
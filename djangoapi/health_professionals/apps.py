@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HealthProfessionalsConfig(AppConfig):
 
     name = "health_professionals"
+
+    def ready(self):
+        from health_professionals import signals  # noqa: F401
@@ -0,0 +1,54 @@
+import math
+from django.conf import settings
+from django.db.models import Q
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    # Retângulo (em graus) que contém o círculo de raio radius_km. Filtro
+    # sobre o índice (latitude, longitude); a distância exata vem depois
+    delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    south, north = latitude - delta_lat, latitude + delta_lat
+    if south <= -90 or north >= 90:
+        # O círculo passa por um polo: vale qualquer longitude
+        return Q(latitude__gte=max(south, -90), latitude__lte=min(north, 90))
+
+    delta_lon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(latitude))))
+    box = Q(latitude__gte=south, latitude__lte=north)
+    if delta_lon >= 180:
+        return box
+    west, east = longitude - delta_lon, longitude + delta_lon
+    if west < -180:
+        # Cruza o antimeridiano: duas faixas de longitude
+        return box & (Q(longitude__gte=west + 360) | Q(longitude__lte=east))
+    if east > 180:
+        return box & (Q(longitude__gte=west) | Q(longitude__lte=east - 360))
+    return box & Q(longitude__gte=west, longitude__lte=east)
+
+
+def nearest_professionals(queryset, latitude, longitude, limit, max_radius_km):
+    # Os 'limit' profissionais mais próximos até max_radius_km. Começa com
+    # um raio pequeno e dobra enquanto não achar o suficiente: cada rodada
+    # lê só o retângulo do raio atual, e a distância exata é calculada
+    # apenas para esses candidatos. Quem está dentro do raio é mais próximo
+    # que qualquer um fora dele, então o resultado é exato
+    radius = min(settings.GEO_INITIAL_RADIUS_KM, max_radius_km)
+    while True:
+        found = []
+        for professional in queryset.filter(bounding_box(latitude, longitude, radius)):
+            distance = haversine_km(latitude, longitude, professional.latitude, professional.longitude)
+            if distance <= radius:
+                professional.distance_km = round(distance, 3)
+                found.append((distance, professional.pk, professional))
+        if len(found) >= limit or radius >= max_radius_km:
+            found.sort(key=lambda item: item[:2])
+            return [professional for _, _, professional in found[:limit]]
+        radius = min(radius * 2, max_radius_km)
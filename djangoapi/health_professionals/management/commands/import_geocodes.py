@@ -0,0 +1,71 @@
+import csv
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from core.cache import invalidate_cache
+from health_professionals.models import HealthProfessional
+from health_professionals.signals import PROFESSIONALS_CACHE
+
+
+class Command(BaseCommand):
+    help = ('Importa a localização dos profissionais de um CSV com as colunas id, latitude e longitude '
+            '(geocodificação feita fora da API). Coordenadas vazias removem a localização.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Arquivo CSV (UTF-8) com cabeçalho id,latitude,longitude.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8') as source:
+                reader = csv.DictReader(source)
+                missing = {'id', 'latitude', 'longitude'} - set(reader.fieldnames or ())
+                if missing:
+                    raise CommandError(f"Colunas ausentes no CSV: {', '.join(sorted(missing))}.")
+                updated, invalid, unknown = self.import_rows(reader, options['batch_size'])
+        except OSError as error:
+            raise CommandError(f'Não foi possível ler o arquivo: {error}')
+
+        # bulk_update não dispara post_save: invalida o cache manualmente
+        invalidate_cache(PROFESSIONALS_CACHE)
+        self.stdout.write(self.style.SUCCESS(
+            f'{updated} profissionais atualizados ({invalid} linhas inválidas, {unknown} ids inexistentes).'
+        ))
+
+    def import_rows(self, reader, batch_size):
+        updated = invalid = unknown = 0
+        rows = iter(reader)
+        while batch := list(islice(rows, batch_size)):
+            locations = {}
+            for row in batch:
+                location = self.parse(row)
+                if location is None:
+                    invalid += 1
+                    self.stderr.write(f'Linha ignorada: {row}')
+                    continue
+                locations[location[0]] = location[1:]
+
+            professionals = list(HealthProfessional.objects.filter(pk__in=locations).only('id'))
+            unknown += len(locations) - len(professionals)
+            now = timezone.now()
+            for professional in professionals:
+                professional.latitude, professional.longitude = locations[professional.pk]
+                # Sem auto_now no bulk_update: o feed de sincronização precisa ver a mudança
+                professional.updated_at = now
+            with transaction.atomic():
+                HealthProfessional.objects.bulk_update(professionals, ['latitude', 'longitude', 'updated_at'])
+            updated += len(professionals)
+        return updated, invalid, unknown
+
+    def parse(self, row):
+        try:
+            pk = int(row['id'])
+            if not row['latitude'].strip() and not row['longitude'].strip():
+                return pk, None, None
+            latitude, longitude = float(row['latitude']), float(row['longitude'])
+        except (TypeError, ValueError, AttributeError):
+            return None
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return None
+        return pk, latitude, longitude
@@ -0,0 +1,17 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health_professionals', '0004_alter_healthprofessional_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='healthprofessional',
+            index=models.Index(fields=['profession'], name='professional_profession'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:24
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health_professionals', '0005_healthprofessional_professional_profession'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='healthprofessional',
+            name='unique_professional',
+        ),
+        migrations.AddConstraint(
+            model_name='healthprofessional',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('social_name'), django.db.models.functions.text.Lower('profession'), name='unique_professional'),
+        ),
+    ]
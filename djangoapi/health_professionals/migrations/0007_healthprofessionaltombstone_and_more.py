@@ -0,0 +1,46 @@
+# Generated by Django 6.1.2 on 2026-10-18 14:51
+
+import django.db.models.functions.datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health_professionals', '0006_remove_healthprofessional_unique_professional_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HealthProfessionalTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.BigIntegerField(verbose_name='ID removido')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, db_default=django.db.models.functions.datetime.Now(), verbose_name='Removido em')),
+            ],
+            options={
+                'verbose_name': 'Profissional removido',
+                'verbose_name_plural': 'Profissionais removidos',
+                'ordering': ['deleted_at', 'id'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='healthprofessional',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_default=django.db.models.functions.datetime.Now(), db_index=True, verbose_name='Criado em'),
+        ),
+        migrations.AddField(
+            model_name='healthprofessional',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_default=django.db.models.functions.datetime.Now(), verbose_name='Atualizado em'),
+        ),
+        migrations.AddIndex(
+            model_name='healthprofessional',
+            index=models.Index(fields=['updated_at', 'id'], name='professional_updated_at_id'),
+        ),
+        migrations.AddIndex(
+            model_name='healthprofessionaltombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='professional_tombstone_deleted'),
+        ),
+    ]
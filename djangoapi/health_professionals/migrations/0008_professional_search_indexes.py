@@ -0,0 +1,41 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+TABLE = 'health_professionals_healthprofessional'
+SEARCH_FIELDS = ('social_name', 'profession', 'address')
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for field in SEARCH_FIELDS:
+            # CONCURRENTLY: a tabela continua aceitando escritas durante a criação
+            cursor.execute(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS professional_{field}_trgm '
+                f'ON {TABLE} USING gin ({field} gin_trgm_ops)'
+            )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for field in SEARCH_FIELDS:
+            cursor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS professional_{field}_trgm')
+
+
+class Migration(migrations.Migration):
+    # Índices GIN trigram (pg_trgm) para a busca ?q=. Só no Postgres; no
+    # SQLite a busca usa LIKE
+    atomic = False
+
+    dependencies = [
+        ('health_professionals', '0007_healthprofessionaltombstone_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
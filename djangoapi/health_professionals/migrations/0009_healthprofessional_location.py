@@ -0,0 +1,32 @@
+# Generated by Django 6.1.2 on 2026-10-18 15:42
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('health_professionals', '0008_professional_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='healthprofessional',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)], verbose_name='Latitude'),
+        ),
+        migrations.AddField(
+            model_name='healthprofessional',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)], verbose_name='Longitude'),
+        ),
+        migrations.AddIndex(
+            model_name='healthprofessional',
+            index=models.Index(fields=['latitude', 'longitude'], name='professional_location'),
+        ),
+        migrations.AddConstraint(
+            model_name='healthprofessional',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('latitude__isnull', True), ('longitude__isnull', True)), models.Q(('latitude__gte', -90), ('latitude__lte', 90), ('longitude__gte', -180), ('longitude__lte', 180)), _connector='OR'), name='professional_location_valid'),
+        ),
+    ]
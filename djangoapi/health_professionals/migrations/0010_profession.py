@@ -0,0 +1,97 @@
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def normalize(name):
+    # Mesma regra de Profession.normalize
+    return ' '.join(name.split()).title()
+
+
+def fill_professions(apps, schema_editor):
+    # Uma linha no catálogo por profissão, juntando as variações de espaço e
+    # maiúsculas ("psicóloga", " Psicóloga "); depois um UPDATE por texto
+    # distinto liga os profissionais à FK
+    Profession = apps.get_model('health_professionals', 'Profession')
+    HealthProfessional = apps.get_model('health_professionals', 'HealthProfessional')
+
+    catalog = {}
+    names = HealthProfessional.objects.order_by().values_list('profession', flat=True).distinct()
+    for name in names:
+        normalized = normalize(name)
+        if normalized not in catalog:
+            catalog[normalized], _ = Profession.objects.get_or_create(name=normalized)
+        HealthProfessional.objects.filter(profession=name).update(profession_ref=catalog[normalized])
+
+
+def restore_profession_names(apps, schema_editor):
+    HealthProfessional = apps.get_model('health_professionals', 'HealthProfessional')
+    Profession = apps.get_model('health_professionals', 'Profession')
+    for profession in Profession.objects.all():
+        HealthProfessional.objects.filter(profession_ref=profession).update(profession=profession.name)
+
+
+class Migration(migrations.Migration):
+    # Troca o texto livre de HealthProfessional.profession por uma FK para o
+    # catálogo Profession. Se dois profissionais só diferiam pela grafia da
+    # profissão, o novo índice único acusa a duplicata e a migração é desfeita
+
+    dependencies = [
+        ('health_professionals', '0009_healthprofessional_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Profession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Nome')),
+            ],
+            options={
+                'verbose_name': 'Profissão',
+                'verbose_name_plural': 'Profissões',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='healthprofessional',
+            name='profession_ref',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='professionals', to='health_professionals.profession', verbose_name='Profissão'),
+        ),
+        migrations.RunPython(fill_professions, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='healthprofessional',
+            name='unique_professional',
+        ),
+        migrations.RemoveIndex(
+            model_name='healthprofessional',
+            name='professional_profession',
+        ),
+        # Na volta, devolve os nomes antes de recriar o índice e a constraint
+        migrations.RunPython(migrations.RunPython.noop, restore_profession_names),
+        # blank=True dá à coluna recriada na volta um default vazio, que o
+        # RunPython de volta preenche com os nomes
+        migrations.AlterField(
+            model_name='healthprofessional',
+            name='profession',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Profissão'),
+        ),
+        migrations.RemoveField(
+            model_name='healthprofessional',
+            name='profession',
+        ),
+        migrations.RenameField(
+            model_name='healthprofessional',
+            old_name='profession_ref',
+            new_name='profession',
+        ),
+        migrations.AlterField(
+            model_name='healthprofessional',
+            name='profession',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='professionals', to='health_professionals.profession', verbose_name='Profissão'),
+        ),
+        migrations.AddConstraint(
+            model_name='healthprofessional',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('social_name'), models.F('profession'), name='unique_professional'),
+        ),
+    ]
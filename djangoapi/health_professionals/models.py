@@ -1,15 +1,48 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
+from core.models import TimestampedModel, Tombstone
 
 
-class HealthProfessional(models.Model):
+class Profession(models.Model):
+    # Catálogo de profissões: os profissionais apontam para cá por FK, e
+    # filtros e agregados por profissão comparam ids em vez de textos
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name='Nome'
+    )
+
+    class Meta:
+        verbose_name = 'Profissão'
+        verbose_name_plural = 'Profissões'
+        ordering = ['name']
+
+    @staticmethod
+    def normalize(name):
+        # Forma canônica do nome: "  psicóloga " e "PSICÓLOGA" viram "Psicóloga"
+        return ' '.join(name.split()).title()
+
+    def __str__(self):
+        return self.name
+
+    def clean(self):
+        if self.name:
+            self.name = self.normalize(self.name)
+
+
+class HealthProfessional(TimestampedModel):
 
     social_name = models.CharField(
         max_length=200,
         verbose_name='Nome social',
         null=False, blank=False
     )
-    profession = models.CharField(
-        max_length=100,
+    profession = models.ForeignKey(
+        Profession,
+        on_delete=models.PROTECT,
+        related_name='professionals',
         verbose_name='Profissão'
     )
     address = models.TextField(
@@ -19,18 +52,54 @@ class HealthProfessional(models.Model):
         max_length=100,
         verbose_name='Contato'
     )
+    # Localização opcional (graus decimais), informada pelo cliente ou
+    # importada com o comando import_geocodes
+    latitude = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+        verbose_name='Latitude'
+    )
+    longitude = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+        verbose_name='Longitude'
+    )
 
     class Meta:
         verbose_name = 'Profissional de Saúde'
         verbose_name_plural = 'Profissionais de Saúde'
         ordering = ['social_name']
+        indexes = [
+            # Feed de sincronização: keyset por (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='professional_updated_at_id'),
+            # Busca por proximidade: pré-filtro por retângulo (faixa de
+            # latitude + longitude lida no próprio índice)
+            models.Index(fields=['latitude', 'longitude'], name='professional_location'),
+        ]
         constraints = [
+            # Latitude e longitude vêm juntas e dentro da faixa válida
+            models.CheckConstraint(
+                condition=Q(latitude__isnull=True, longitude__isnull=True) | Q(
+                    latitude__gte=-90, latitude__lte=90, longitude__gte=-180, longitude__lte=180
+                ),
+                name='professional_location_valid'
+            ),
+            # Índice funcional: "Ana Silva"/"ana silva" contam como o mesmo
+            # (a profissão já é única no catálogo)
             models.UniqueConstraint(
-                fields=['social_name', 'profession'],
+                Lower('social_name'),
+                'profession',
                 name='unique_professional'
             )
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values, **kwargs):
+        instance = super().from_db(db, field_names, values, **kwargs)
+        # Profissão como estava no banco, para mover a ocupação quando mudar
+        instance._loaded_profession = instance.__dict__.get('profession_id')
+        return instance
+
     def __str__(self):
         return f"{self.social_name} - {self.profession}"
 
@@ -38,9 +107,17 @@ class HealthProfessional(models.Model):
         if self.social_name:
             self.social_name = ' '.join(self.social_name.split())
 
-        if self.profession:
-            self.profession = self.profession.strip().title()
         if self.contact:
             self.contact = self.contact.strip()
         if self.address:
             self.address = self.address.strip()
+
+
+class HealthProfessionalTombstone(Tombstone):
+
+    class Meta(Tombstone.Meta):
+        verbose_name = 'Profissional removido'
+        verbose_name_plural = 'Profissionais removidos'
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='professional_tombstone_deleted'),
+        ]
@@ -0,0 +1,13 @@
+from core.pagination import DefaultCursorPagination
+
+
+class HealthProfessionalCursorPagination(DefaultCursorPagination):
+    # 'id' desempata profissionais com o mesmo nome social
+    ordering = ('social_name', 'id')
+
+
+class HealthProfessionalSearchPagination(DefaultCursorPagination):
+    # Resultados do ?q=: mais relevantes primeiro. Muitos resultados empatam
+    # na relevância; o cursor leva (search_rank, id) e a página seguinte é
+    # "search_rank < r OR (search_rank = r AND id > i)", sem OFFSET
+    ordering = ('-search_rank', 'id')
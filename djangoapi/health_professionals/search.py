@@ -0,0 +1,51 @@
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast, Greatest
+from health_professionals.models import Profession
+
+
+# Campos cobertos pelo ?q= (no Postgres, cada um com índice GIN trigram,
+# migração 0008). A profissão é buscada no catálogo (PROFESSION_FIELD)
+SEARCH_FIELDS = ('social_name', 'address')
+PROFESSION_FIELD = 'profession__name'
+
+
+def search_professionals(queryset, query):
+    # Filtra pelos profissionais que combinam com 'query' e anota
+    # 'search_rank' (maior = mais parecido), usado na ordenação
+    if connection.vendor == 'postgresql':
+        return trigram_search(queryset, query)
+
+    # Fallback de desenvolvimento (SQLite): substring, com o nome antes
+    professions = list(Profession.objects.filter(name__icontains=query).order_by().values_list('pk', flat=True))
+    rank = Case(
+        When(social_name__istartswith=query, then=Value(3.0)),
+        When(social_name__icontains=query, then=Value(2.0)),
+        When(Q(profession__in=professions) | Q(address__icontains=query), then=Value(1.0)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    return queryset.annotate(search_rank=rank).filter(search_rank__gt=0)
+
+
+def trigram_search(queryset, query):
+    from django.contrib.postgres.lookups import TrigramWordSimilar
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    # "campo %> q" (word_similarity acima do limiar do pg_trgm) usa o
+    # índice GIN de cada campo, e as profissões que combinam (catálogo
+    # pequeno, resolvido antes) entram pelo índice da FK; o OR vira um
+    # BitmapOr. Aceita trechos e pequenos erros de digitação ("ana slva")
+    professions = list(
+        Profession.objects.filter(TrigramWordSimilar(F('name'), Value(query))).order_by().values_list('pk', flat=True)
+    )
+    match = Q(profession__in=professions)
+    for field in SEARCH_FIELDS:
+        match |= Q(TrigramWordSimilar(F(field), Value(query)))
+    # word_similarity devolve real: o cast para double mantém o valor exato
+    # no cursor de paginação
+    rank = Cast(
+        Greatest(*(TrigramWordSimilarity(query, field) for field in SEARCH_FIELDS + (PROFESSION_FIELD,))),
+        FloatField()
+    )
+    return queryset.filter(match).annotate(search_rank=rank)
@@ -1,14 +1,27 @@
 from rest_framework import serializers
+from django.conf import settings
 import re
-from health_professionals.models import HealthProfessional
+from health_professionals.models import HealthProfessional, Profession
+
+
+class ProfessionField(serializers.CharField):
+    # Na API a profissão continua sendo o nome; no banco é a FK para o
+    # catálogo, lida com select_related pelas views
+
+    def to_representation(self, value):
+        return value.name
 
 
 class HealthProfessionalModelSerializers(serializers.ModelSerializer):
+    profession = ProfessionField(max_length=100)
 
     class Meta:
 
         model = HealthProfessional
         fields = '__all__'
+        # A unicidade (nome social + profissão, sem diferenciar maiúsculas)
+        # fica com o índice único do banco; a violação vira 409 na view
+        validators = []
 
     def validate_social_name(self, value):
 
@@ -39,8 +52,7 @@ class HealthProfessionalModelSerializers(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 'A profissão deve ter pelo menos 3 caracteres.'
             )
-        value = value.strip().title()
-        return value
+        return Profession.normalize(value)
 
     def validate_address(self, value):
         value = re.sub(r'\s+', ' ', value)
@@ -77,20 +89,52 @@ class HealthProfessionalModelSerializers(serializers.ModelSerializer):
             )
         return value
 
-    def validate_mult_fields(self, data):
-        social_name = data.get('social_name', '')
-        profession = data.get('profession', '')
+    def validate(self, data):
+        # Localização só faz sentido com as duas coordenadas
+        location = [
+            data[field] if field in data else getattr(self.instance, field, None)
+            for field in ('latitude', 'longitude')
+        ]
+        if (location[0] is None) != (location[1] is None):
+            raise serializers.ValidationError({
+                'latitude': 'Informe latitude e longitude juntas.'
+            })
+        return data
 
-        if social_name and profession:
-            query = HealthProfessional.objects.filter(
-                social_name__iexact=social_name.strip(),
-                profession__iexact=profession.strip()
-            )
+    def create(self, validated_data):
+        self.resolve_profession(validated_data)
+        return super().create(validated_data)
 
-            if self.instance:
-                query = query.exclude(pk=self.instance.pk)
-            if query.exists():
-                raise serializers.ValidationError(
-                    'Já existe um profissional cadastrado com este nome e profissão.'
-                )
-        return data
+    def update(self, instance, validated_data):
+        self.resolve_profession(validated_data)
+        return super().update(instance, validated_data)
+
+    def resolve_profession(self, validated_data):
+        # Profissão nova entra no catálogo na mesma transação do profissional
+        if 'profession' in validated_data:
+            validated_data['profession'], _ = Profession.objects.get_or_create(name=validated_data['profession'])
+
+
+class ProfessionSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Profession
+        fields = ['id', 'name']
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    radius_km = serializers.FloatField(required=False, min_value=0.1)
+    profession = serializers.CharField(required=False)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1)
+
+    def validate_radius_km(self, value):
+        return min(value, settings.GEO_MAX_RADIUS_KM)
+
+    def validate_limit(self, value):
+        return min(value, settings.API_MAX_PAGE_SIZE)
+
+
+class NearbyProfessionalSerializer(HealthProfessionalModelSerializers):
+    distance_km = serializers.FloatField(read_only=True)
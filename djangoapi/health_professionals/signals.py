@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from core.cache import invalidate_cache
+from health_professionals.models import HealthProfessional, HealthProfessionalTombstone, Profession
+
+
+PROFESSIONALS_CACHE = 'professionals'
+PROFESSIONS_CACHE = 'professions'
+
+
+@receiver(post_save, sender=HealthProfessional)
+@receiver(post_delete, sender=HealthProfessional)
+def invalidate_professionals_cache(sender, **kwargs):
+    invalidate_cache(PROFESSIONALS_CACHE)
+
+
+@receiver(post_delete, sender=HealthProfessional)
+def record_professional_tombstone(sender, instance, **kwargs):
+    HealthProfessionalTombstone.objects.create(object_id=instance.pk)
+
+
+@receiver(post_save, sender=Profession)
+@receiver(post_delete, sender=Profession)
+def invalidate_professions_cache(sender, **kwargs):
+    invalidate_cache(PROFESSIONS_CACHE)
+    # As respostas de profissionais trazem o nome da profissão
+    invalidate_cache(PROFESSIONALS_CACHE)
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from health_professionals.models import HealthProfessional
+from core.testing import get_profession
+
+
+class ImportGeocodesCommandTestCase(TestCase):
+
+    def setUp(self):
+        self.professional = HealthProfessional.objects.create(
+            social_name='Dra. Ana Silva', profession=get_profession('Psicóloga'), address='Rua das Flores, 123', contact='(11) 99999-9999'
+        )
+        self.previous_update = self.professional.updated_at
+
+    def write_csv(self, content):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_geocodes(self):
+        path = self.write_csv(
+            'id,latitude,longitude\n'
+            f'{self.professional.pk},-23.5614,-46.6559\n'
+            '999999,-23.0,-46.0\n'
+            f'{self.professional.pk},abc,-46.0\n'
+            f'{self.professional.pk},91,-46.0\n'
+        )
+        out = StringIO()
+        call_command('import_geocodes', path, stdout=out, stderr=StringIO())
+
+        self.professional.refresh_from_db()
+        self.assertEqual((self.professional.latitude, self.professional.longitude), (-23.5614, -46.6559))
+        self.assertGreater(self.professional.updated_at, self.previous_update)
+        self.assertIn('1 profissionais atualizados (2 linhas inválidas, 1 ids inexistentes)', out.getvalue())
+
+    def test_import_geocodes_clears_location(self):
+        HealthProfessional.objects.filter(pk=self.professional.pk).update(latitude=-23.5, longitude=-46.6)
+        path = self.write_csv(f'id,latitude,longitude\n{self.professional.pk},,\n')
+        call_command('import_geocodes', path, stdout=StringIO())
+
+        self.professional.refresh_from_db()
+        self.assertIsNone(self.professional.latitude)
+        self.assertIsNone(self.professional.longitude)
+
+    def test_import_geocodes_requires_columns(self):
+        path = self.write_csv('id,lat,lng\n1,2,3\n')
+        with self.assertRaises(CommandError):
+            call_command('import_geocodes', path, stdout=StringIO())
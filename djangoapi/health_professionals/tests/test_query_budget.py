@@ -0,0 +1,113 @@
+from django.urls import reverse
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from core.testing import QueryBudgetMixin, get_profession
+from health_professionals.models import HealthProfessional, Profession
+
+
+class HealthProfessionalQueryBudgetTestCase(QueryBudgetMixin, APITestCase):
+
+    def setUp(self):
+        self.normal_user = User.objects.create_user(username='userTest', password='userPass')
+        self.client.force_authenticate(user=self.normal_user)
+        self.health_professional = HealthProfessional.objects.create(
+            social_name='Dra. Ana Silva',
+            profession=get_profession('Psicóloga'),
+            address='Rua das Flores, 123',
+            contact='(11) 99999-9999'
+        )
+        self.detail_url = reverse('professionals-detail-view', kwargs={'pk': self.health_professional.pk})
+        self.list_url = reverse('professionals-create-list')
+
+    def grow(self, total=1000):
+        profession = get_profession('Psicóloga')
+        HealthProfessional.objects.bulk_create([
+            HealthProfessional(
+                social_name=f'Profissional {index}',
+                profession=profession,
+                address='Rua das Flores, 123',
+                contact='(11) 99999-9999'
+            )
+            for index in range(total)
+        ])
+
+    def uncached(self, request):
+        # Mede a consulta real, sem o cache de respostas
+        def run():
+            cache.clear()
+            return request()
+        return run
+
+    def test_list_budget(self):
+        self.assertQueryBudget(1, self.uncached(lambda: self.client.get(self.list_url)), grow=self.grow)
+
+    def test_list_sparse_fields_budget(self):
+        params = {'fields': 'id,social_name'}
+        self.assertQueryBudget(1, self.uncached(lambda: self.client.get(self.list_url, params)), grow=self.grow)
+
+    def test_list_sparse_fields_with_profession_budget(self):
+        # A profissão vem do catálogo no mesmo SELECT (JOIN pela FK)
+        params = {'fields': 'id,profession'}
+        self.assertQueryBudget(1, self.uncached(lambda: self.client.get(self.list_url, params)), grow=self.grow)
+
+    def test_cached_list_budget(self):
+        self.client.get(self.list_url)
+        self.assertQueryBudget(0, lambda: self.client.get(self.list_url))
+
+    def test_create_budget(self):
+        names = iter(range(10000))
+
+        def create():
+            data = {
+                'social_name': f'Dr. Novo {next(names)}',
+                'profession': 'psicóloga',
+                'address': 'Av. Paulista, 1000',
+                'contact': '(11) 98888-8888'
+            }
+            return self.client.post(self.list_url, data, format='json')
+
+        # Inclui a busca da profissão no catálogo
+        self.assertQueryBudget(4, create, grow=self.grow)
+
+    def test_detail_budget(self):
+        self.assertQueryBudget(1, self.uncached(lambda: self.client.get(self.detail_url)), grow=self.grow)
+
+    def test_update_budget(self):
+        data = {'social_name': 'update Name'}
+        self.assertQueryBudget(
+            4, lambda: self.client.patch(self.detail_url, data, format='json'), grow=self.grow
+        )
+
+    def test_delete_budget(self):
+        # Inclui o tombstone do feed de sincronização, a ocupação mensal e a
+        # checagem de agendamentos arquivados (PROTECT)
+        self.assertQueryBudget(6, lambda: self.client.delete(self.detail_url))
+
+    @override_settings(SYNC_LAG_SECONDS=0)
+    def test_sync_budget(self):
+        url = reverse('professionals-sync')
+        # Uma query para as linhas alteradas e outra para os tombstones
+        self.assertQueryBudget(2, lambda: self.client.get(url, {'limit': 50}), grow=self.grow)
+
+    def test_list_search_budget(self):
+        params = {'q': 'ana silva'}
+        # Profissões que combinam (catálogo) + a busca em si
+        self.assertQueryBudget(2, self.uncached(lambda: self.client.get(self.list_url, params)), grow=self.grow)
+
+    def test_nearby_budget(self):
+        HealthProfessional.objects.filter(pk=self.health_professional.pk).update(latitude=-23.5614, longitude=-46.6559)
+        url = reverse('professionals-nearby')
+        params = {'latitude': -23.5610, 'longitude': -46.6560, 'limit': 1}
+        # Achou no primeiro raio: um único retângulo lido
+        self.assertQueryBudget(1, lambda: self.client.get(url, params), grow=self.grow)
+
+    def test_professions_budget(self):
+        url = reverse('professions-list')
+
+        def grow():
+            Profession.objects.bulk_create([Profession(name=f'Profissão {index}') for index in range(100)])
+
+        self.assertQueryBudget(1, self.uncached(lambda: self.client.get(url)), grow=grow)
+        self.assertQueryBudget(0, lambda: self.client.get(url))
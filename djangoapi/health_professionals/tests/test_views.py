@@ -1,21 +1,29 @@
 from django.urls import reverse
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework import status
-from health_professionals.models import HealthProfessional
+from django.db import IntegrityError, connection
+from unittest import skipUnless
+from health_professionals.models import HealthProfessional, Profession
+from health_professionals.views import HealthProfessionalCreateView
+from core.testing import get_profession
 
 
 class HealthProfessionaltestCase(APITestCase):
 
     def setUp(self):
+        cache.clear()
         self.normal_user = User.objects.create_user(username='userTest', password='userPass')
         self.health_professional = HealthProfessional.objects.create(
             social_name='Dra. Ana Silva',
-            profession='Psicóloga',
+            profession=get_profession('Psicóloga'),
             address='Rua das Flores, 123',
             contact='(11) 99999-9999'
         )
         self.url = reverse('professionals-detail-view', kwargs={'pk': self.health_professional.pk})
+        self.list_url = reverse('professionals-create-list')
         return super().setUp()
 
     def test_unauthorized_update_healthProfessional(self):
@@ -61,8 +69,46 @@ class HealthProfessionaltestCase(APITestCase):
         list_url = reverse('professionals-create-list')
         response = self.client.get(list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['social_name'], 'Dra. Ana Silva')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['social_name'], 'Dra. Ana Silva')
+
+    def test_list_healthProfessionals_sparse_fields(self):
+        self.client.force_authenticate(user=self.normal_user)
+        list_url = reverse('professionals-create-list')
+        response = self.client.get(list_url, {'fields': 'id,social_name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0], {
+            'id': self.health_professional.id,
+            'social_name': 'Dra. Ana Silva'
+        })
+
+    def test_get_healthProfessional_sparse_fields(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.url, {'fields': 'social_name,profession'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'social_name': 'Dra. Ana Silva', 'profession': 'Psicóloga'})
+
+    def test_list_healthProfessionals_invalid_fields(self):
+        self.client.force_authenticate(user=self.normal_user)
+        list_url = reverse('professionals-create-list')
+        response = self.client.get(list_url, {'fields': 'id,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+    def test_list_healthProfessionals_cursor_pagination(self):
+        self.client.force_authenticate(user=self.normal_user)
+        list_url = reverse('professionals-create-list')
+        for index in range(3):
+            HealthProfessional.objects.create(
+                social_name=f'Dr. Profissional {index}',
+                profession=get_profession('Psicóloga'),
+                address='Rua das Flores, 123',
+                contact='(11) 99999-9999'
+            )
+        response = self.client.get(list_url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
 
     def test_unauthorized_get_healthProfessional(self):
         response = self.client.get(self.url)
@@ -138,3 +184,299 @@ class HealthProfessionaltestCase(APITestCase):
         response = self.client.put(self.url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('social_name', response.data)
+
+    def test_check_violation_is_not_conflict(self):
+        profession = self.health_professional.profession
+
+        class BrokenSerializer:
+            def save(self):
+                # Viola a CHECK professional_location_valid, não a unicidade
+                return HealthProfessional.objects.create(
+                    social_name='Dr. João Santos', profession=profession, address='Av. Paulista, 1000',
+                    contact='(11) 98888-8888', latitude=100, longitude=0
+                )
+
+        with self.assertRaises(IntegrityError):
+            HealthProfessionalCreateView().save_or_conflict(BrokenSerializer())
+
+    def test_create_duplicate_healthProfessional_ignores_case(self):
+        self.client.force_authenticate(user=self.normal_user)
+        data = {
+            "social_name": "dra. ana silva",
+            "profession": "psicóloga",
+            "address": "Rua das Flores, 123",
+            "contact": "(11) 99999-9999"
+        }
+        response = self.client.post(
+            reverse('professionals-create-list'),
+            data,
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(HealthProfessional.objects.count(), 1)
+
+    def test_list_healthProfessionals_not_modified_with_etag(self):
+        self.client.force_authenticate(user=self.normal_user)
+        list_url = reverse('professionals-create-list')
+        response = self.client.get(list_url)
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(response.content)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_list_healthProfessionals_cache_invalidated_on_write(self):
+        self.client.force_authenticate(user=self.normal_user)
+        list_url = reverse('professionals-create-list')
+        etag = self.client.get(list_url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            HealthProfessional.objects.create(
+                social_name='Dr. João Santos',
+                profession=get_profession('Psiquiatra'),
+                address='Av. Paulista, 1000',
+                contact='(11) 98888-8888'
+            )
+        response = self.client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_get_healthProfessional_cache_invalidated_on_update(self):
+        self.client.force_authenticate(user=self.normal_user)
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, {"social_name": "update Name"}, format='json')
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['social_name'], 'update Name')
+
+    def test_get_healthProfessional_cache_invalidated_only_after_commit(self):
+        self.client.force_authenticate(user=self.normal_user)
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.patch(self.url, {"social_name": "update Name"}, format='json')
+            # Antes do commit a versão ainda é a antiga
+            self.assertEqual(self.client.get(self.url)['ETag'], etag)
+        self.assertTrue(callbacks)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['social_name'], 'update Name')
+
+    @override_settings(API_CACHE_ENABLED=False)
+    def test_get_healthProfessional_without_shared_cache(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', response)
+        self.health_professional.social_name = 'update Name'
+        self.health_professional.save()
+        self.assertEqual(self.client.get(self.url).data['social_name'], 'update Name')
+
+    @override_settings(SYNC_LAG_SECONDS=0)
+    def test_sync_healthProfessionals_tracks_deletions(self):
+        self.client.force_authenticate(user=self.normal_user)
+        sync_url = reverse('professionals-sync')
+        response = self.client.get(sync_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['changed'][0]['social_name'], 'Dra. Ana Silva')
+
+        professional_id = self.health_professional.id
+        self.client.delete(self.url)
+
+        response = self.client.get(sync_url, {'since': response.data['since']})
+        self.assertEqual(response.data['changed'], [])
+        self.assertEqual(response.data['deleted'], [professional_id])
+
+    def test_search_healthProfessionals(self):
+        self.client.force_authenticate(user=self.normal_user)
+        HealthProfessional.objects.create(
+            social_name='Dr. João Santos', profession=get_profession('Psiquiatra'), address='Av. Paulista, 1000', contact='(11) 98888-8888'
+        )
+        HealthProfessional.objects.create(
+            social_name='Dra. Mariana Costa', profession=get_profession('Nutricionista'), address='Rua Santos Dumont, 10',
+            contact='(11) 97777-7777'
+        )
+
+        response = self.client.get(self.list_url, {'q': 'santos'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        names = [item['social_name'] for item in response.data['results']]
+        # Nome antes do endereço
+        self.assertEqual(names[0], 'Dr. João Santos')
+        self.assertIn('Dra. Mariana Costa', names)
+        self.assertNotIn(self.health_professional.social_name, names)
+
+    def test_search_healthProfessionals_pagination(self):
+        self.client.force_authenticate(user=self.normal_user)
+        HealthProfessional.objects.bulk_create([
+            HealthProfessional(
+                social_name=f'Terapeuta {index}', profession=get_profession('Terapeuta'), address='Rua A', contact='(11) 90000-0000'
+            )
+            for index in range(7)
+        ])
+
+        ids = []
+        response = self.client.get(self.list_url, {'q': 'terapeuta', 'page_size': 3})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(len(set(ids)), 7)
+
+    def test_search_healthProfessionals_pagination_with_tied_rank(self):
+        # Mais de 1000 resultados com a mesma relevância: o cursor leva
+        # (search_rank, id), sem OFFSET dentro do empate
+        self.client.force_authenticate(user=self.normal_user)
+        profession = get_profession('Terapeuta')
+        HealthProfessional.objects.bulk_create([
+            HealthProfessional(
+                social_name=f'Terapeuta {index}', profession=profession, address='Rua A', contact='(11) 90000-0000'
+            )
+            for index in range(1100)
+        ])
+
+        ids = []
+        pages = 0
+        url, params = self.list_url, {'q': 'terapeuta', 'page_size': 100}
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [item['id'] for item in response.data['results']]
+            url, params = response.data['next'], None
+            pages += 1
+            self.assertLessEqual(pages, 12)
+
+        self.assertEqual(len(ids), 1100)
+        self.assertEqual(len(set(ids)), 1100)
+
+    def test_search_healthProfessionals_sparse_fields(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'q': 'ana', 'fields': 'id'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [{'id': self.health_professional.id}])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Busca por similaridade só no PostgreSQL')
+    def test_search_healthProfessionals_tolerates_typos(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'q': 'silvaa'})
+
+        self.assertEqual([item['id'] for item in response.data['results']], [self.health_professional.id])
+
+    def test_search_healthProfessionals_too_long(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(self.list_url, {'q': 'a' * 101})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_patch_healthProfessional_location_requires_both_coordinates(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.patch(self.url, {'latitude': -23.56}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.patch(self.url, {'latitude': -23.56, 'longitude': -46.65}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['latitude'], -23.56)
+
+        response = self.client.patch(self.url, {'latitude': 95, 'longitude': -46.65}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_nearby_healthProfessionals(self):
+        self.client.force_authenticate(user=self.normal_user)
+        # Av. Paulista como origem
+        HealthProfessional.objects.filter(pk=self.health_professional.pk).update(latitude=-23.5614, longitude=-46.6559)
+        far = HealthProfessional.objects.create(
+            social_name='Dr. João Santos', profession=get_profession('Psicóloga'), address='Av. Atlântica, 1000',
+            contact='(21) 98888-8888', latitude=-22.9711, longitude=-43.1822
+        )
+        near = HealthProfessional.objects.create(
+            social_name='Dra. Mariana Costa', profession=get_profession('Nutricionista'), address='Rua Augusta, 500',
+            contact='(11) 97777-7777', latitude=-23.5534, longitude=-46.6520
+        )
+        HealthProfessional.objects.create(
+            social_name='Dr. Sem Endereço', profession=get_profession('Psicóloga'), address='Sem localização',
+            contact='(11) 96666-6666'
+        )
+        url = reverse('professionals-nearby')
+
+        with self.settings(GEO_MAX_RADIUS_KM=1000):
+            response = self.client.get(url, {'latitude': -23.5610, 'longitude': -46.6560, 'radius_km': 1000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data], [self.health_professional.id, near.id, far.id])
+        self.assertLess(response.data[0]['distance_km'], 0.1)
+        self.assertAlmostEqual(response.data[2]['distance_km'], 360, delta=10)
+
+        response = self.client.get(url, {'latitude': -23.5610, 'longitude': -46.6560, 'profession': 'psicóloga', 'limit': 1})
+        self.assertEqual([item['id'] for item in response.data], [self.health_professional.id])
+
+        response = self.client.get(url, {'latitude': -23.5610, 'longitude': -46.6560, 'radius_km': 50})
+        self.assertNotIn(far.id, [item['id'] for item in response.data])
+
+    def test_nearby_healthProfessionals_invalid_coordinates(self):
+        self.client.force_authenticate(user=self.normal_user)
+        response = self.client.get(reverse('professionals-nearby'), {'latitude': -123, 'longitude': 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('latitude', response.data)
+
+    def test_create_healthProfessional_reuses_profession(self):
+        self.client.force_authenticate(user=self.normal_user)
+        data = {
+            'social_name': 'Dr. João Santos',
+            'profession': '  PSICÓLOGA ',
+            'address': 'Av. Paulista, 1000',
+            'contact': '(11) 98888-8888'
+        }
+        response = self.client.post(self.list_url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['profession'], 'Psicóloga')
+        self.assertEqual(Profession.objects.count(), 1)
+        professional = HealthProfessional.objects.get(pk=response.data['id'])
+        self.assertEqual(professional.profession_id, self.health_professional.profession_id)
+
+    def test_list_professions(self):
+        self.client.force_authenticate(user=self.normal_user)
+        url = reverse('professions-list')
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'id': self.health_professional.profession_id, 'name': 'Psicóloga'}])
+
+        # Profissão nova, criada junto com um profissional, invalida o cache
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.list_url, {
+                'social_name': 'Dr. João Santos',
+                'profession': 'nutricionista',
+                'address': 'Av. Paulista, 1000',
+                'contact': '(11) 98888-8888'
+            }, format='json')
+        response = self.client.get(url)
+        self.assertEqual([item['name'] for item in response.data], ['Nutricionista', 'Psicóloga'])
+
+    def test_rename_profession_invalidates_professionals_cache(self):
+        self.client.force_authenticate(user=self.normal_user)
+        self.client.get(self.url)
+        profession = self.health_professional.profession
+        profession.name = 'Psicóloga Clínica'
+        with self.captureOnCommitCallbacks(execute=True):
+            profession.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['profession'], 'Psicóloga Clínica')
@@ -4,5 +4,8 @@ from . import views
 
 urlpatterns = [
     path('professionals/', views.HealthProfessionalCreateView.as_view(), name='professionals-create-list'),
+    path('professionals/nearby/', views.HealthProfessionalNearbyView.as_view(), name='professionals-nearby'),
+    path('professionals/sync/', views.HealthProfessionalSyncView.as_view(), name='professionals-sync'),
+    path('professions/', views.ProfessionListView.as_view(), name='professions-list'),
     path('professionals/<int:pk>/', views.HealthProfessionalRetrieveUpdateDestroyView.as_view(), name='professionals-detail-view'),
 ]
@@ -1,58 +1,176 @@
 from rest_framework import generics
-from drf_spectacular.utils import extend_schema
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from drf_spectacular.utils import extend_schema, OpenApiParameter
 import logging
-from health_professionals.models import HealthProfessional
-from health_professionals.serializers import HealthProfessionalModelSerializers
+from django.conf import settings
+from core.cache import CachedResponseMixin
+from core.mixins import IntegrityConflictMixin, SparseFieldsetMixin, SPARSE_FIELDS_PARAMETER
+from core.sync import SyncFeedView, SYNC_PARAMETERS
+from health_professionals.models import HealthProfessional, HealthProfessionalTombstone, Profession
+from health_professionals.serializers import HealthProfessionalModelSerializers, ProfessionSerializer
+from health_professionals.serializers import NearbyQuerySerializer, NearbyProfessionalSerializer
+from health_professionals.pagination import HealthProfessionalCursorPagination, HealthProfessionalSearchPagination
+from health_professionals.search import search_professionals
+from health_professionals.geo import nearest_professionals
+from health_professionals.signals import PROFESSIONALS_CACHE, PROFESSIONS_CACHE
 
 
 logger = logging.getLogger(__name__)
 
+SEARCH_MAX_LENGTH = 100
+SEARCH_PARAMETER = OpenApiParameter(
+    'q', str,
+    description="Busca por trecho do nome social, profissão ou endereço, ordenada por relevância."
+)
+
 
 @extend_schema(tags=['Profissionais'])
-class HealthProfessionalCreateView(generics.ListCreateAPIView):
-    queryset = HealthProfessional.objects.all()
+class HealthProfessionalCreateView(SparseFieldsetMixin, IntegrityConflictMixin, CachedResponseMixin, generics.ListCreateAPIView):
+    queryset = HealthProfessional.objects.select_related('profession')
     serializer_class = HealthProfessionalModelSerializers
+    conflict_message = 'Já existe um profissional cadastrado com este nome e profissão.'
+    conflict_constraints = ('unique_professional',)
+    cache_namespace = PROFESSIONALS_CACHE
+
+    def get_search_query(self):
+        if self.request.method != 'GET':
+            return ''
+        query = ' '.join(self.request.query_params.get('q', '').split())
+        if len(query) > SEARCH_MAX_LENGTH:
+            raise ValidationError({'q': f'A busca deve ter no máximo {SEARCH_MAX_LENGTH} caracteres.'})
+        return query
+
+    @property
+    def pagination_class(self):
+        # Com ?q= a ordem é a relevância, não o nome
+        if self.get_search_query():
+            return HealthProfessionalSearchPagination
+        return HealthProfessionalCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        query = self.get_search_query()
+        if query:
+            queryset = search_professionals(queryset, query)
+        return queryset
 
     @extend_schema(
         summary="Lista ou cria profissionais",
         description="Este endpoint permite listar todos os profissionais ou cadastrar um novo.",
-        responses={201: HealthProfessionalModelSerializers}
+        responses={201: HealthProfessionalModelSerializers, 409: dict}
     )
     def post(self, request, *args, **kwargs):
         logger.info("Criando novo profissional de saúde")
         return super().post(request, *args, **kwargs)
 
-    @extend_schema(summary="Lista todos os profissionais cadastrados")
+    @extend_schema(
+        summary="Lista todos os profissionais cadastrados",
+        parameters=[SEARCH_PARAMETER, SPARSE_FIELDS_PARAMETER],
+    )
     def get(self, request, *args, **kwargs):
         logger.info("Listando profissionais de saúde")
         return super().get(request, *args, **kwargs)
 
 
 @extend_schema(tags=['Profissionais'])
-class HealthProfessionalRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = HealthProfessional.objects.all()
+class HealthProfessionalRetrieveUpdateDestroyView(SparseFieldsetMixin, IntegrityConflictMixin, CachedResponseMixin,
+                                                  generics.RetrieveUpdateDestroyAPIView):
+    queryset = HealthProfessional.objects.select_related('profession')
     serializer_class = HealthProfessionalModelSerializers
+    conflict_message = 'Já existe um profissional cadastrado com este nome e profissão.'
+    conflict_constraints = ('unique_professional',)
+    cache_namespace = PROFESSIONALS_CACHE
 
-    @extend_schema(summary="Busca um profissional específico pelo ID")
+    @extend_schema(summary="Busca um profissional específico pelo ID", parameters=[SPARSE_FIELDS_PARAMETER])
     def get(self, request, *args, **kwargs):
         professional_id = kwargs.get('pk')
-        logger.info(f"Buscando profissional ID: {professional_id}")
+        logger.info("Buscando profissional ID: %s", professional_id)
         return super().get(request, *args, **kwargs)
 
     @extend_schema(summary="Atualiza os dados de um profissional (PUT)")
     def put(self, request, *args, **kwargs):
         professional_id = kwargs.get('pk')
-        logger.info(f"Atualizando profissional ID: {professional_id}")
+        logger.info("Atualizando profissional ID: %s", professional_id)
         return super().put(request, *args, **kwargs)
 
     @extend_schema(summary="Atualiza parcialmente um profissional (PATCH)")
     def patch(self, request, *args, **kwargs):
         professional_id = kwargs.get('pk')
-        logger.info(f"Atualizando parcialmente profissional ID: {professional_id}")
+        logger.info("Atualizando parcialmente profissional ID: %s", professional_id)
         return super().patch(request, *args, **kwargs)
 
     @extend_schema(summary="Remove um profissional do sistema")
     def delete(self, request, *args, **kwargs):
         professional_id = kwargs.get('pk')
-        logger.info(f"Deletando profissional ID: {professional_id}")
+        logger.info("Deletando profissional ID: %s", professional_id)
         return super().delete(request, *args, **kwargs)
+
+
+@extend_schema(tags=['Profissionais'])
+class HealthProfessionalSyncView(SyncFeedView):
+    queryset = HealthProfessional.objects.select_related('profession')
+    serializer_class = HealthProfessionalModelSerializers
+    tombstone_model = HealthProfessionalTombstone
+
+    @extend_schema(
+        summary="Feed incremental de profissionais alterados e removidos",
+        description="Retorna os profissionais criados ou alterados ('changed') e os ids removidos ('deleted') "
+                    "desde o watermark 'since'. Guarde o 'since' da resposta para a próxima chamada e repita "
+                    "enquanto 'has_more' for verdadeiro.",
+        parameters=SYNC_PARAMETERS,
+        responses={200: dict},
+    )
+    def get(self, request, *args, **kwargs):
+        logger.info("Sincronizando profissionais de saúde")
+        return super().get(request, *args, **kwargs)
+
+
+@extend_schema(tags=['Profissionais'])
+class HealthProfessionalNearbyView(APIView):
+
+    @extend_schema(
+        summary="Profissionais mais próximos de um ponto",
+        description="Retorna até 'limit' profissionais com localização cadastrada, do mais próximo ao "
+                    "mais distante, dentro de 'radius_km' (padrão e máximo: GEO_MAX_RADIUS_KM). "
+                    "Filtre por 'profession'. Cada item traz 'distance_km'.",
+        parameters=[NearbyQuerySerializer],
+        responses={200: NearbyProfessionalSerializer(many=True)},
+    )
+    def get(self, request, *args, **kwargs):
+        query = NearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        queryset = HealthProfessional.objects.select_related('profession')
+        if params.get('profession'):
+            queryset = queryset.filter(profession__name=Profession.normalize(params['profession']))
+
+        logger.info("Buscando profissionais próximos")
+        professionals = nearest_professionals(
+            queryset,
+            latitude=params['latitude'],
+            longitude=params['longitude'],
+            limit=params['limit'],
+            max_radius_km=params.get('radius_km', settings.GEO_MAX_RADIUS_KM),
+        )
+        return Response(NearbyProfessionalSerializer(professionals, many=True).data)
+
+
+@extend_schema(tags=['Profissionais'])
+class ProfessionListView(CachedResponseMixin, generics.ListAPIView):
+    queryset = Profession.objects.all()
+    serializer_class = ProfessionSerializer
+    # Catálogo pequeno: lista inteira, sem paginação
+    pagination_class = None
+    cache_namespace = PROFESSIONS_CACHE
+
+    @extend_schema(
+        summary="Lista o catálogo de profissões",
+        description="Retorna todas as profissões cadastradas ('id' e 'name'), em ordem alfabética. "
+                    "Use o 'id' no filtro 'profession_id' dos agendamentos e da ocupação mensal.",
+    )
+    def get(self, request, *args, **kwargs):
+        logger.info("Listando profissões")
+        return super().get(request, *args, **kwargs)
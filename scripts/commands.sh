@@ -1,23 +1,38 @@
 #!/bin/sh
 
-set -e
-
-echo "Waiting for Postgres Database..."
+# Sobe a API no modo definido por SERVER_MODE:
+#   wsgi (padrão) - Gunicorn com workers síncronos/threads (core.wsgi)
+#   asgi          - Gunicorn com UvicornWorker (core.asgi)
+#   dev           - runserver do Django, com migrate automático
+# Migrações e arquivos estáticos ficam a cargo do release.sh.
 
-# Espera até que o postgres esteja funcionando
-while ! nc -z $POSTGRES_HOST $POSTGRES_PORT; do
-  echo "Postgres is unavailable - sleeping..."
-  sleep 2
-done
+set -e
 
-echo "Postgres is up - continuing..."
+export SERVER_MODE=${SERVER_MODE:-wsgi}
 
-echo "Collecting static files..."
-poetry run python manage.py collectstatic --noinput
+wait_for_db.sh
 
-echo "Running migrations..."
-poetry run python manage.py makemigrations --noinput
-poetry run python manage.py migrate --noinput
+case "$SERVER_MODE" in
+  dev)
+    echo "Running migrations..."
+    poetry run python manage.py migrate --noinput
 
-echo "Starting Django server..."
-poetry run python manage.py runserver 0.0.0.0:8000
+    echo "Starting Django development server..."
+    exec poetry run python manage.py runserver 0.0.0.0:8000
+    ;;
+  asgi)
+    echo "Starting Gunicorn (ASGI)..."
+    exec poetry run gunicorn core.asgi:application \
+      --config gunicorn.conf.py \
+      --worker-class uvicorn_worker.UvicornWorker
+    ;;
+  wsgi)
+    echo "Starting Gunicorn (WSGI)..."
+    exec poetry run gunicorn core.wsgi:application \
+      --config gunicorn.conf.py
+    ;;
+  *)
+    echo "SERVER_MODE inválido: $SERVER_MODE (use wsgi, asgi ou dev)"
+    exit 1
+    ;;
+esac
@@ -0,0 +1,20 @@
+#!/bin/sh
+
+# Etapa de release: roda UMA vez por deploy, antes de subir os containers
+# da API (no compose, o serviço "release"). Assim os containers da
+# aplicação não repetem collectstatic/migrate a cada boot.
+
+set -e
+
+wait_for_db.sh
+
+echo "Collecting static files..."
+poetry run python manage.py collectstatic --noinput
+
+echo "Running migrations..."
+poetry run python manage.py migrate --noinput
+
+echo "Creating appointment partitions..."
+poetry run python manage.py manage_partitions
+
+echo "Release finished."
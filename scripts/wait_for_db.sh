@@ -0,0 +1,13 @@
+#!/bin/sh
+
+set -e
+
+echo "Waiting for Postgres Database..."
+
+# Espera até que o postgres esteja funcionando
+while ! nc -z $POSTGRES_HOST $POSTGRES_PORT; do
+  echo "Postgres is unavailable - sleeping..."
+  sleep 2
+done
+
+echo "Postgres is up - continuing..."